@@ -0,0 +1,57 @@
+'''
+Benchmark of the ``fast`` frozen distributions against the public
+``rv_continuous`` methods, on a large array for each distribution.
+
+Run with ``python benchmarks/bench_fast.py`` with evapy_4s installed.
+'''
+
+import timeit
+import warnings
+
+import numpy as np
+
+from evapy_4s import distributions
+
+
+CASES = [
+    ('rayleigh', ()),
+    ('weibull', (1.5,)),
+    ('truncrayleigh', (0.5,)),
+    ('truncweibull', (1.5, 0.5)),
+    ('gumbel', ()),
+    ('genexptail', (1.5, 0.9)),
+    ('acer_o1', (1.2, 5.)),
+]
+
+
+def main(n=2**22, repeat=5):
+    warnings.simplefilter('ignore', RuntimeWarning)
+    x = 4. * np.random.default_rng(0).random(n)
+    p = np.random.default_rng(1).random(n)
+    loc, scale = 0.1, 1.5
+
+    print('{} values, time in ms (public / fast)'.format(n))
+    methods = ('pdf', 'logpdf', 'cdf', 'sf', 'ppf')
+    print('{:<16s}'.format('') + ''.join('{:>16s}'.format(m)
+                                         for m in methods))
+    for name, shapes in CASES:
+        dist = getattr(distributions, name)
+        frozen = dist.fast(*shapes, loc=loc, scale=scale)
+        row = []
+        for method in methods:
+            data = p if method == 'ppf' else x
+            public = getattr(dist, method)
+            fast = getattr(frozen, method)
+            t_public = min(timeit.repeat(
+                lambda: public(data, *shapes, loc=loc, scale=scale),
+                number=1, repeat=repeat))
+            t_fast = min(timeit.repeat(lambda: fast(data), number=1,
+                                       repeat=repeat))
+            row.append('{:7.1f} /{:6.1f}'.format(1e3 * t_public,
+                                                 1e3 * t_fast))
+        print('{:<16s}'.format(name) + ''.join('{:>16s}'.format(r)
+                                               for r in row))
+
+
+if __name__ == '__main__':
+    main()
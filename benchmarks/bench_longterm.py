@@ -0,0 +1,47 @@
+'''
+Benchmark of the long-term exceedance rate over a scatter diagram against a
+loop over sea states.
+
+Run with ``python benchmarks/bench_longterm.py`` with evapy_4s installed.
+'''
+
+import timeit
+
+import numpy as np
+
+from evapy_4s import distributions
+from evapy_4s.longterm import LongTermResponse
+
+
+def _rate_loop(dist, params, weights, rates, levels):
+    rate = np.zeros_like(levels)
+    for w, nu, p in zip(weights, rates, params):
+        rate += w * nu * dist.sf(levels, *p)
+    return rate
+
+
+def main(n_states=20000, n_levels=200, repeat=3):
+    rng = np.random.default_rng(0)
+    params = np.c_[rng.uniform(1.5, 2.5, n_states), np.zeros(n_states),
+                   rng.uniform(0.5, 5.0, n_states)]
+    weights = rng.dirichlet(np.ones(n_states))
+    rates = rng.uniform(0.05, 0.2, n_states)
+    levels = np.linspace(0., 30., n_levels)
+
+    lt = LongTermResponse('weibull', params, weights, rates)
+    loop = min(timeit.repeat(
+        lambda: _rate_loop(distributions.weibull, params, weights, rates,
+                           levels), number=1, repeat=repeat))
+    block = min(timeit.repeat(lambda: lt.rate(levels), number=1,
+                              repeat=repeat))
+    inverse = min(timeit.repeat(lambda: lt.return_level(1e9), number=1,
+                                repeat=repeat))
+
+    print('{} sea states, {} levels'.format(n_states, n_levels))
+    print('{:<24s}{:10.1f}ms'.format('loop over sea states', 1e3 * loop))
+    print('{:<24s}{:10.1f}ms'.format('LongTermResponse.rate', 1e3 * block))
+    print('{:<24s}{:10.1f}ms'.format('return_level', 1e3 * inverse))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+'''
+Benchmark of the thread-pool execution (``n_jobs``) of the evstats
+functions on a long 1D series and on a multi-channel 2D array, and of the
+shared-memory process pool of `evapy_4s.parallel`.
+
+Run with ``python benchmarks/bench_parallel.py`` with evapy_4s installed.
+'''
+
+import os
+import timeit
+
+import numpy as np
+
+from evapy_4s import evstats, parallel
+
+
+def main(n=2**24, n_channels=16, repeat=3):
+    rng = np.random.default_rng(0)
+    x = np.sin(np.linspace(0.0, n / 20.0, n)) + 0.3 * rng.standard_normal(n)
+    x_2d = x[:n - n % n_channels].reshape(n_channels, -1)
+
+    cpus = os.cpu_count() or 1
+    n_jobs_list = [None] + sorted(set([2, 4, cpus]))
+
+    cases = [
+        ('argrelmax', evstats.argrelmax, x),
+        ('argupcross', evstats.argupcross, x),
+        ('argrelmax_decluster', evstats.argrelmax_decluster, x),
+        ('argrelmax_decluster 2D', evstats.argrelmax_decluster, x_2d),
+    ]
+
+    print('{} values, {} CPUs'.format(n, cpus))
+    print('{:<24s}'.format('') + ''.join(
+        '{:>12s}'.format('n_jobs={}'.format(j)) for j in n_jobs_list))
+    for name, func, data in cases:
+        times = []
+        for n_jobs in n_jobs_list:
+            seconds = min(timeit.repeat(
+                lambda: func(data, n_jobs=n_jobs), number=1, repeat=repeat))
+            times.append(seconds)
+        print('{:<24s}'.format(name) + ''.join(
+            '{:10.1f}ms'.format(1e3 * t) for t in times))
+
+    print('{:<24s}'.format('processes') + ''.join(
+        '{:>12s}'.format('n_jobs={}'.format(j)) for j in n_jobs_list[1:]))
+    for name, _, data in cases[:3]:
+        times = []
+        for n_jobs in n_jobs_list[1:]:
+            with parallel.SharedSeries(x, n_jobs=n_jobs) as series:
+                method = getattr(series, name)
+                method()  # start the workers
+                seconds = min(timeit.repeat(method, number=1, repeat=repeat))
+            times.append(seconds)
+        print('{:<24s}'.format(name) + ''.join(
+            '{:10.1f}ms'.format(1e3 * t) for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+Benchmark of repeated peak detection on fixed-size windows, with and without
+the preallocated buffers of `evstats.PeakKernel`.
+
+Run with ``python benchmarks/bench_peak_kernel.py`` with evapy_4s installed.
+'''
+
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from evapy_4s import evstats
+
+
+def _argrelmax_baseline(x):
+    return np.r_[False, x[1:] > x[:-1]] & np.r_[x[:-1] >= x[1:], False]
+
+
+def _allocated(func, x, repeat=100):
+    '''
+    Return total and peak number of bytes allocated by `repeat` calls.
+    '''
+    func(x)
+    tracemalloc.start()
+    total = 0
+    for _ in range(repeat):
+        snapshot = tracemalloc.get_traced_memory()[0]
+        func(x)
+        total += tracemalloc.get_traced_memory()[1] - snapshot
+        tracemalloc.reset_peak()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return total, peak
+
+
+def main(n=100000, repeat=100):
+    rng = np.random.default_rng(0)
+    x = np.sin(np.linspace(0.0, n / 20.0, n)) + 0.01 * rng.standard_normal(n)
+    kernel = evstats.PeakKernel(n)
+
+    cases = [
+        ('baseline _argrelmax', _argrelmax_baseline),
+        ('_argrelmax', evstats._argrelmax),
+        ('PeakKernel.relmax', kernel.relmax),
+        ('PeakKernel.upcross', kernel.upcross),
+        ('PeakKernel.argrelmax', kernel.argrelmax),
+    ]
+
+    print('Window size: {}, calls: {}'.format(n, repeat))
+    print('{:<24s} {:>12s} {:>16s}'.format('', 'us/call', 'bytes/call'))
+    for name, func in cases:
+        seconds = timeit.timeit(lambda: func(x), number=repeat) / repeat
+        total, _ = _allocated(func, x, repeat)
+        print('{:<24s} {:12.1f} {:16.0f}'.format(
+            name, 1e6 * seconds, total / repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+'''
+Benchmark of the 3-parameter Weibull fit by profile likelihood against the
+generic ``rv_continuous.fit``.
+
+With a shape below 1 the profile fit places the location at the sample
+minimum, where the likelihood is unbounded, so its nnlf is shown as -inf.
+
+Run with ``python benchmarks/bench_weibull_fit.py`` with evapy_4s installed.
+'''
+
+import timeit
+import warnings
+
+from scipy.stats import rv_continuous
+
+from evapy_4s.distributions import weibull
+
+
+def main(sizes=(200, 5000, 50000), shapes=(0.8, 1.5, 3.0), repeat=3):
+    warnings.simplefilter('ignore', RuntimeWarning)
+    print('{:>8s}{:>6s}{:>12s}{:>12s}{:>12s}{:>12s}'.format(
+        'n', 'c', 'profile', 'generic', 'nnlf', 'nnlf gen.'))
+    for n in sizes:
+        for c in shapes:
+            x = weibull.rvs(c, loc=1., scale=2., size=n, random_state=0)
+            t_profile = min(timeit.repeat(
+                lambda: weibull.fit(x), number=1, repeat=repeat))
+            t_generic = min(timeit.repeat(
+                lambda: rv_continuous.fit(weibull, x), number=1,
+                repeat=repeat))
+            nnlf = weibull.nnlf(weibull.fit(x), x)
+            nnlf_generic = weibull.nnlf(rv_continuous.fit(weibull, x), x)
+            print('{:>8d}{:>6.1f}{:>11.4f}s{:>11.4f}s{:>12.1f}{:>12.1f}'
+                  .format(n, c, t_profile, t_generic, nnlf, nnlf_generic))
+
+
+if __name__ == '__main__':
+    main()
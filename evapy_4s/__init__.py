@@ -1,2 +1,7 @@
 from . import evstats
 from . import distributions
+from . import diagnostics
+from . import simulate
+from . import archive
+from . import query
+from . import longterm
@@ -0,0 +1,323 @@
+'''
+Command-line batch pipeline for extreme value analysis of many time series
+files.
+
+Each input file is loaded, declustered with
+:func:`evapy_4s.evstats.argrelmax_decluster` and the declustered peaks are
+fitted with one or more distributions from :mod:`evapy_4s.distributions`.
+Files are processed in a process pool and one result row per file is
+appended to a single CSV output file. The output is row oriented rather than
+a binary column store, so each row is flushed as soon as a file is done, and
+an interrupted run loses at most the last partial row. Files already present
+in the output file are skipped, so an interrupted run is resumed by running
+the same command again. Resuming requires the same distributions, i.e. the
+same output columns.
+'''
+
+import argparse
+import concurrent.futures as cf
+import csv
+import fnmatch
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.stats import rv_continuous
+
+from . import distributions
+from . import evstats
+
+
+_STAGES = ('load', 'decluster', 'fit')
+_FORMATS = ('auto', 'raw', 'npy', 'csv')
+
+
+def _detect_format(path):
+    '''
+    Return file format based on file extension.
+    '''
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        return 'npy'
+    elif ext in ('.csv', '.txt'):
+        return 'csv'
+    else:
+        return 'raw'
+
+
+def _load(path, fmt='auto', dtype='float64', column=0, skiprows=0):
+    '''
+    Load a 1D time series from file.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    fmt : str, optional
+        One of 'auto', 'raw', 'npy' or 'csv'. Default is 'auto', which selects
+        format based on file extension.
+    dtype : str, optional
+        Data type of raw binary files. Default is 'float64'.
+    column : int, optional
+        Column to use for CSV and 2D npy files. Default is 0.
+    skiprows : int, optional
+        Number of header rows to skip in CSV files. Default is 0.
+
+    Returns
+    -------
+    x : array-like
+        Time series data.
+    '''
+    if fmt == 'auto':
+        fmt = _detect_format(path)
+
+    if fmt == 'npy':
+        x = np.load(path, mmap_mode='r')
+        if x.ndim == 2:
+            x = x[:, column]
+    elif fmt == 'csv':
+        x = np.loadtxt(path, delimiter=',', skiprows=skiprows,
+                       usecols=(column,), ndmin=1)
+    elif fmt == 'raw':
+        x = np.fromfile(path, dtype=dtype)
+    else:
+        raise ValueError('Unknown file format: {}'.format(fmt))
+    return np.asarray(x, dtype='float64')
+
+
+def _param_names(dist):
+    '''
+    Return parameter names of a distribution, i.e. shapes, loc and scale.
+    '''
+    shapes = dist.shapes.split(', ') if dist.shapes else []
+    return shapes + ['loc', 'scale']
+
+
+def _columns(dists):
+    '''
+    Return output column names.
+    '''
+    columns = ['file', 'n_samples', 'n_peaks', 'x_up']
+    for name in dists:
+        dist = getattr(distributions, name)
+        columns += ['{}_{}'.format(name, p) for p in _param_names(dist)]
+    return columns
+
+
+def _process_file(path, options):
+    '''
+    Load, decluster and fit a single file.
+
+    Returns
+    -------
+    row : dict
+        Result row.
+    timings : dict
+        Wall time in seconds spent in each stage.
+    errors : list
+        Messages of the fits that failed. Their parameters are NaN.
+    '''
+    timings = {}
+    errors = []
+
+    t0 = time.perf_counter()
+    x = _load(path, fmt=options['format'], dtype=options['dtype'],
+              column=options['column'], skiprows=options['skiprows'])
+    timings['load'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if options['x_up'] == 'mean':
+        x_up = float(np.nanmean(x))
+    else:
+        x_up = float(options['x_up'])
+    peaks = x[evstats.argrelmax_decluster(x, x_up=x_up)]
+    timings['decluster'] = time.perf_counter() - t0
+
+    row = {'file': os.path.basename(path), 'n_samples': x.size,
+           'n_peaks': peaks.size, 'x_up': x_up}
+
+    t0 = time.perf_counter()
+    for name in options['dists']:
+        dist = getattr(distributions, name)
+        kwds = {}
+        if options['floc'] is not None:
+            kwds['floc'] = options['floc']
+        try:
+            params = dist.fit(peaks, **kwds)
+        except Exception as e:
+            errors.append('{} fit failed: {}'.format(name, e))
+            params = [np.nan] * len(_param_names(dist))
+        for p, value in zip(_param_names(dist), params):
+            row['{}_{}'.format(name, p)] = value
+    timings['fit'] = time.perf_counter() - t0
+    return row, timings, errors
+
+
+def _read_done(output):
+    '''
+    Return the set of files already present in the output file, and the
+    header of the file (or None). A partially written last line from an
+    interrupted run is truncated.
+    '''
+    if not os.path.exists(output):
+        return set(), None
+
+    with open(output, 'r', newline='') as f:
+        lines = f.readlines()
+
+    good = []
+    for line in lines:
+        if not line.endswith('\n'):
+            break
+        good.append(line)
+
+    if len(good) != len(lines):
+        with open(output, 'w', newline='') as f:
+            f.writelines(good)
+
+    reader = csv.DictReader(good)
+    return set(row['file'] for row in reader), reader.fieldnames
+
+
+def _report(stats, n_files, wall, stream=sys.stdout):
+    '''
+    Print per-stage throughput.
+    '''
+    print('Processed {} files in {:.2f} s'.format(n_files, wall), file=stream)
+    for stage in _STAGES:
+        seconds = stats[stage]
+        rate = stats['n_samples'] / seconds if seconds > 0 else float('inf')
+        print('  {:<10s} {:10.2f} s  {:12.4g} samples/s'.format(
+            stage, seconds, rate), file=stream)
+
+
+def _find_files(path, pattern):
+    '''
+    Return sorted list of input files.
+    '''
+    files = [os.path.join(path, f) for f in sorted(os.listdir(path))
+             if fnmatch.fnmatch(f, pattern)]
+    return [f for f in files if os.path.isfile(f)]
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog='evapy',
+        description='Decluster and fit peak distributions to a directory of '
+                    'time series files.')
+    parser.add_argument('input', help='Directory of time series files.')
+    parser.add_argument('-o', '--output', default='evapy_results.csv',
+                        help='Output CSV file. Existing rows are kept and the '
+                             'corresponding files are skipped (resume).')
+    parser.add_argument('--pattern', default='*',
+                        help='Glob pattern for input files. Default is "*".')
+    parser.add_argument('--format', default='auto', choices=_FORMATS,
+                        help='Input file format. Default is by extension.')
+    parser.add_argument('--dtype', default='float64',
+                        help='Data type of raw binary files.')
+    parser.add_argument('--column', type=int, default=0,
+                        help='Column to use for CSV and 2D npy files.')
+    parser.add_argument('--skiprows', type=int, default=0,
+                        help='Number of header rows in CSV files.')
+    parser.add_argument('--x-up', default='0.0',
+                        help='Upcrossing level used for declustering, or '
+                             '"mean" for mean-upcrossing. Default is 0.')
+    parser.add_argument('--dist', nargs='+', default=['weibull'],
+                        help='Distributions to fit to the declustered peaks.')
+    parser.add_argument('--floc', type=float, default=None,
+                        help='Fixed location parameter for all fits.')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of worker processes. Default is the '
+                             'number of CPUs.')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='Maximum number of files queued or processed at '
+                             'a time. Default is twice the number of jobs.')
+    return parser
+
+
+def main(argv=None):
+    '''
+    Entry point of the ``evapy`` console script.
+    '''
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    for name in args.dist:
+        if not isinstance(getattr(distributions, name, None), rv_continuous):
+            parser.error('Unknown distribution: {}'.format(name))
+    if args.x_up != 'mean':
+        try:
+            float(args.x_up)
+        except ValueError:
+            parser.error('--x-up must be a number or "mean"')
+
+    options = {'format': args.format, 'dtype': args.dtype,
+               'column': args.column, 'skiprows': args.skiprows,
+               'x_up': args.x_up, 'dists': args.dist, 'floc': args.floc}
+
+    columns = _columns(args.dist)
+    done, header = _read_done(args.output)
+    if done and header != columns:
+        raise SystemExit(
+            'The columns of {} do not match --dist {}. Use another output '
+            'file, or the distributions of the existing file.'.format(
+                args.output, ' '.join(args.dist)))
+    files = [f for f in _find_files(args.input, args.pattern)
+             if os.path.basename(f) not in done
+             and os.path.abspath(f) != os.path.abspath(args.output)]
+    if done:
+        print('Resuming: {} files already done, {} remaining'.format(
+            len(done), len(files)))
+
+    jobs = args.jobs or os.cpu_count() or 1
+    max_in_flight = args.max_in_flight or 2 * jobs
+
+    stats = dict.fromkeys(_STAGES, 0.)
+    stats['n_samples'] = 0
+    n_files = 0
+    n_failed = 0
+    t_start = time.perf_counter()
+
+    with open(args.output, 'a' if done else 'w', newline='') as f, \
+            cf.ProcessPoolExecutor(max_workers=jobs) as pool:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        if not done:
+            writer.writeheader()
+            f.flush()
+
+        pending = {}
+        queue = iter(files)
+        while True:
+            for path in queue:
+                pending[pool.submit(_process_file, path, options)] = path
+                if len(pending) >= max_in_flight:
+                    break
+            if not pending:
+                break
+
+            finished, _ = cf.wait(pending, return_when=cf.FIRST_COMPLETED)
+            for future in finished:
+                path = pending.pop(future)
+                try:
+                    row, timings, errors = future.result()
+                except Exception as e:
+                    n_failed += 1
+                    print('Failed to process {}: {}'.format(path, e),
+                          file=sys.stderr)
+                    continue
+                for error in errors:
+                    print('{}: {}'.format(path, error), file=sys.stderr)
+                writer.writerow(row)
+                f.flush()
+                n_files += 1
+                stats['n_samples'] += row['n_samples']
+                for stage in _STAGES:
+                    stats[stage] += timings[stage]
+
+    _report(stats, n_files, time.perf_counter() - t_start)
+    return 1 if n_failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
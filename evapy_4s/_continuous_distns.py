@@ -12,11 +12,14 @@ from scipy import special
 from scipy.stats import rv_continuous
 from scipy import optimize
 
-from numpy import (exp, log, sqrt, pi, inf)
+from numpy import (exp, log, log1p, sqrt, pi, inf)
 
 import numpy as np
 
-from ._optimize import _residual_error
+from ._fast import _FastMixin
+from ._optimize import (_residual_error, _lsq_fit, _weibull_mle,
+                        _weibull3_mle, _lmoments, _lmoment_fit,
+                        _progressive_fit, _fit_sample_info)
 
 
 #  Special constants
@@ -24,7 +27,40 @@ _EULER = 0.577215664901532860606512090082402431042
 _ZETA3 = 1.202056903159594285399738161511449990765
 
 
-class rayleigh_gen(rv_continuous):
+# The kernels below work in place on new work arrays with the broadcast
+# shape of the arguments, to avoid full-size temporaries for each operation.
+
+def _work(*args):
+    """
+    Return an uninitialized work array with the broadcast shape of `args`.
+    """
+    return np.empty(np.broadcast(*args).shape)
+
+
+def _pow(x, c):
+    """
+    Return ``x**c`` in a new work array.
+    """
+    return np.power(x, c, out=_work(x, c))
+
+
+def _log_pow(x, c):
+    """
+    Return ``(c - 1)*log(x)`` and ``x**c`` in new work arrays from one
+    evaluation of ``log(x)``, with ``0**0 = 1``.
+    """
+    log_x = _work(x, c)
+    x_c = _work(x, c)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        np.log(x, out=log_x)
+        np.multiply(log_x, c, out=x_c)
+        np.exp(x_c, out=x_c)
+        log_x *= c - 1.
+    np.copyto(log_x, 0., where=(x_c == 0.) & np.isnan(log_x))
+    return log_x, x_c
+
+
+class rayleigh_gen(_FastMixin, rv_continuous):
     """A Rayleigh continuous random variable.
 
     %(before_notes)s
@@ -37,25 +73,47 @@ class rayleigh_gen(rv_continuous):
 
     for ``x >= 0``.
 
+    ``fit(data, method='lmoments')`` gives the L-moment estimates of the
+    location and scale, or of the scale only with ``floc``.
+
     %(after_notes)s
 
     %(example)s
 
     """
     def _pdf(self, x):
-        return x*exp(-0.5*x**2)
+        out = self._sf(x)
+        out *= x
+        return out
+
+    def _logpdf(self, x):
+        out = np.multiply(x, x, out=_work(x))
+        out *= -0.5
+        with np.errstate(divide='ignore'):
+            out += np.log(x, out=_work(x))
+        return out
 
     def _cdf(self, x):
-        return -special.expm1(-0.5*x**2)
+        out = np.multiply(x, x, out=_work(x))
+        out *= -0.5
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
 
     def _ppf(self, f):
-        return sqrt(-2*special.log1p(-f))
+        out = np.negative(f, out=_work(f))
+        special.log1p(out, out=out)
+        out *= -2
+        return np.sqrt(out, out=out)
 
     def _sf(self, x):
-        return exp(-0.5*x**2)
+        out = np.multiply(x, x, out=_work(x))
+        out *= -0.5
+        return np.exp(out, out=out)
 
     def _isf(self, s):
-        return sqrt(-2*log(s))
+        out = np.log(s, out=_work(s))
+        out *= -2
+        return np.sqrt(out, out=out)
 
     def _stats(self):
         val = 4 - pi
@@ -64,10 +122,21 @@ class rayleigh_gen(rv_continuous):
 
     def _entropy(self):
         return _EULER/2.0 + 1 - 0.5*log(2)
+
+    def _lmoment_params(self, l1, l2, t3, floc=None):
+        if floc is None:
+            scale = 2*l2 / (sqrt(pi)*(sqrt(2) - 1))
+            return l1 - scale*sqrt(pi/2), scale
+        return floc, (l1 - floc) / sqrt(pi/2)
+
+    def fit(self, data, *args, **kwds):
+        if kwds.get('method', 'mle').lower() == 'lmoments':
+            return _lmoment_fit(self, data, kwds)
+        return super(rayleigh_gen, self).fit(data, *args, **kwds)
 rayleigh = rayleigh_gen(a=0.0, name="rayleigh")
 
 
-class frechet_r_gen(rv_continuous):
+class frechet_r_gen(_FastMixin, rv_continuous):
     """
     A Frechet right class continuous random variable.
 
@@ -87,33 +156,314 @@ class frechet_r_gen(rv_continuous):
 
     `frechet_r` takes ``c`` as a shape parameter.
 
+    The maximum likelihood ``fit`` profiles out the shape and scale by Newton
+    iteration for each candidate location, and searches the location in one
+    dimension. With ``floc`` given, only the Newton iteration is needed. A
+    positional shape is the starting value of the Newton iteration, and a
+    ``loc`` keyword narrows the location search to near it. The scale is
+    profiled out, so a ``scale`` keyword is not needed.
+    Fits with a fixed shape or scale, or other methods, use the generic
+    `rv_continuous.fit`.
+
+    ``fit(data, method='lmoments')`` gives the L-moment estimates, where the
+    shape is found from the L-skewness, or with ``floc`` from the ratio of
+    the L-scale to the mean.
+
+    ``fit(data, progressive=True)`` fits on stratified subsamples of the
+    data, doubling in size from 1000 values (or ``progressive`` if an int),
+    each stage starting from the previous shape and location. It stops when
+    the relative change of the parameters, or of the level exceeded once in
+    ``n_return`` values if given, is below ``rtol`` (default 1e-3). With
+    ``full_output=True`` the fraction of the data fitted is also returned.
+
     %(after_notes)s
 
     %(example)s
 
     """
     def _pdf(self, x, c):
-        return c*x**(c-1)*exp(-x**c)
+        out = self._logpdf(x, c)
+        return np.exp(out, out=out)
 
     def _logpdf(self, x, c):
-        return log(c) + (c-1)*log(x) - x**c
+        out, x_c = _log_pow(x, c)
+        out -= x_c
+        out += log(c)
+        return out
 
     def _cdf(self, x, c):
-        return -special.expm1(-x**c)
+        out = _pow(x, c)
+        np.negative(out, out=out)
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
+
+    def _sf(self, x, c):
+        out = _pow(x, c)
+        np.negative(out, out=out)
+        return np.exp(out, out=out)
 
     def _ppf(self, f, c):
-        return (-special.log1p(-f))**(1.0/c)
+        out = np.negative(f, out=_work(f, c))
+        special.log1p(out, out=out)
+        np.negative(out, out=out)
+        return np.power(out, 1.0/c, out=out)
+
+    def _isf(self, s, c):
+        out = np.log(s, out=_work(s, c))
+        np.negative(out, out=out)
+        return np.power(out, 1.0/c, out=out)
 
     def _munp(self, n, c):
         return special.gamma(1.0+n*1.0/c)
 
     def _entropy(self, c):
         return -_EULER / c - log(c) + _EULER + 1
+
+    def _lmoment_params(self, l1, l2, t3, floc=None):
+        if floc is None:
+            # L-skewness as function of k = 1/c is increasing from that of
+            # the Gumbel (minimum) distribution at k = 0
+            def t3_fun(k):
+                return (1 - 3*2**-k + 2*3**-k) / (1 - 2**-k) - t3
+            k_lo, k_hi = 1e-6, 50.
+            if t3_fun(k_lo) >= 0:
+                k = k_lo
+            elif t3_fun(k_hi) <= 0:
+                k = k_hi
+            else:
+                k = optimize.brentq(t3_fun, k_lo, k_hi)
+            g = special.gamma(1 + k)
+            scale = l2 / ((1 - 2**-k)*g)
+            return 1/k, l1 - scale*g, scale
+        c = -log(2) / log1p(-l2/(l1 - floc))
+        return c, floc, (l1 - floc) / special.gamma(1 + 1/c)
+
+    def fit(self, data, *args, **kwds):
+        if kwds.get('progressive'):
+            return _progressive_fit(self, data, args, kwds)
+        method = kwds.get('method', 'mle').lower()
+        if method == 'lmoments':
+            return _lmoment_fit(self, data, kwds)
+        if set(kwds) - {'floc', 'loc', 'scale', 'method'} or method != 'mle':
+            return super(frechet_r_gen, self).fit(data, *args, **kwds)
+        if len(args) > self.numargs:
+            raise TypeError("Too many input arguments.")
+        c0 = args[0] if args else 1.
+        data = np.asarray(data, dtype='float64').ravel()
+        if not np.isfinite(data).all():
+            raise ValueError("The data contains non-finite values.")
+        if 'floc' not in kwds:
+            return _weibull3_mle(data, c0=c0, loc0=kwds.get('loc'))
+        loc = kwds['floc']
+        if not np.all(data > loc):
+            return super(frechet_r_gen, self).fit(data, *args, **kwds)
+        c, scale = _weibull_mle(data - loc, c0=c0)
+        return c, loc, scale
 weibull = frechet_r_gen(a=0.0, name='weibull')
 weibull_min = frechet_r_gen(a=0.0, name='weibull_min')
 
 
-class gumbel_r_gen(rv_continuous):
+def _truncated_sample(data, kwds):
+    """
+    Return data above a known truncation threshold, with the fixed location
+    subtracted, for the analytic fit of truncated distributions.
+    """
+    threshold = kwds.pop('threshold')
+    loc = kwds.pop('floc', 0.)
+    if kwds:
+        raise TypeError("Unknown arguments with threshold: {}.".format(
+            ', '.join(kwds)))
+    if threshold < loc:
+        raise ValueError("threshold must be larger than or equal to loc.")
+    data = np.asarray(data, dtype='float64').ravel()
+    y = data[data >= threshold] - loc
+    if y.size < 2:
+        raise ValueError("Not enough data above threshold.")
+    return y, threshold - loc, loc
+
+
+class truncrayleigh_gen(_FastMixin, rv_continuous):
+    """A left truncated Rayleigh continuous random variable.
+
+    %(before_notes)s
+
+    See Also
+    --------
+    rayleigh
+
+    Notes
+    -----
+    The probability density function for `truncrayleigh` is::
+
+        truncrayleigh.pdf(x, b) = x * exp(-(x**2 - b**2)/2)
+
+    for ``x >= b >= 0``.
+
+    `truncrayleigh` takes ``b`` as a shape parameter, i.e. the truncation
+    point in standardized units.
+
+    With a known truncation threshold in data units, ``fit(data,
+    threshold=u, floc=loc)`` gives the closed-form maximum likelihood
+    estimate using only the values above the threshold. The location is
+    fixed, 0 by default.
+
+    %(after_notes)s
+
+    %(example)s
+
+    """
+    def _argcheck(self, b):
+        return b >= 0
+
+    def _get_support(self, b):
+        return b, inf
+
+    def _pdf(self, x, b):
+        out = self._logsf(x, b)
+        np.exp(out, out=out)
+        out *= x
+        return out
+
+    def _logpdf(self, x, b):
+        out = self._logsf(x, b)
+        with np.errstate(divide='ignore'):
+            out += np.log(x, out=_work(x, b))
+        return out
+
+    def _logsf(self, x, b):
+        # -(x**2 - b**2)/2 as a product, which is accurate near x = b
+        out = np.subtract(b, x, out=_work(x, b))
+        out *= 0.5
+        out *= np.add(x, b, out=_work(x, b))
+        return out
+
+    def _cdf(self, x, b):
+        out = self._logsf(x, b)
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
+
+    def _sf(self, x, b):
+        out = self._logsf(x, b)
+        return np.exp(out, out=out)
+
+    def _ppf(self, f, b):
+        out = np.negative(f, out=_work(f, b))
+        special.log1p(out, out=out)
+        out *= -2.
+        out += b*b
+        return np.sqrt(out, out=out)
+
+    def _isf(self, s, b):
+        out = np.log(s, out=_work(s, b))
+        out *= -2.
+        out += b*b
+        return np.sqrt(out, out=out)
+
+    def _munp(self, n, b):
+        a = 0.5*n + 1.
+        return (2**(0.5*n) * special.gamma(a) * special.gammaincc(a, 0.5*b*b)
+                * exp(0.5*b*b))
+
+    def _stats(self, b):
+        mu = b + sqrt(pi/2)*special.erfcx(b/sqrt(2))
+        return mu, b*b + 2 - mu*mu, None, None
+
+    def fit(self, data, *args, **kwds):
+        if 'threshold' not in kwds:
+            return super(truncrayleigh_gen, self).fit(data, *args, **kwds)
+        y, t, loc = _truncated_sample(data, kwds)
+        scale = sqrt(np.mean((y - t)*(y + t))/2.)
+        return t/scale, loc, scale
+truncrayleigh = truncrayleigh_gen(a=0.0, name="truncrayleigh")
+
+
+class truncweibull_gen(_FastMixin, rv_continuous):
+    """
+    A left truncated Weibull continuous random variable.
+
+    %(before_notes)s
+
+    See Also
+    --------
+    weibull
+
+    Notes
+    -----
+    The probability density function for `truncweibull` is::
+
+        truncweibull.pdf(x, c, b) = c * x**(c-1) * exp(-(x**c - b**c))
+
+    for ``x >= b >= 0``, ``c > 0``.
+
+    `truncweibull` takes ``c`` and ``b`` as shape parameters, where ``b`` is
+    the truncation point in standardized units. Together with the location
+    parameter it is a truncated 3-parameter Weibull distribution.
+
+    With a known truncation threshold in data units, ``fit(data,
+    threshold=u, floc=loc)`` gives the maximum likelihood estimate using only
+    the values above the threshold, by Newton iteration on the analytic
+    profile score of ``c``. The location is fixed, 0 by default.
+
+    %(after_notes)s
+
+    %(example)s
+
+    """
+    def _argcheck(self, c, b):
+        return (c > 0) & (b >= 0)
+
+    def _get_support(self, c, b):
+        return b, inf
+
+    def _pdf(self, x, c, b):
+        out = self._logpdf(x, c, b)
+        return np.exp(out, out=out)
+
+    def _logpdf(self, x, c, b):
+        out, x_c = _log_pow(x, c)
+        out -= x_c
+        out += log(c) + b**c
+        return out
+
+    def _logsf(self, x, c, b):
+        out = _pow(x, c)
+        out -= b**c
+        return np.negative(out, out=out)
+
+    def _cdf(self, x, c, b):
+        out = self._logsf(x, c, b)
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
+
+    def _sf(self, x, c, b):
+        out = self._logsf(x, c, b)
+        return np.exp(out, out=out)
+
+    def _ppf(self, f, c, b):
+        out = np.negative(f, out=_work(f, c, b))
+        special.log1p(out, out=out)
+        np.subtract(b**c, out, out=out)
+        return np.power(out, 1.0/c, out=out)
+
+    def _isf(self, s, c, b):
+        out = np.log(s, out=_work(s, c, b))
+        np.subtract(b**c, out, out=out)
+        return np.power(out, 1.0/c, out=out)
+
+    def _munp(self, n, c, b):
+        a = 1.0 + n*1.0/c
+        return special.gamma(a) * special.gammaincc(a, b**c) * exp(b**c)
+
+    def fit(self, data, *args, **kwds):
+        if 'threshold' not in kwds:
+            return super(truncweibull_gen, self).fit(data, *args, **kwds)
+        y, t, loc = _truncated_sample(data, kwds)
+        c, scale = _weibull_mle(y, threshold=t)
+        return c, t/scale, loc, scale
+truncweibull = truncweibull_gen(a=0.0, name='truncweibull')
+
+
+class gumbel_r_gen(_FastMixin, rv_continuous):
     """
     A right-skewed Gumbel continuous random variable.
 
@@ -133,36 +483,76 @@ class gumbel_r_gen(rv_continuous):
     distribution.  It is also related to the extreme value distribution,
     log-Weibull and Gompertz distributions.
 
+    ``fit(data, method='lmoments')`` gives the L-moment estimates of the
+    location and scale, or of the scale only with ``floc``.
+
     %(after_notes)s
 
     %(example)s
 
     """
     def _pdf(self, x):
-        return exp(self._logpdf(x))
+        out = self._logpdf(x)
+        return np.exp(out, out=out)
 
     def _logpdf(self, x):
-        return -x - exp(-x)
+        out = self._logcdf(x)
+        out -= x
+        return out
 
     def _cdf(self, x):
-        return exp(-exp(-x))
+        out = self._logcdf(x)
+        return np.exp(out, out=out)
 
     def _logcdf(self, x):
-        return -exp(-x)
+        out = np.negative(x, out=_work(x))
+        np.exp(out, out=out)
+        return np.negative(out, out=out)
+
+    def _sf(self, x):
+        out = self._logcdf(x)
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
 
     def _ppf(self, f):
-        return -log(-log(f))
+        out = np.log(f, out=_work(f))
+        np.negative(out, out=out)
+        np.log(out, out=out)
+        return np.negative(out, out=out)
 
     def _stats(self):
         return _EULER, pi*pi/6.0, 12*sqrt(6)/pi**3 * _ZETA3, 12.0/5
 
     def _entropy(self):
         return _EULER + 1.
+
+    def _lmoment_params(self, l1, l2, t3, floc=None):
+        if floc is None:
+            scale = l2 / log(2)
+            return l1 - _EULER*scale, scale
+        return floc, (l1 - floc) / _EULER
+
+    def fit(self, data, *args, **kwds):
+        if kwds.get('method', 'mle').lower() == 'lmoments':
+            return _lmoment_fit(self, data, kwds)
+        return super(gumbel_r_gen, self).fit(data, *args, **kwds)
 gumbel = gumbel_r_gen(name='gumbel')
 gumbel_max = gumbel_r_gen(name='gumbel_max')
 
 
-class gen_exp_tail_gen(rv_continuous):
+def _exponential_tail_start(l1, l2, p, floc=None):
+    """
+    Return ``(q, loc, scale)`` such that ``q*exp(-(x - loc)/scale)`` is the
+    L-moment fit of an exponential tail, holding the fraction `p` of the full
+    sample, to the upper tail of a sample.
+    """
+    scale = 2*l2
+    threshold = l1 - scale
+    loc = threshold if floc is None else floc
+    return p*exp((threshold - loc)/scale), loc, scale
+
+
+class gen_exp_tail_gen(_FastMixin, rv_continuous):
     """
     A generalized exponential tail continuous random variable.
 
@@ -183,28 +573,61 @@ class gen_exp_tail_gen(rv_continuous):
     overwritten with a least-square procedure. It is also recommended to lock
     the location parameter for more robust parameter estimates.
 
+    Only the upper tail of the sample is fitted with the ``tail`` keyword of
+    ``fit``, given as number of largest values (int) or fraction of the
+    sample (float). The plotting positions are then relative to the full
+    sample.
+
+    Without starting values, the least-square fit is run both from the
+    L-moment estimates of the Weibull distribution (``q = 1``), or of an
+    exponential tail with ``tail``, and from the generic start, and the
+    better fit is kept. Samples of fewer than 3 values only use the generic
+    start.
+
+    Large samples can be fitted progressively with ``progressive=True``,
+    ``rtol``, ``n_return`` and ``full_output``, see `weibull`. The ``tail``
+    is then the same fraction of each subsample.
+
     %(after_notes)s
 
     %(example)s
 
     """
     def _pdf(self, x, c, q):
-        return c*x**(c-1.)*exp(-x**c + log(q))
+        out = self._logpdf(x, c, q)
+        return np.exp(out, out=out)
 
     def _logpdf(self, x, c, q):
-        return log(c) + (c-1)*log(x) - x**c + log(q)
+        out, x_c = _log_pow(x, c)
+        out -= x_c
+        out += log(c*q)
+        return out
+
+    def _logsf(self, x, c, q):
+        out = _pow(x, c)
+        np.negative(out, out=out)
+        out += log(q)
+        return out
 
     def _cdf(self, x, c, q):
-        return -special.expm1(-x**c + log(q))
+        out = self._logsf(x, c, q)
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
 
     def _logcdf(self, x, c, q):
-        return special.log1p(-np.exp(-x**c + log(q)))
+        out = self._sf(x, c, q)
+        np.negative(out, out=out)
+        return special.log1p(out, out=out)
 
     def _ppf(self, f, c, q):
-        return (np.log(q) - special.log1p(-f))**(1./c)
+        out = np.negative(f, out=_work(f, c, q))
+        special.log1p(out, out=out)
+        np.subtract(log(q), out, out=out)
+        return np.power(out, 1./c, out=out)
 
     def _sf(self, x, c, q):
-        return np.exp(-x**c + np.log(q))
+        out = self._logsf(x, c, q)
+        return np.exp(out, out=out)
 
     def _penalized_nnlf(self, theta, x):
         '''
@@ -216,10 +639,29 @@ class gen_exp_tail_gen(rv_continuous):
             return log(1/(1 - cdf))
 
         return _residual_error(self, theta, x, y_fun)
+
+    def _fitstart(self, data, args=None):
+        if np.size(data) < 3:
+            return super(gen_exp_tail_gen, self)._fitstart(data, args)
+        is_sorted, n_total, floc = _fit_sample_info()
+        l1, l2, t3 = _lmoments(data, is_sorted)
+        if n_total is None:
+            # Weibull for q = 1, with all data within the support
+            c, loc, scale = weibull._lmoment_params(l1, l2, t3, floc)
+            if floc is None:
+                loc = min(loc, np.min(data) - 0.01*l2)
+            return c, 1., loc, scale
+        return (1.,) + _exponential_tail_start(l1, l2, data.size/n_total,
+                                                floc)
+
+    def fit(self, data, *args, **kwds):
+        if kwds.get('progressive'):
+            return _progressive_fit(self, data, args, kwds)
+        return _lsq_fit(super(gen_exp_tail_gen, self).fit, data, *args, **kwds)
 genexptail = gen_exp_tail_gen(name='genexptail', a=0.)
 
 
-class acer_o1_gen(rv_continuous):
+class acer_o1_gen(_FastMixin, rv_continuous):
     """
     A generalized Gumbel-like continuous random variable.
 
@@ -244,6 +686,12 @@ class acer_o1_gen(rv_continuous):
     overwritten with a least-square procedure. It is also recommended to lock
     the location parameter for more robust parameter estimates.
 
+    Only the upper tail of the sample is fitted with the ``tail`` keyword of
+    ``fit``, see `genexptail`. Without starting values, the least-square fit
+    is run both from the L-moment estimates of the Gumbel distribution
+    (``c = 1``), or of an exponential tail with ``tail``, and from the
+    generic start, and the better fit is kept.
+
     %(after_notes)s
 
     References
@@ -254,19 +702,42 @@ class acer_o1_gen(rv_continuous):
 
     """
     def _pdf(self, x, c, qn):
-        return c*qn*x**(c-1)*exp(-exp(-x**c + log(qn))-x**c)
-
-    def _logpdf(self, x, c, q):
-        return log(c*q*x**(c-1)) + (-exp(-x**c + log(qn))-x**c)
+        out = self._logpdf(x, c, qn)
+        return np.exp(out, out=out)
+
+    def _logpdf(self, x, c, qn):
+        out, x_c = _log_pow(x, c)
+        out -= x_c
+        out += log(c*qn)
+        # x_c is reused for qn*exp(-x**c)
+        np.negative(x_c, out=x_c)
+        np.exp(x_c, out=x_c)
+        x_c *= qn
+        out -= x_c
+        return out
 
     def _cdf(self, x, c, qn):
-        return exp(-exp(-x**c + log(qn)))
+        out = self._logcdf(x, c, qn)
+        return np.exp(out, out=out)
 
     def _logcdf(self, x, c, qn):
-        return -exp(-x**c + log(qn))
+        out = _pow(x, c)
+        np.negative(out, out=out)
+        out += log(qn)
+        np.exp(out, out=out)
+        return np.negative(out, out=out)
+
+    def _sf(self, x, c, qn):
+        out = self._logcdf(x, c, qn)
+        special.expm1(out, out=out)
+        return np.negative(out, out=out)
 
     def _ppf(self, f, c, qn):
-        return (-(log(-(log(f))/qn)))**(1/c)
+        out = np.log(f, out=_work(f, c, qn))
+        np.negative(out, out=out)
+        np.log(out, out=out)
+        np.subtract(log(qn), out, out=out)
+        return np.power(out, 1./c, out=out)
 
     def _penalized_nnlf(self, theta, x):
         '''
@@ -278,4 +749,20 @@ class acer_o1_gen(rv_continuous):
             return log(-1./log(cdf))
 
         return _residual_error(self, theta, x, y_fun)
+
+    def _fitstart(self, data, args=None):
+        if np.size(data) < 3:
+            return super(acer_o1_gen, self)._fitstart(data, args)
+        is_sorted, n_total, floc = _fit_sample_info()
+        l1, l2, t3 = _lmoments(data, is_sorted)
+        if n_total is None:
+            # Gumbel for c = 1
+            mu, scale = gumbel._lmoment_params(l1, l2, t3)
+            loc = mu if floc is None else floc
+            return 1., exp((mu - loc)/scale), loc, scale
+        return (1.,) + _exponential_tail_start(l1, l2, data.size/n_total,
+                                                floc)
+
+    def fit(self, data, *args, **kwds):
+        return _lsq_fit(super(acer_o1_gen, self).fit, data, *args, **kwds)
 acer_o1 = acer_o1_gen(name='acer_o1')
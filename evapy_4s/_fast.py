@@ -0,0 +1,119 @@
+'''
+Lightweight frozen distributions for evaluation on large arrays.
+'''
+
+import numpy as np
+
+
+class _FastFrozen(object):
+    '''
+    Frozen distribution that calls the distribution kernels directly.
+
+    The parameters are checked once, and the location and scale are applied
+    in place on a single work array, instead of the argument checking and
+    broadcasting of each `rv_continuous` method call. Parameters must be
+    scalars.
+    '''
+    def __init__(self, dist, *args, **kwds):
+        shapes, loc, scale = dist._parse_args(*args, **kwds)
+        shapes = tuple(float(s) for s in shapes)
+        if not (np.all(dist._argcheck(*shapes)) and scale > 0):
+            raise ValueError('Invalid parameters.')
+        self.dist = dist
+        self.shapes = shapes
+        self.loc = float(loc)
+        self.scale = float(scale)
+        self.a, self.b = (float(v) for v in dist._get_support(*shapes))
+
+    def _standardize(self, x, closed=True):
+        '''
+        Return ``(x - loc)/scale`` clipped to the support, and the masks of
+        values below and above the support. The ends of the support are
+        outside of it unless `closed`, as in `rv_continuous`, where the
+        densities use the closed and the distribution functions the open
+        support.
+        '''
+        x = np.asarray(x, dtype='float64')
+        y = np.subtract(x, self.loc, out=np.empty(x.shape))
+        y /= self.scale
+        if closed:
+            below = y < self.a
+            above = y > self.b
+        else:
+            below = y <= self.a
+            above = y >= self.b
+        np.clip(y, self.a, self.b, out=y)
+        return y, below, above
+
+    def pdf(self, x):
+        y, below, above = self._standardize(x)
+        out = np.asarray(self.dist._pdf(y, *self.shapes), dtype='float64')
+        out /= self.scale
+        out[below | above] = 0.
+        return out[()]
+
+    def logpdf(self, x):
+        y, below, above = self._standardize(x)
+        out = np.asarray(self.dist._logpdf(y, *self.shapes), dtype='float64')
+        out -= np.log(self.scale)
+        out[below | above] = -np.inf
+        return out[()]
+
+    def cdf(self, x):
+        y, below, above = self._standardize(x, closed=False)
+        out = np.asarray(self.dist._cdf(y, *self.shapes), dtype='float64')
+        out[below] = 0.
+        out[above] = 1.
+        return out[()]
+
+    def sf(self, x):
+        y, below, above = self._standardize(x, closed=False)
+        out = np.asarray(self.dist._sf(y, *self.shapes), dtype='float64')
+        out[below] = 1.
+        out[above] = 0.
+        return out[()]
+
+    def ppf(self, q):
+        q = np.asarray(q, dtype='float64')
+        out = np.asarray(self.dist._ppf(q, *self.shapes), dtype='float64')
+        out[q == 0.] = self.a
+        out[q == 1.] = self.b
+        out[(q < 0.) | (q > 1.)] = np.nan
+        out *= self.scale
+        out += self.loc
+        return out[()]
+
+
+class _FastMixin(object):
+    '''
+    Adds ``fast`` to `rv_continuous` sub-classes.
+    '''
+    def fast(self, *args, **kwds):
+        '''
+        Return a frozen distribution for fast evaluation on large arrays.
+
+        The parameters are checked once, and ``pdf``, ``logpdf``, ``cdf``,
+        ``sf`` and ``ppf`` call the distribution kernels directly. Unlike
+        ``freeze``, the parameters must be scalars.
+
+        Parameters
+        ----------
+        arg1, arg2, arg3,... : float
+            The shape parameter(s) of the distribution.
+        loc : float, optional
+            Location parameter. Default is 0.
+        scale : float, optional
+            Scale parameter. Default is 1.
+
+        Returns
+        -------
+        frozen : object
+            Object with the methods ``pdf``, ``logpdf``, ``cdf``, ``sf``
+            and ``ppf``.
+
+        Examples
+        --------
+        >>> frozen = weibull.fast(1.5, loc=0., scale=2.)
+        >>> p = frozen.cdf(peaks)
+        '''
+        return _FastFrozen(self, *args, **kwds)
@@ -0,0 +1,366 @@
+'''
+Online (recursive) parameter estimation for peak distributions.
+
+The estimators keep running, optionally exponentially weighted, sums of the
+data so that parameter estimates are updated in O(1) per value instead of
+refitting the full history.
+'''
+
+import numpy as np
+from numpy import (log, sqrt, pi, exp)
+
+from ._continuous_distns import (rayleigh, weibull, _EULER)
+from ._optimize import _weibull_mle
+
+
+class _RingBuffer(object):
+    '''
+    Buffer of the most recent values and their position in the stream.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Maximum number of values. If None, the buffer grows without limit.
+    '''
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        size = capacity if capacity is not None else 1024
+        self._values = np.empty(size)
+        self._index = np.empty(size, dtype='int64')
+        self._n = 0
+
+    def __len__(self):
+        if self.capacity is None:
+            return self._n
+        return min(self._n, self.capacity)
+
+    def append(self, values, first):
+        '''
+        Append values that have stream positions ``first, first + 1, ...``.
+
+        Returns
+        -------
+        values : array-like
+            Dropped values.
+        index : array-like
+            Stream position of the dropped values.
+        '''
+        k = values.size
+        index = np.arange(first, first + k)
+
+        if self.capacity is None:
+            if self._n + k > self._values.size:
+                size = max(2 * self._values.size, self._n + k)
+                self._values = np.resize(self._values, size)
+                self._index = np.resize(self._index, size)
+            self._values[self._n:self._n + k] = values
+            self._index[self._n:self._n + k] = index
+            self._n += k
+            return values[:0], index[:0]
+
+        # The value appended as number j is stored at position j % capacity
+        capacity = self.capacity
+        first_kept = self._n + k - capacity
+        old = np.arange(self._n - len(self), min(self._n, first_kept))
+        old %= capacity
+        n_new_drop = max(first_kept - self._n, 0)
+        dropped = (np.r_[self._values[old], values[:n_new_drop]],
+                   np.r_[self._index[old], index[:n_new_drop]])
+
+        pos = np.arange(self._n + n_new_drop, self._n + k) % capacity
+        self._values[pos] = values[n_new_drop:]
+        self._index[pos] = index[n_new_drop:]
+        self._n += k
+        return dropped
+
+    def values(self):
+        '''
+        Return buffered values and their stream positions (unordered).
+        '''
+        n = len(self)
+        return self._values[:n], self._index[:n]
+
+
+class _OnlineEstimator(object):
+    '''
+    Base class of online estimators.
+
+    Sub-classes implement ``_features(y)``, returning the terms added to the
+    running sums for the values ``y = x - floc``, and ``_params()``.
+
+    With a `window`, the buffer holds the values of the running sums, and
+    dropped values are subtracted from the sums. Sub-classes that set
+    ``_keep_history`` otherwise get a buffer of at most `history` recent
+    values, which does not affect the sums.
+    '''
+    _n_sums = 1
+    _keep_history = False
+
+    def __init__(self, floc=0., forget=1., window=None, history=None):
+        if not 0. < forget <= 1.:
+            raise ValueError('forget must be in (0, 1].')
+        if window is not None and window < 1:
+            raise ValueError('window must be a positive integer.')
+
+        self.floc = floc
+        self.forget = forget
+        self.window = window
+        self.n = 0
+        self._sums = np.zeros(self._n_sums)
+
+        # Number of values with weight above 1e-12, not worth keeping beyond
+        self._horizon = int(np.ceil(log(1e-12) / log(forget))) \
+            if forget < 1. else None
+        if window is not None:
+            capacity = int(window)
+        elif history is None or (self._horizon is not None
+                                 and self._horizon < history):
+            capacity = self._horizon
+        else:
+            capacity = int(history)
+
+        if window is not None or self._keep_history:
+            self._buffer = _RingBuffer(capacity)
+        else:
+            self._buffer = None
+        self._since_resum = 0
+
+    def _weights(self, index):
+        return self.forget ** (self.n - 1 - index)
+
+    def update(self, x):
+        '''
+        Add new peak values.
+
+        Parameters
+        ----------
+        x : float or array-like
+            New value(s) in order of arrival.
+
+        Returns
+        -------
+        self : object
+        '''
+        y = np.asarray(x, dtype='float64').ravel() - self.floc
+        k = y.size
+        if not k:
+            return self
+
+        features = self._features(y)
+        if self.forget < 1.:
+            self._sums *= self.forget**k
+            self._sums += features @ (self.forget ** np.arange(k - 1, -1, -1))
+        else:
+            self._sums += features.sum(axis=1)
+
+        first = self.n
+        self.n += k
+
+        if self._buffer is not None:
+            y_drop, index_drop = self._buffer.append(y, first)
+            if self.window is not None and y_drop.size:
+                self._sums -= (
+                    self._features(y_drop) @ self._weights(index_drop))
+
+            # Recompute the sums from the history now and then to avoid
+            # accumulation of round-off errors from the subtractions.
+            self._since_resum += k
+            if (self.window is not None
+                    and self._since_resum >= self._buffer.capacity):
+                self._resum()
+
+        self._after_update(k)
+        return self
+
+    def _history_complete(self):
+        '''
+        Whether the buffer holds all values of the running sums.
+        '''
+        capacity = self._buffer.capacity
+        return (self.window is not None or capacity is None
+                or capacity == self._horizon or self.n <= capacity)
+
+    def _resum(self):
+        y, index = self._buffer.values()
+        self._sums = self._features(y) @ self._weights(index)
+        self._since_resum = 0
+
+    def _after_update(self, k):
+        pass
+
+    @property
+    def count(self):
+        '''
+        Effective (weighted) number of values.
+        '''
+        return self._sums[0]
+
+    @property
+    def params(self):
+        '''
+        Current parameter estimates (shapes, loc, scale).
+        '''
+        if self.count <= 0:
+            raise ValueError('No data.')
+        return self._params()
+
+    def freeze(self):
+        '''
+        Return the frozen distribution with the current parameter estimates.
+        '''
+        return self.dist(*self.params)
+
+
+class OnlineRayleigh(_OnlineEstimator):
+    '''
+    Online maximum likelihood estimation of the Rayleigh distribution.
+
+    Keeps the running sum of squares, which is a sufficient statistic of the
+    scale parameter for known location.
+
+    Parameters
+    ----------
+    floc : float, optional
+        Fixed location parameter. Default is 0.
+    forget : float, optional
+        Exponential forgetting factor in (0, 1]. The weight of a value is
+        ``forget**age``, where age is the number of values received after
+        it. Default is 1 (no forgetting).
+    window : int, optional
+        Only use the `window` most recent values.
+
+    Examples
+    --------
+    >>> est = OnlineRayleigh(window=10000)
+    >>> est.update(peaks)
+    >>> loc, scale = est.params
+    '''
+    dist = rayleigh
+    _n_sums = 2
+
+    def _features(self, y):
+        return np.array([np.ones_like(y), y * y])
+
+    def _params(self):
+        count, sum_sq = self._sums
+        return self.floc, sqrt(sum_sq / (2. * count))
+
+
+class OnlineWeibull(_OnlineEstimator):
+    '''
+    Online estimation of the 2-parameter Weibull distribution.
+
+    Running sums of the first two moments of ``log(x - floc)`` give O(1)
+    updated method of moments estimates. These are corrected towards the
+    maximum likelihood estimates by a few Newton iterations over the kept
+    history every `refine_every` values.
+
+    The kept history is the `window`, or else the `history` most recent
+    values, so memory use and the cost of a refinement are bounded. The
+    correction is the ratio of the maximum likelihood and moment estimates
+    of the history. Once the history no longer holds all values, the
+    corrections of successive refinements are averaged, and applied to the
+    moment estimates of all values.
+
+    Parameters
+    ----------
+    floc : float, optional
+        Fixed location parameter. Default is 0. All values must be larger.
+    forget : float, optional
+        Exponential forgetting factor in (0, 1]. Default is 1.
+    window : int, optional
+        Only use the `window` most recent values.
+    refine_every : int, optional
+        Number of values between Newton refinements. Default is 1000. If
+        None, only `refine` updates the correction.
+    history : int, optional
+        Number of recent values kept for the refinement if no `window` is
+        given. Default is 10000. If None, all values are kept, and the
+        refinement equals the batch fit, at a cost that grows with the
+        number of values.
+
+    Examples
+    --------
+    >>> est = OnlineWeibull(forget=0.999)
+    >>> est.update(peaks)
+    >>> c, loc, scale = est.params
+    '''
+    dist = weibull
+    _n_sums = 3
+    _keep_history = True
+
+    def __init__(self, floc=0., forget=1., window=None, refine_every=1000,
+                 history=10000):
+        super(OnlineWeibull, self).__init__(
+            floc=floc, forget=forget, window=window, history=history)
+        self.refine_every = refine_every
+        self._c_ratio = 1.
+        self._log_scale_offset = 0.
+        self._correction_weight = 0.
+        self._since_refine = 0
+
+    def _features(self, y):
+        log_y = log(y)
+        return np.array([np.ones_like(y), log_y, log_y * log_y])
+
+    def _moments(self, sums=None):
+        count, sum_log, sum_log_sq = self._sums if sums is None else sums
+        mean = sum_log / count
+        var = max(sum_log_sq / count - mean**2, 0.)
+        c = pi / sqrt(6. * var)
+        return c, mean + _EULER / c
+
+    def _params(self):
+        c, log_scale = self._moments()
+        c *= self._c_ratio
+        log_scale += self._log_scale_offset
+        return c, self.floc, exp(log_scale)
+
+    def _after_update(self, k):
+        self._since_refine += k
+        if (self.refine_every is not None
+                and self._since_refine >= self.refine_every):
+            self.refine(maxiter=3)
+
+    def refine(self, maxiter=100):
+        '''
+        Update the maximum likelihood correction by Newton iteration over
+        the kept history.
+
+        Parameters
+        ----------
+        maxiter : int, optional
+            Maximum number of Newton iterations. With the default the
+            iteration runs to convergence, and `params` equals the batch
+            maximum likelihood fit with fixed location of the kept history,
+            i.e. of all values if they fit in the history.
+
+        Returns
+        -------
+        self : object
+        '''
+        if len(self._buffer) < 2:
+            return self
+        y, index = self._buffer.values()
+        weights = self._weights(index)
+        # The correction is the ratio of the estimates of the history, which
+        # is less noisy than the ratio to the moments of all values
+        c_mom, log_scale_mom = self._moments(self._features(y) @ weights)
+        c, scale = _weibull_mle(y, weights=weights,
+                                c0=c_mom * self._c_ratio, maxiter=maxiter)
+        log_c_ratio = log(c / c_mom)
+        log_scale_offset = log(scale) - log_scale_mom
+        if not self._history_complete():
+            # Average the corrections of the partial histories, weighted by
+            # the number of values since the previous refinement
+            k = max(self._since_refine, 1)
+            w_old = self._correction_weight * self.forget**k
+            self._correction_weight = w_old + k
+            a = w_old / self._correction_weight
+            log_c_ratio = a * log(self._c_ratio) + (1. - a) * log_c_ratio
+            log_scale_offset = (a * self._log_scale_offset
+                                + (1. - a) * log_scale_offset)
+        self._c_ratio = exp(log_c_ratio)
+        self._log_scale_offset = log_scale_offset
+        self._since_refine = 0
+        return self
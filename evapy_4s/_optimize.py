@@ -3,7 +3,315 @@ Custom optimization routines for distributions where ML estimators perform
 poorly or do not exist.
 '''
 
+import threading
+from contextlib import contextmanager
+
 import numpy as np
+from scipy import optimize
+from scipy.stats import rv_continuous
+
+
+# Sample information for ``_residual_error`` while a least-square fit runs.
+# Thread-local, since the distribution instances are shared.
+_fit_context = threading.local()
+
+
+@contextmanager
+def _sorted_sample(n_total=None, floc=None):
+    '''
+    Context where the data passed to ``_residual_error`` is sorted.
+
+    Parameters
+    ----------
+    n_total : int, optional
+        Size of the full sample if the data is only the upper tail of it.
+    floc : float, optional
+        Fixed location parameter of the fit, for the starting values.
+    '''
+    # Nested fits, e.g. a start value fit within a fit, restore the context
+    # of the enclosing fit on exit
+    previous = _fit_sample_info()
+    _fit_context.sorted = True
+    _fit_context.n_total = n_total
+    _fit_context.floc = floc
+    try:
+        yield
+    finally:
+        (_fit_context.sorted, _fit_context.n_total,
+         _fit_context.floc) = previous
+
+
+def _fit_sample_info():
+    '''
+    Return whether the data is sorted, the size of the full sample (or None)
+    and the fixed location (or None) of the running fit.
+    '''
+    return (getattr(_fit_context, 'sorted', False),
+            getattr(_fit_context, 'n_total', None),
+            getattr(_fit_context, 'floc', None))
+
+
+def _lmoments(x, is_sorted=False):
+    '''
+    Return the first two sample L-moments and the sample L-skewness.
+
+    Uses the unbiased estimators of the probability weighted moments
+    (Hosking, 1990), i.e. one sort and a few dot products.
+
+    Parameters
+    ----------
+    x : array-like
+        Sample with at least 3 values.
+    is_sorted : bool, optional
+        Whether `x` is sorted in increasing order.
+
+    Returns
+    -------
+    l1, l2, t3 : float
+        Mean, L-scale and L-skewness.
+    '''
+    x = np.asarray(x, dtype='float64').ravel()
+    if not is_sorted:
+        x = np.sort(x)
+    n = x.size
+    if n < 3:
+        raise ValueError('At least 3 values are required.')
+    i = np.arange(n, dtype='float64')
+    b0 = np.mean(x)
+    b1 = np.dot(i, x) / (n * (n - 1.))
+    b2 = np.dot(i * (i - 1.), x) / (n * (n - 1.) * (n - 2.))
+    l2 = 2. * b1 - b0
+    l3 = 6. * b2 - 6. * b1 + b0
+    return b0, l2, l3 / l2
+
+
+def _lmoment_fit(dist, data, kwds):
+    '''
+    Return the L-moment estimates of a distribution with the method
+    ``_lmoment_params(l1, l2, t3, floc=None)``.
+    '''
+    kwds = dict(kwds)
+    kwds.pop('method')
+    floc = kwds.pop('floc', None)
+    if kwds:
+        raise TypeError("Unknown arguments for method 'lmoments': {}.".format(
+            ', '.join(kwds)))
+    data = np.asarray(data, dtype='float64').ravel()
+    if not np.isfinite(data).all():
+        raise ValueError("The data contains non-finite values.")
+    return dist._lmoment_params(*_lmoments(data), floc=floc)
+
+
+def _select_tail(data, tail=None):
+    '''
+    Return the sorted upper tail of a sample.
+
+    Parameters
+    ----------
+    data : array-like
+        Sample.
+    tail : int or float, optional
+        Number of largest values (int) or fraction of the sample (float) to
+        select. If None, the full sample is returned.
+
+    Returns
+    -------
+    x : array-like
+        Sorted selected values.
+    n_total : int
+        Size of the full sample.
+    '''
+    data = np.asarray(data, dtype='float64').ravel()
+    n_total = data.size
+    if tail is None:
+        return np.sort(data), n_total
+
+    if isinstance(tail, (int, np.integer)):
+        k = int(tail)
+    elif 0. < tail <= 1.:
+        k = int(np.ceil(tail * n_total))
+    else:
+        raise ValueError('tail must be a count or a fraction in (0, 1].')
+    if not 0 < k <= n_total:
+        raise ValueError('tail must select between 1 and {} values.'.format(
+            n_total))
+
+    # Partial selection is O(N); only the selected values are sorted.
+    x = np.partition(data, n_total - k)[n_total - k:]
+    x.sort()
+    return x, n_total
+
+
+def _lsq_fit(fit, data, *args, **kwds):
+    '''
+    Run `fit` with sorted data for the least-square objective
+    ``_residual_error``, optionally on the upper tail only.
+
+    Parameters
+    ----------
+    fit : callable
+        ``rv_continuous.fit`` of the distribution.
+    data : array-like
+        Sample.
+    tail : int or float, optional
+        Fit only the largest values, see `_select_tail`. The plotting
+        positions are computed relative to the full sample.
+
+    Other arguments are passed on to `fit`.
+
+    Notes
+    -----
+    Without starting values, the fit is run from both the ``_fitstart`` of
+    the distribution and the generic start of `rv_continuous`, and the
+    parameters with the smaller residual error are returned. The objective
+    has several local minima, and neither start finds the best one on all
+    samples.
+    '''
+    tail = kwds.pop('tail', None)
+    x, n_total = _select_tail(data, tail)
+    with _sorted_sample(n_total if tail is not None else None,
+                        kwds.get('floc')):
+        if args or 'loc' in kwds or 'scale' in kwds:
+            return fit(x, *args, **kwds)
+        dist = fit.__self__
+        starts = [tuple(dist._fitstart(x))]
+        generic = tuple(rv_continuous._fitstart(dist, x))
+        if generic != starts[0]:
+            starts.append(generic)
+        best, best_error = None, np.inf
+        for start in starts:
+            params = fit(x, *start[:-2], loc=start[-2], scale=start[-1],
+                         **kwds)
+            error = dist._penalized_nnlf(np.asarray(params), x)
+            if best is None or error < best_error:
+                best, best_error = params, error
+        return best
+
+
+def _stratified_sample(x, m):
+    '''
+    Return `m` values of `x` at the midpoints of `m` strata of equal size.
+    For a sorted sample, this is a sample in sorted-quantile order, and
+    otherwise a systematic subsample.
+    '''
+    n = x.size
+    return x[((np.arange(m) + 0.5) * (n / m)).astype('int64')]
+
+
+def _relative_change(dist, params, params_prev, n_return=None):
+    '''
+    Return the largest relative change of the parameters, with the location
+    and scale relative to the scale, or the relative change of the level
+    exceeded once in `n_return` values.
+    '''
+    if n_return is not None:
+        x = dist.isf(1. / n_return, *params)
+        x_prev = dist.isf(1. / n_return, *params_prev)
+        return abs(x - x_prev) / abs(x)
+    params, params_prev = np.asarray(params), np.asarray(params_prev)
+    scale = np.r_[np.abs(params[:-2]), params[-1], params[-1]]
+    return np.max(np.abs(params - params_prev) / scale)
+
+
+def _progressive_fit(dist, data, args, kwds):
+    '''
+    Fit a distribution on stratified subsamples of increasing size, until
+    the parameters or a return level converge.
+
+    Each stage fits a subsample of twice the size of the previous one,
+    starting from the parameters of the previous stage. A stage of `m`
+    values sorts a systematic subsample of ``16 * m`` values, and fits the
+    values of it in sorted-quantile order (see `_stratified_sample`). So the
+    cost of a stage does not depend on the size of the sample until the
+    subsample is the full sample, which is sorted only then. The last stage
+    is the full sample.
+
+    Parameters
+    ----------
+    dist : rv_continuous
+        Distribution to fit.
+    data : array-like
+        Sample.
+    args : tuple
+        Starting values of the shapes for the first stage.
+    kwds : dict
+        Keyword arguments of ``dist.fit``, with the following additions.
+
+    Keywords
+    --------
+    progressive : bool or int
+        Number of fitted values of the first stage if int, or 1000.
+    rtol : float, optional
+        Relative change between stages to stop at, see `_relative_change`.
+        Default is 1e-3.
+    n_return : float, optional
+        Stop on the change of the level exceeded once in `n_return` values
+        instead of the parameters.
+    full_output : bool, optional
+        Also return the fraction of the sample used. Default is False.
+
+    Other keywords are passed on to ``dist.fit``. A ``tail`` is fitted as
+    the same fraction of each subsample.
+
+    Returns
+    -------
+    params : tuple
+        Parameter estimates.
+    fraction : float
+        Fraction of the sample fitted in the last stage, if `full_output`.
+    '''
+    kwds = dict(kwds)
+    n_start = kwds.pop('progressive')
+    n_start = 1000 if n_start is True else int(n_start)
+    rtol = kwds.pop('rtol', 1e-3)
+    n_return = kwds.pop('n_return', None)
+    full_output = kwds.pop('full_output', False)
+    if n_start < 1:
+        raise ValueError('progressive must be a positive number of values.')
+
+    x = np.asarray(data, dtype='float64').ravel()
+    n = x.size
+    x_sorted = None
+    tail = kwds.get('tail')
+    if tail is None:
+        fraction = 1.
+    elif isinstance(tail, (int, np.integer)):
+        fraction = tail / n
+    else:
+        fraction = tail
+
+    m_fit = n_start
+    params = None
+    while True:
+        m = int(np.ceil(m_fit / fraction))
+        stage_kwds = dict(kwds)
+        if m < n:
+            n_sub = min(16 * m, n)
+            if n_sub < n:
+                sub = np.sort(_stratified_sample(x, n_sub))
+            else:
+                if x_sorted is None:
+                    x_sorted = np.sort(x)
+                sub = x_sorted
+            sample = _stratified_sample(sub, m)
+            if tail is not None:
+                stage_kwds['tail'] = float(fraction)
+        else:
+            m, sample = n, x if x_sorted is None else x_sorted
+        start = args
+        if params is not None:
+            start = params[:-2]
+            stage_kwds['loc'], stage_kwds['scale'] = params[-2:]
+        params_prev, params = params, tuple(
+            float(p) for p in dist.fit(sample, *start, **stage_kwds))
+        if m == n or (params_prev is not None and _relative_change(
+                dist, params, params_prev, n_return) <= rtol):
+            break
+        m_fit *= 2
+
+    if full_output:
+        return params, m / n
+    return params
 
 
 def _residual_error(self, theta, x, y_fun, **kwargs):
@@ -41,19 +349,199 @@ def _residual_error(self, theta, x, y_fun, **kwargs):
         return np.inf
 
     x = np.asarray((x-loc) / scale)
-    x.sort()
+    if not getattr(_fit_context, 'sorted', False):
+        x.sort()
 
-    if np.isneginf(self.a).all() and np.isinf(self.b).all():
-        Nbad = 0
-    else:
-        cond0 = (x <= self.a) | (self.b <= x)
-        Nbad = sum(cond0)
-        if Nbad > 0:
-            x = x[~cond0]
+    # Values outside the support are at the ends of the sorted sample
+    n_x = len(x)
+    lo = np.searchsorted(x, self.a, side='right')
+    hi = np.searchsorted(x, self.b, side='left')
+    Nbad = lo + n_x - hi
+    x = x[lo:hi]
 
     N = len(x)
-
-#  Refactor ecdf out into own code at some point.
-    f_ecdf = np.array([(i + 1 - 0.3)/(N + 0.4) for i in range(N)])
+    n_total = getattr(_fit_context, 'n_total', None)
+    if n_total is None:
+        f_ecdf = (np.arange(N) + 1 - 0.3)/(N + 0.4)
+    else:
+        # Rank of the tail values in the full sample
+        rank = np.arange(N) + (n_total - n_x + lo + 1)
+        f_ecdf = (rank - 0.3)/(n_total + 0.4)
     error = np.abs(y_fun(f_ecdf) - y_fun(self._cdf(x, *args)))**2.
     return np.sum(error) + Nbad * 10000.
+
+
+def _weibull_mle(x, weights=None, c0=1., tol=1e-10, maxiter=100,
+                 threshold=0.):
+    '''
+    Return maximum likelihood estimates of the 2-parameter Weibull
+    distribution by Newton iteration on the profile score of the shape.
+
+    Parameters
+    ----------
+    x : array-like
+        Positive data, i.e. data with the location parameter subtracted.
+    weights : array-like, optional
+        Non-negative weight of each value. Default is equal weights.
+    threshold : float, optional
+        Known left truncation point of the data, with the location parameter
+        subtracted. Default is 0 (no truncation).
+    c0 : float, optional
+        Initial guess of the shape parameter.
+    tol : float, optional
+        Relative tolerance of the shape parameter.
+    maxiter : int, optional
+        Maximum number of Newton iterations.
+
+    Returns
+    -------
+    c : float
+        Shape parameter.
+    scale : float
+        Scale parameter.
+    '''
+    log_x = np.log(x)
+    if weights is None:
+        weights = np.ones_like(log_x)
+    w_sum = np.sum(weights)
+
+    # Shift log values to avoid overflow in x**c
+    log_ref = np.max(log_x)
+    u = log_x - log_ref
+    u_mean = np.dot(weights, u) / w_sum
+    if threshold > 0.:
+        u_t = np.log(threshold) - log_ref
+
+    c = float(c0)
+    for _ in range(maxiter):
+        w_xc = weights * np.exp(c * u)
+        s0 = np.sum(w_xc)
+        s1 = np.dot(w_xc, u)
+        s2 = np.dot(w_xc, u * u)
+        if threshold > 0.:
+            w_tc = w_sum * np.exp(c * u_t)
+            s0 -= w_tc
+            s1 -= w_tc * u_t
+            s2 -= w_tc * u_t**2
+        s1 /= s0
+        s2 /= s0
+        score = 1. / c + u_mean - s1
+        dscore = -1. / c**2 - (s2 - s1**2)
+        step = score / dscore
+        c_new = c - step
+        if c_new <= 0.:
+            c_new = c / 2.
+        converged = abs(c_new - c) <= tol * c
+        c = c_new
+        if converged:
+            break
+
+    s0 = np.sum(weights * np.exp(c * u))
+    if threshold > 0.:
+        s0 -= w_sum * np.exp(c * u_t)
+    scale = np.exp(log_ref + np.log(s0 / w_sum) / c)
+    return c, scale
+
+
+def _weibull_profile(y, c0=1.):
+    '''
+    Return the 2-parameter Weibull fit and the maximized log-likelihood of
+    positive data.
+    '''
+    c, scale = _weibull_mle(y, c0=c0)
+    n = y.size
+    loglike = n * (np.log(c) - c * np.log(scale) - 1.) \
+        + (c - 1.) * np.sum(np.log(y))
+    return loglike, c, scale
+
+
+def _weibull3_mle(x, n_grid=12, spread=(1e-8, 1e3), c0=1., loc0=None):
+    '''
+    Return maximum likelihood estimates of the 3-parameter Weibull
+    distribution by profile likelihood over the location.
+
+    For each candidate location the shape and scale are found by
+    `_weibull_mle`, so only a 1-D search remains. The location is searched
+    as ``loc = min(x) - delta``, first on a log-spaced grid of `delta` and
+    then by a bounded scalar search around the best grid point. With a
+    starting location, a short grid within a factor 10 of its `delta` is
+    tried first, and the full grid is only searched if the best point is at
+    an end of the short grid.
+
+    Parameters
+    ----------
+    x : array-like
+        Data.
+    n_grid : int, optional
+        Number of grid points of `delta`.
+    spread : tuple, optional
+        Range of `delta` relative to the range of the data.
+    c0 : float, optional
+        Starting value of the shape for the Newton iterations. Default is 1.
+    loc0 : float, optional
+        Starting value of the location, e.g. the estimate of a previous fit
+        to a similar sample. Ignored unless below the sample minimum.
+
+    Returns
+    -------
+    c, loc, scale : float
+        Maximum likelihood estimates.
+
+    Notes
+    -----
+    For shape parameters below 1 the likelihood is unbounded as the location
+    approaches the sample minimum. If the profile likelihood increases all the
+    way to the lower end of the grid with a shape below 1, the location is
+    set to the sample minimum, and the shape and scale are fitted to the
+    remaining values (Smith, 1985).
+    '''
+    x = np.sort(np.asarray(x, dtype='float64').ravel())
+    x_min = x[0]
+    r = x[-1] - x_min
+    if not r > 0.:
+        raise ValueError('Data must have more than one distinct value.')
+
+    bounds = np.log(spread[0] * r), np.log(spread[1] * r)
+    state = {'c': c0}
+
+    def nll(s):
+        loglike, state['c'], _ = _weibull_profile(
+            x - (x_min - np.exp(s)), c0=state['c'])
+        return -loglike
+
+    def grid(log_delta):
+        # Evaluate from large to small delta, as the shape decreases
+        # smoothly
+        profile = np.empty(log_delta.size)
+        c_grid = np.empty(log_delta.size)
+        for i in range(log_delta.size - 1, -1, -1):
+            profile[i] = nll(log_delta[i])
+            c_grid[i] = state['c']
+        return profile, c_grid, int(np.argmin(profile))
+
+    k = -1
+    if loc0 is not None and loc0 < x_min:
+        log_delta = np.clip(np.log(x_min - loc0) + np.log(10.) *
+                            np.linspace(-1., 1., 5), *bounds)
+        profile, c_grid, k = grid(log_delta)
+        if k in (0, log_delta.size - 1):
+            k = -1
+            state['c'] = c0
+    if k < 0:
+        log_delta = np.linspace(bounds[0], bounds[1], n_grid)
+        profile, c_grid, k = grid(log_delta)
+    n_grid = log_delta.size
+
+    if k == 0 and c_grid[0] < 1.:
+        # Unbounded likelihood, fix the location at the sample minimum
+        c, scale = _weibull_mle(x[x > x_min] - x_min, c0=c_grid[0])
+        return c, x_min, scale
+
+    lo, hi = log_delta[max(k - 1, 0)], log_delta[min(k + 1, n_grid - 1)]
+    state['c'] = c_grid[k]
+    res = optimize.minimize_scalar(nll, bounds=(lo, hi), method='bounded',
+                                   options={'xatol': 1e-4})
+    s = res.x if res.fun <= profile[k] else log_delta[k]
+    loc = x_min - np.exp(s)
+    c, scale = _weibull_mle(x - loc, c0=state['c'])
+    return c, loc, scale
@@ -0,0 +1,267 @@
+'''
+Compact persistent storage of declustered peaks.
+
+An archive is a directory with the peaks split in blocks of a fixed number
+of peaks. Peak indices are delta encoded with the smallest unsigned integer
+type that fits the largest gap, and peak values are stored as float32 or
+float64, or quantized to uint8 or uint16 within the range of each block.
+Per-block metadata (position, count, index and time span, min and max) is
+loaded on open, while the peak data is memory mapped, so a selection only
+reads the blocks it overlaps.
+'''
+
+import json
+import os
+
+import numpy as np
+
+
+_VERSION = 1
+
+_META_DTYPE = np.dtype([('offset', 'int64'), ('count', 'int64'),
+                        ('first', 'int64'), ('last', 'int64'),
+                        ('t_start', 'float64'), ('t_stop', 'float64'),
+                        ('min', 'float64'), ('max', 'float64')])
+
+_VALUE_DTYPES = ('float32', 'float64', 'uint8', 'uint16')
+
+
+def _delta_dtype(max_delta):
+    for dtype in ('uint8', 'uint16', 'uint32'):
+        if max_delta <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype('uint64')
+
+
+def _index_bounds(start, stop, t_start, t_stop, t0, dt):
+    '''
+    Return the range ``[start, stop)`` of sample indices within an index and
+    time range, for samples at the times ``t0 + i * dt``.
+    '''
+    if t_start is not None or t_stop is not None:
+        if dt is None:
+            raise ValueError('No sampling interval (dt) given.')
+        if t_start is not None:
+            t_start = int(np.ceil((t_start - t0) / dt))
+            start = t_start if start is None else max(start, t_start)
+        if t_stop is not None:
+            t_stop = int(np.ceil((t_stop - t0) / dt))
+            stop = t_stop if stop is None else min(stop, t_stop)
+    return start, stop
+
+
+def save_peaks(path, index, values, dt=None, t0=0., dtype='float32',
+               blocksize=4096):
+    '''
+    Save peaks to a compact archive.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the archive. Created if it does not exist.
+    index : array-like
+        Increasing peak indices, e.g. from `argrelmax_decluster`.
+    values : array-like
+        Peak values.
+    dt : float, optional
+        Sampling interval. If given, the time of sample ``i`` is
+        ``t0 + i * dt``, and the archive can be selected by time.
+    t0 : float, optional
+        Time of the first sample. Default is 0.
+    dtype : str, optional
+        Storage type of the values. One of 'float32' (default), 'float64',
+        or 'uint8' and 'uint16', which quantize the values linearly between
+        the min and max of each block. Quantized values must be finite.
+    blocksize : int, optional
+        Number of peaks per block. Default is 4096.
+
+    Returns
+    -------
+    archive : PeakArchive
+        The saved archive.
+    '''
+    index = np.asarray(index, dtype='int64').ravel()
+    values = np.asarray(values, dtype='float64').ravel()
+    if index.shape != values.shape:
+        raise ValueError('index and values must have the same length.')
+    if dtype not in _VALUE_DTYPES:
+        raise ValueError('dtype must be one of {}.'.format(_VALUE_DTYPES))
+    quantized = dtype.startswith('uint')
+    if quantized and not np.isfinite(values).all():
+        raise ValueError('Quantized values must be finite.')
+
+    n = index.size
+    delta = np.diff(index, prepend=index[:1])
+    if (delta < 0).any():
+        raise ValueError('index must be increasing.')
+    starts = np.arange(0, n, blocksize)
+    delta[starts] = 0
+
+    meta = np.zeros(starts.size, dtype=_META_DTYPE)
+    meta['offset'] = starts
+    meta['count'] = np.diff(np.r_[starts, n])
+    meta['first'] = index[starts]
+    meta['last'] = index[np.r_[starts[1:], n] - 1]
+    if n:
+        with np.errstate(invalid='ignore'):
+            meta['min'] = np.fmin.reduceat(values, starts)
+            meta['max'] = np.fmax.reduceat(values, starts)
+    time_step = 1. if dt is None else dt
+    meta['t_start'] = t0 + meta['first'] * time_step
+    meta['t_stop'] = t0 + meta['last'] * time_step
+
+    if quantized:
+        levels = np.iinfo(dtype).max
+        lo = np.repeat(meta['min'], meta['count'])
+        span = np.repeat(meta['max'] - meta['min'], meta['count'])
+        # Blocks of equal values are stored as zeros
+        with np.errstate(invalid='ignore'):
+            q = np.rint((values - lo) / span * levels)
+        stored = np.where(span > 0, q, 0.).astype(dtype)
+    else:
+        stored = values.astype(dtype)
+
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    header = {'version': _VERSION, 'n': int(n), 'blocksize': int(blocksize),
+              'dtype': dtype, 'dt': dt, 't0': t0}
+    with open(os.path.join(path, 'header.json'), 'w') as f:
+        json.dump(header, f)
+    np.save(os.path.join(path, 'meta.npy'), meta)
+    np.save(os.path.join(path, 'delta.npy'),
+            delta.astype(_delta_dtype(delta.max() if n else 0)))
+    np.save(os.path.join(path, 'values.npy'), stored)
+    return PeakArchive(path)
+
+
+class PeakArchive(object):
+    '''
+    Lazily loaded archive of peaks, see `save_peaks`.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the archive.
+
+    Attributes
+    ----------
+    meta : array-like
+        Structured array with one record per block and the fields
+        ``offset``, ``count``, ``first`` and ``last`` (peak index),
+        ``t_start`` and ``t_stop``, ``min`` and ``max``.
+
+    Examples
+    --------
+    >>> peaks = argrelmax_decluster(x)
+    >>> save_peaks('peaks_2019', peaks, x[peaks], dt=0.1)
+    >>> archive = PeakArchive('peaks_2019')
+    >>> index, values = archive.select(t_start=t_march, t_stop=t_april)
+    >>> params = weibull.fit(values, floc=0.)
+    '''
+    def __init__(self, path):
+        with open(os.path.join(path, 'header.json')) as f:
+            header = json.load(f)
+        if header['version'] > _VERSION:
+            raise ValueError('Unsupported archive version {}.'.format(
+                header['version']))
+        self.path = path
+        self.dtype = header['dtype']
+        self.dt = header['dt']
+        self.t0 = header['t0']
+        self.blocksize = header['blocksize']
+        self.meta = np.load(os.path.join(path, 'meta.npy'))
+        self._delta = np.load(os.path.join(path, 'delta.npy'), mmap_mode='r')
+        self._values = np.load(os.path.join(path, 'values.npy'),
+                               mmap_mode='r')
+
+    def __len__(self):
+        return self._values.shape[0]
+
+    def _blocks(self, start=None, stop=None, vmin=None, vmax=None):
+        '''
+        Return the blocks that may contain selected peaks.
+        '''
+        meta = self.meta
+        mask = np.ones(meta.size, dtype='bool')
+        if start is not None:
+            mask &= meta['last'] >= start
+        if stop is not None:
+            mask &= meta['first'] < stop
+        if vmin is not None:
+            mask &= ~(meta['max'] < vmin)
+        if vmax is not None:
+            mask &= ~(meta['min'] > vmax)
+        return np.flatnonzero(mask)
+
+    def _read_blocks(self, blocks):
+        '''
+        Decode the peaks of the blocks.
+        '''
+        meta = self.meta[blocks]
+        if not meta.size:
+            return np.array([], dtype='int64'), np.array([])
+        counts = meta['count']
+        first = np.r_[0, np.cumsum(counts)[:-1]]
+        pos = (np.arange(counts.sum())
+               + np.repeat(meta['offset'] - first, counts))
+
+        # The first delta of each block is zero
+        index = np.cumsum(self._delta[pos], dtype='int64')
+        index -= np.repeat(index[first] - meta['first'], counts)
+
+        if self.dtype.startswith('uint'):
+            levels = np.iinfo(self.dtype).max
+            step = (meta['max'] - meta['min']) / levels
+            values = self._values[pos] * np.repeat(step, counts)
+            values += np.repeat(meta['min'], counts)
+        else:
+            values = self._values[pos].astype('float64')
+        return index, values
+
+    def select(self, start=None, stop=None, t_start=None, t_stop=None,
+               vmin=None, vmax=None):
+        '''
+        Read the peaks within an index, time and value range.
+
+        Only blocks that overlap the range are read.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            Select peaks with ``start <= index < stop``.
+        t_start, t_stop : float, optional
+            Select peaks with ``t_start <= t < t_stop``. Requires that the
+            archive was saved with `dt`.
+        vmin, vmax : float, optional
+            Select peaks with ``vmin <= value <= vmax``.
+
+        Returns
+        -------
+        index : array-like
+            Peak indices.
+        values : array-like
+            Peak values.
+        '''
+        start, stop = _index_bounds(start, stop, t_start, t_stop,
+                                    self.t0, self.dt)
+        index, values = self._read_blocks(
+            self._blocks(start, stop, vmin, vmax))
+
+        mask = np.ones(index.size, dtype='bool')
+        if start is not None:
+            mask &= index >= start
+        if stop is not None:
+            mask &= index < stop
+        if vmin is not None:
+            mask &= values >= vmin
+        if vmax is not None:
+            mask &= values <= vmax
+        return index[mask], values[mask]
+
+    def times(self, index):
+        '''
+        Return the time of peak indices.
+        '''
+        if self.dt is None:
+            raise ValueError('Archive saved without dt.')
+        return self.t0 + np.asarray(index) * self.dt
@@ -0,0 +1,122 @@
+'''
+Goodness-of-fit diagnostics for many fitted samples at once.
+'''
+
+import numpy as np
+from scipy import stats
+
+
+_GOF_DTYPE = np.dtype([('n', 'int64'), ('ks', 'float64'),
+                       ('ks_pvalue', 'float64'), ('ad', 'float64'),
+                       ('ppcc', 'float64')])
+
+
+def _ragged(samples):
+    '''
+    Return concatenated samples and segment offsets.
+    '''
+    if isinstance(samples, np.ndarray) and samples.ndim == 2:
+        lengths = np.full(samples.shape[0], samples.shape[1])
+        x = samples.astype('float64').ravel()
+    else:
+        samples = [np.asarray(s, dtype='float64').ravel() for s in samples]
+        lengths = np.array([s.size for s in samples], dtype='int64')
+        x = np.concatenate(samples) if samples else np.array([])
+    offsets = np.r_[0, np.cumsum(lengths)]
+    return x, offsets
+
+
+def goodness_of_fit(dist, samples, params):
+    '''
+    Goodness-of-fit statistics for many samples and fitted parameters.
+
+    All samples are sorted in one pass, and the distribution functions are
+    evaluated once for all values. The Kolmogorov-Smirnov, Anderson-Darling
+    and probability plot correlation statistics then reuse the sorted
+    values and plotting positions.
+
+    Parameters
+    ----------
+    dist : object
+        Distribution, e.g. ``evapy_4s.distributions.weibull``.
+    samples : sequence of array-like or 2D array
+        Samples of possibly different length.
+    params : array-like
+        Fitted parameters (shapes, loc, scale) with shape
+        (n_samples, n_params), e.g. the stacked output of ``dist.fit``.
+
+    Returns
+    -------
+    result : array-like
+        Structured array with one record per sample and the fields:
+
+        - ``n``: sample size.
+        - ``ks``: Kolmogorov-Smirnov statistic.
+        - ``ks_pvalue``: p-value of the Kolmogorov-Smirnov statistic,
+          assuming known parameters.
+        - ``ad``: Anderson-Darling statistic.
+        - ``ppcc``: probability plot correlation coefficient.
+
+        Empty samples give NaN statistics.
+
+    Notes
+    -----
+    The probability plot uses the plotting positions
+    ``(i - 0.3) / (n + 0.4)``, as used by the least-square fits.
+    '''
+    x, offsets = _ragged(samples)
+    lengths = np.diff(offsets)
+    n_samples = lengths.size
+
+    params = np.asarray(params, dtype='float64').reshape(n_samples, -1)
+    if params.shape[1] != dist.numargs + 2:
+        raise ValueError('Expected {} parameters per sample, got {}.'.format(
+            dist.numargs + 2, params.shape[1]))
+
+    result = np.empty(n_samples, dtype=_GOF_DTYPE)
+    result['n'] = lengths
+    for name in ('ks', 'ks_pvalue', 'ad', 'ppcc'):
+        result[name] = np.nan
+
+    nonempty = lengths > 0
+    if not nonempty.any():
+        return result
+    starts = offsets[:-1][nonempty]
+    n = lengths[nonempty]
+
+    # Sort all samples in one pass
+    seg = np.repeat(np.arange(n_samples), lengths)
+    x = x[np.lexsort((x, seg))]
+    rank = np.arange(1, x.size + 1) - offsets[seg]
+    n_el = lengths[seg]
+
+    p_el = params[seg]
+    shapes = tuple(p_el[:, :-2].T)
+    cdf = dist.cdf(x, *shapes, loc=p_el[:, -2], scale=p_el[:, -1])
+
+    # Kolmogorov-Smirnov
+    d = np.maximum(rank / n_el - cdf, cdf - (rank - 1.) / n_el)
+    ks = np.maximum.reduceat(d, starts)
+    result['ks'][nonempty] = ks
+    result['ks_pvalue'][nonempty] = stats.kstwo.sf(ks, n)
+
+    # Anderson-Darling
+    with np.errstate(divide='ignore'):
+        terms = ((2. * rank - 1.) * np.log(cdf)
+                 + (2. * (n_el - rank) + 1.) * np.log1p(-cdf))
+    result['ad'][nonempty] = -n - np.add.reduceat(terms, starts) / n
+
+    # Probability plot correlation coefficient
+    pp = (rank - 0.3) / (n_el + 0.4)
+    m = dist.ppf(pp, *shapes)
+    x_mean = np.add.reduceat(x, starts) / n
+    m_mean = np.add.reduceat(m, starts) / n
+    idx = np.repeat(np.arange(n.size), n)
+    dx = x - x_mean[idx]
+    dm = m - m_mean[idx]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result['ppcc'][nonempty] = (
+            np.add.reduceat(dx * dm, starts)
+            / np.sqrt(np.add.reduceat(dx * dx, starts)
+                      * np.add.reduceat(dm * dm, starts)))
+    return result
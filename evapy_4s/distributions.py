@@ -1,4 +1,7 @@
 from . import _continuous_distns as _distns
 
 from ._continuous_distns import (rayleigh, weibull, weibull_min, gumbel,
-                                 gumbel_max, genexptail, acer_o1)
+                                 gumbel_max, genexptail, acer_o1,
+                                 truncrayleigh, truncweibull)
+
+from ._online import OnlineRayleigh, OnlineWeibull
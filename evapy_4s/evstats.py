@@ -1,7 +1,13 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 
-def _argrelmax(x):
+_CHUNKSIZE = 2**16
+
+
+def _argrelmax(x, breaks=None, out=None, work=None):
     '''
     Find the relative maxima of 1D time series data.
 
@@ -9,17 +15,37 @@ def _argrelmax(x):
     ----------
     x : array-like
         Time series data.
+    breaks : array-like, optional
+        Index of values that are not contiguous with the next value, see
+        `_gap_breaks`. Values next to a break are not peaks.
+    out : array-like, optional
+        Boolean array with the same length as `x` to write the result to.
+    work : array-like, optional
+        Boolean work array with the same length as `x`.
 
     Returns
     -------
     peaks : array-like
         Return the True values for all peaks.
     '''
-    peaks = np.r_[False, x[1:] > x[:-1]] & np.r_[x[:-1] >= x[1:], False]
+    if out is None:
+        out = np.empty(len(x), dtype=bool)
+    if work is None:
+        work = np.empty(len(x), dtype=bool)
+
+    peaks = out
+    peaks[:1] = False
+    np.greater(x[1:], x[:-1], out=peaks[1:])
+    work[-1:] = False
+    np.greater_equal(x[:-1], x[1:], out=work[:-1])
+    np.logical_and(peaks, work, out=peaks)
+    if breaks is not None and breaks.size:
+        peaks[breaks] = False
+        peaks[breaks + 1] = False
     return peaks
 
 
-def _argupcross(x, x_up):
+def _argupcross(x, x_up, breaks=None, out=None, work=None):
     '''
     Find the cross ups of 1D time series data.
 
@@ -27,93 +53,951 @@ def _argupcross(x, x_up):
     ----------
     x : array-like
         Time series data.
-    x_up : float
-        Upcrossing value.
+    x_up : float or array-like
+        Upcrossing value. If array-like, the level at each value of `x`.
+    breaks : array-like, optional
+        Index of values that are not contiguous with the next value, see
+        `_gap_breaks`. There are no upcrossings across a break.
+    out : array-like, optional
+        Boolean array with the same length as `x` to write the result to.
+    work : array-like, optional
+        Boolean work array with the same length as `x`.
 
     Returns
     -------
     zeroups : array-like
         Return the True values for all upcrossings.
     '''
-    zeroups = np.r_[x[1:] > x_up, False] & np.r_[x <= x_up]
+    if out is None:
+        out = np.empty(len(x), dtype=bool)
+    if work is None:
+        work = np.empty(len(x), dtype=bool)
+
+    x_up_next = x_up[1:] if np.ndim(x_up) else x_up
+    zeroups = out
+    zeroups[-1:] = False
+    np.greater(x[1:], x_up_next, out=zeroups[:-1])
+    np.less_equal(x, x_up, out=work)
+    np.logical_and(zeroups, work, out=zeroups)
+    if breaks is not None and breaks.size:
+        zeroups[breaks] = False
     return zeroups
 
 
-def argrelmax(x):
+def _gap_breaks(t=None, max_gap=None):
     '''
-    Find the relative maxima of 1D time series data.
+    Find gaps in the time stamps of 1D time series data.
+
+    Parameters
+    ----------
+    t : array-like, optional
+        Time stamps of the time series data.
+    max_gap : float, optional
+        Largest time step between two contiguous values.
+
+    Returns
+    -------
+    breaks : array-like
+        Return the index of all values that are followed by a gap. An empty
+        array is returned if `t` is not given.
+    '''
+    if t is None and max_gap is None:
+        return np.array([], dtype='int64')
+    elif t is None or max_gap is None:
+        raise ValueError('t and max_gap must be given together.')
+    return np.flatnonzero(np.diff(t) > max_gap)
+
+
+def _argmax_fallback(x):
+    '''
+    Return the index of the largest value ignoring NaN as a 1-element
+    array, or an empty array if all values are NaN. Used when no peak is
+    found.
+    '''
+    valid = ~np.isnan(x)
+    if not valid.any():
+        return np.array([], dtype='int64')
+    return np.asarray([np.nanargmax(x)])
+
+
+def _segment_argmax(x, bounds):
+    '''
+    Find the largest value of each segment ``x[bounds[k]:bounds[k+1]]``.
 
     Parameters
     ----------
     x : array-like
         Time series data.
+    bounds : array-like
+        Strictly increasing segment boundaries.
+
+    Returns
+    -------
+    x_max : array-like
+        Largest value of each segment. NaN if the segment contains NaN.
+    argmax : array-like
+        Index of the (first) largest value of each segment. -1 for segments
+        that contain NaN.
+    '''
+    start = bounds[0]
+    x_sub = x[start:bounds[-1]]
+    starts = bounds[:-1] - start
+
+    x_max = np.maximum.reduceat(x_sub, starts)
+    valid = ~np.isnan(x_max)
+    is_max = np.flatnonzero(x_sub == np.repeat(x_max, np.diff(bounds)))
+
+    argmax = np.full(x_max.shape, -1, dtype='int64')
+    argmax[valid] = is_max[np.searchsorted(is_max, starts[valid])] + start
+    return x_max, argmax
+
+
+def _cycle_argmax(x, zeroups, breaks=None):
+    '''
+    Find the largest value between consecutive upcrossings.
+
+    Parameters
+    ----------
+    x : array-like
+        Time series data.
+    zeroups : array-like
+        Sorted index of upcrossings. At least two upcrossings are required.
+    breaks : array-like, optional
+        Index of values that are followed by a gap.
+
+    Returns
+    -------
+    peaks : array-like
+        Return the index of the (first) largest value of each cycle. Cycles
+        that contain NaN values or gaps are left out.
+    '''
+    _, peaks = _segment_argmax(x, zeroups)
+    valid = peaks >= 0
+    if breaks is not None and breaks.size:
+        valid &= (np.searchsorted(breaks, zeroups[:-1])
+                  == np.searchsorted(breaks, zeroups[1:]))
+    return peaks[valid]
+
+
+class PeakKernel(object):
+    '''
+    Peak and upcrossing detection for fixed-size windows of time series data.
+
+    The boolean work arrays are allocated once, so repeated calls on windows
+    of the same size, e.g. in a monitoring loop, only allocate the returned
+    index array.
+
+    Parameters
+    ----------
+    n : int
+        Window size, i.e. the length of the time series data.
+
+    Examples
+    --------
+    >>> kernel = PeakKernel(len(window))
+    >>> while True:
+    ...     peaks = kernel.argrelmax(get_window())
+    '''
+    def __init__(self, n):
+        self.n = int(n)
+        self._out = np.empty(self.n, dtype=bool)
+        self._work = np.empty(self.n, dtype=bool)
+
+    def _check(self, x):
+        if len(x) != self.n:
+            raise ValueError(
+                'Expected {} values, got {}.'.format(self.n, len(x)))
+
+    def relmax(self, x):
+        '''
+        Find the relative maxima of `x`, see `_argrelmax`.
+
+        Returns
+        -------
+        peaks : array-like
+            Return the True values for all peaks. The array is reused by the
+            next call.
+        '''
+        self._check(x)
+        return _argrelmax(x, out=self._out, work=self._work)
+
+    def upcross(self, x, x_up=0.):
+        '''
+        Find the upcrossings of `x`, see `_argupcross`.
+
+        Returns
+        -------
+        zeroups : array-like
+            Return the True values for all upcrossings. The array is reused
+            by the next call.
+        '''
+        self._check(x)
+        return _argupcross(x, x_up, out=self._out, work=self._work)
+
+    def argrelmax(self, x):
+        '''
+        Find the relative maxima of `x`, see `argrelmax`.
+        '''
+        peaks = np.flatnonzero(self.relmax(x))
+        if peaks.size:
+            return peaks
+        else:
+            return _argmax_fallback(x)
+
+    def argupcross(self, x, x_up=0.):
+        '''
+        Find the upcrossings of `x`, see `argupcross`.
+        '''
+        zeroups = np.flatnonzero(self.upcross(x, x_up))
+        if zeroups.size:
+            return zeroups
+        else:
+            return np.array([0])
+
+
+class _StreamDecluster(object):
+    '''
+    Declustering of a time series that arrives in blocks.
+
+    Gives the same peaks as `argrelmax_decluster` on the concatenated
+    blocks, but only keeps the state of the current cycle between calls.
+
+    Parameters
+    ----------
+    x_up : float, optional
+        Upcrossing value. Default is 0.
+    '''
+    def __init__(self, x_up=0.):
+        self.x_up = x_up
+        self.n = 0
+        self._last = None
+        self._max = None
+        self._argmax = -1
+
+    def update(self, x, return_values=False):
+        '''
+        Add a block of data.
+
+        Parameters
+        ----------
+        x : array-like
+            Next block of time series data.
+        return_values : bool, optional
+            Also return the peak values. Default is False.
+
+        Returns
+        -------
+        peaks : array-like
+            Index, relative to the start of the stream, of the peaks of all
+            cycles completed by this block.
+        values : array-like
+            Peak values. Only returned if `return_values` is True.
+        '''
+        peaks, values = self._update(np.asarray(x, dtype='float64'))
+        if return_values:
+            return peaks, values
+        return peaks
+
+    def _update(self, x):
+        empty = (np.array([], dtype='int64'), np.array([]))
+        if not x.size:
+            return empty
+
+        if self._last is None:
+            z, base = x, self.n
+        else:
+            z, base = np.r_[self._last, x], self.n - 1
+        self.n += x.size
+        self._last = x[-1]
+
+        # The last value is kept until the next block tells whether an
+        # upcrossing follows it.
+        m = z.size - 1
+        if m == 0:
+            return empty
+
+        zeroups = np.flatnonzero(_argupcross(z, self.x_up)[:m])
+        bounds = np.r_[0, zeroups, m] if (not zeroups.size or zeroups[0])\
+            else np.r_[zeroups, m]
+        x_max, argmax = _segment_argmax(z, bounds)
+        argmax[argmax >= 0] += base
+
+        peaks, values = [], []
+        first = 0
+        if not zeroups.size or zeroups[0]:
+            self._extend(x_max[0], argmax[0])
+            first = 1
+        if not zeroups.size:
+            return empty
+
+        if self._max is not None and self._argmax >= 0:
+            peaks.append(self._argmax)
+            values.append(self._max)
+        valid = argmax[first:-1] >= 0
+        peaks.extend(argmax[first:-1][valid])
+        values.extend(x_max[first:-1][valid])
+
+        self._max, self._argmax = x_max[-1], argmax[-1]
+        return (np.asarray(peaks, dtype='int64'),
+                np.asarray(values, dtype='float64'))
+
+    def _extend(self, x_max, argmax):
+        '''
+        Extend the current cycle with a segment.
+        '''
+        if self._max is None:
+            return
+        if np.isnan(self._max) or np.isnan(x_max):
+            self._max, self._argmax = np.nan, -1
+        elif x_max > self._max:
+            self._max, self._argmax = x_max, argmax
+
+
+def _level(x, x_up, start, stop):
+    '''
+    Return the upcrossing level for ``x[start:stop]``.
+    '''
+    if callable(x_up):
+        return np.asarray(x_up(x, start, stop))
+    elif np.ndim(x_up):
+        return x_up[start:stop]
+    else:
+        return x_up
+
+
+def _argupcross_chunked(x, x_up, chunksize=_CHUNKSIZE, start=0, stop=None):
+    '''
+    Find the index of upcrossings of a level that varies along the series.
+
+    The level is evaluated and compared with `x` chunk by chunk, so no
+    detrended copy of the series is made.
+
+    Parameters
+    ----------
+    x : array-like
+        Time series data.
+    x_up : float, array-like or callable
+        Upcrossing level, see `argupcross`.
+    chunksize : int, optional
+        Number of values processed at a time.
+    start, stop : int, optional
+        Only find upcrossings at ``x[start:stop]``. Default is all of `x`.
+
+    Returns
+    -------
+    zeroups : array-like
+        Return the index of all values just before an upcrossing.
+    '''
+    n = len(x)
+    end = n - 1 if stop is None else min(stop, n - 1)
+    out = np.empty(min(chunksize + 1, n), dtype=bool)
+    work = np.empty_like(out)
+    zeroups = []
+    for lo in range(start, end, chunksize):
+        hi = min(lo + chunksize, end) + 1
+        level = _level(x, x_up, lo, hi)
+        zeroups_bool = _argupcross(x[lo:hi], level, out=out[:hi - lo],
+                                   work=work[:hi - lo])[:-1]
+        zeroups.append(np.flatnonzero(zeroups_bool) + lo)
+    if zeroups:
+        return np.concatenate(zeroups)
+    else:
+        return np.array([], dtype='int64')
+
+
+def _n_workers(n_jobs):
+    '''
+    Return number of worker threads for `n_jobs`.
+    '''
+    if n_jobs is None:
+        return 1
+    elif n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    elif n_jobs == 0:
+        raise ValueError('n_jobs must not be zero.')
+    return int(n_jobs)
+
+
+def _segments(n, n_jobs, min_size=_CHUNKSIZE):
+    '''
+    Split ``range(n)`` into at most one segment per worker. The segment
+    boundaries are multiples of `min_size`, such that chunked processing of
+    a segment gives the same chunks as for the full series.
+
+    Returns
+    -------
+    segments : list
+        List of (start, stop) pairs.
+    '''
+    n_blocks = n // min_size
+    n_parts = max(min(_n_workers(n_jobs), n_blocks), 1)
+    bounds = np.linspace(0, n_blocks, n_parts + 1).astype('int64') * min_size
+    bounds[-1] = n
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _remove_sorted(index, values):
+    '''
+    Remove `values` from the sorted array `index`.
+    '''
+    pos = np.searchsorted(index, values)
+    found = pos < index.size
+    found[found] = index[pos[found]] == values[found]
+    return np.delete(index, pos[found])
+
+
+def _map(func, items, n_jobs):
+    '''
+    Return ``[func(item) for item in items]``, evaluated on a thread pool.
+
+    The peak detection is NumPy bound and releases the GIL, so threads run
+    in parallel.
+    '''
+    n_workers = min(_n_workers(n_jobs), len(items))
+    if n_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _argrelmax_range(x, start, stop):
+    '''
+    Return the index of relative maxima at ``x[start:stop]``, using one
+    neighbour value on each side.
+    '''
+    lo = max(start - 1, 0)
+    hi = min(stop + 1, len(x))
+    peaks = np.flatnonzero(_argrelmax(x[lo:hi])) + lo
+    return peaks[(peaks >= start) & (peaks < stop)]
+
+
+def _cycle_argmax_parallel(x, zeroups, breaks, n_jobs):
+    '''
+    `_cycle_argmax` with the cycles split into groups that run in parallel.
+    '''
+    n_cycles = zeroups.size - 1
+    segments = _segments(n_cycles, n_jobs, min_size=1)
+    if len(segments) == 1 or len(x) < 2 * _CHUNKSIZE:
+        return _cycle_argmax(x, zeroups, breaks=breaks)
+    peaks = _map(
+        lambda seg: _cycle_argmax(x, zeroups[seg[0]:seg[1] + 1], breaks),
+        segments, n_jobs)
+    return np.concatenate(peaks)
+
+
+def _map_channels(func, x, n_jobs, **kwds):
+    '''
+    Apply `func` to each row of a 2D array on a thread pool. Keyword
+    arguments that are 2D arrays, e.g. `x_up` or `t`, are split by row, and
+    other arguments are shared by all rows.
+    '''
+    rows = {}
+    for key, value in kwds.items():
+        if value is not None and not callable(value) and np.ndim(value) == 2:
+            value = np.asarray(value)
+            if value.shape[0] != x.shape[0]:
+                raise ValueError(
+                    '{} must have one row per row of x.'.format(key))
+            rows[key] = value
+
+    def func_row(i):
+        kwds_i = dict(kwds, **{key: value[i] for key, value in rows.items()})
+        return func(x[i], **kwds_i)
+
+    return _map(func_row, range(len(x)), n_jobs)
+
+
+def rolling_mean_level(window):
+    '''
+    Centered rolling mean to be used as upcrossing level.
+
+    Parameters
+    ----------
+    window : int
+        Number of values in the averaging window. Near the ends of the series
+        the average is taken over the available values, and NaN values are
+        left out of the average.
+
+    Returns
+    -------
+    level : callable
+        Function ``level(x, start, stop)`` that returns the rolling mean of
+        `x` for ``x[start:stop]``. It is evaluated on the fly by `argupcross`
+        and `argrelmax_decluster`.
+
+    Examples
+    --------
+    >>> peaks = argrelmax_decluster(x, x_up=rolling_mean_level(3600))
+    '''
+    window = int(window)
+    if window < 1:
+        raise ValueError('window must be a positive integer.')
+    return _RollingMeanLevel(window)
+
+
+class _RollingMeanLevel(object):
+    '''
+    Centered rolling mean level, see `rolling_mean_level`. A class rather
+    than a closure, so it can be pickled for worker processes.
+    '''
+    def __init__(self, window):
+        self.before = window // 2
+        self.after = window - self.before - 1
+
+    def __call__(self, x, start, stop):
+        lo = max(start - self.before, 0)
+        hi = min(stop + self.after, len(x))
+        x_sub = x[lo:hi]
+        # NaN values are left out of the sums and the counts
+        valid = ~np.isnan(x_sub)
+        csum = np.zeros(hi - lo + 1)
+        np.cumsum(np.where(valid, x_sub, 0.), out=csum[1:])
+        count = np.zeros(hi - lo + 1, dtype='int64')
+        np.cumsum(valid, out=count[1:])
+        i = np.arange(start, stop)
+        i_lo = np.maximum(i - self.before, lo) - lo
+        i_hi = np.minimum(i + self.after + 1, hi) - lo
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return ((csum[i_hi] - csum[i_lo])
+                    / (count[i_hi] - count[i_lo]))
+
+
+def argrelmax(x, t=None, max_gap=None, n_jobs=None):
+    '''
+    Find the relative maxima of 1D time series data.
+
+    Parameters
+    ----------
+    x : array-like
+        Time series data. NaN values are treated as gaps. A 2D array is
+        treated as one time series per row.
+    t : array-like, optional
+        Time stamps of the time series data. For 2D `x`, either shared by
+        all rows or a 2D array with one row per row of `x`.
+    max_gap : float, optional
+        Largest time step between two contiguous values. Values next to a
+        larger time step are not peaks. Must be given together with `t`.
+    n_jobs : int, optional
+        Number of threads. Long time series are split into segments, and
+        rows of 2D arrays are processed in parallel. -1 uses all CPUs.
+        Default is None (no threads).
 
     Returns
     -------
     peaks : array-like
         Return the index of all peaks. If no peak is found, the index of the
-        largest value is returned.
+        largest value (ignoring NaN) is returned, or an empty array if all
+        values are NaN. A list with one array per row is returned for 2D
+        arrays.
 
     Notes
     -----
     Similar to scipy.signal.argrelmax but significantly faster.
     '''
-    peaks_bool = _argrelmax(x)
-    peaks = np.flatnonzero(peaks_bool)
+    x = np.asarray(x)
+    if x.ndim == 2:
+        return _map_channels(argrelmax, x, n_jobs, t=t, max_gap=max_gap)
+
+    breaks = _gap_breaks(t, max_gap)
+    segments = _segments(len(x), n_jobs)
+    if len(segments) > 1:
+        peaks = np.concatenate(
+            _map(lambda seg: _argrelmax_range(x, *seg), segments, n_jobs))
+        if breaks.size:
+            peaks = _remove_sorted(peaks, np.r_[breaks, breaks + 1])
+    else:
+        peaks_bool = _argrelmax(x, breaks=breaks)
+        peaks = np.flatnonzero(peaks_bool)
     if peaks.size:
         return peaks
     else:
-        return np.asarray([np.argmax(x)])
+        return _argmax_fallback(x)
 
 
-def argupcross(x, x_up=0.):
+def argupcross(x, x_up=0., t=None, max_gap=None, n_jobs=None):
     '''
     Find the upcrossing of 1D time series data.
 
     Parameters
     ----------
     x : array-like
-        Time series data.
-    x_up : float, optional
-        Upcrossing value. Default is 0.
+        Time series data. NaN values are treated as gaps. A 2D array is
+        treated as one time series per row.
+    x_up : float, array-like or callable, optional
+        Upcrossing value. Default is 0. An array-like gives the level at each
+        value of `x`. A callable ``x_up(x, start, stop)`` must return the
+        level for ``x[start:stop]`` and is evaluated in chunks, e.g.
+        `rolling_mean_level`. For 2D `x`, a 2D array gives the levels of each
+        row.
+    t : array-like, optional
+        Time stamps of the time series data.
+    max_gap : float, optional
+        Largest time step between two contiguous values. Upcrossings across
+        a larger time step are ignored. Must be given together with `t`.
+    n_jobs : int, optional
+        Number of threads, see `argrelmax`.
 
     Returns
     -------
     zeroups : array-like
         Return the index of all values just before an upcrossing. If no
-        upcrossings are found, the index of the first value is returned.
+        upcrossings are found, the index of the first value is returned. A
+        list with one array per row is returned for 2D arrays.
     '''
-    zeroups_bool = _argupcross(x, x_up=x_up)
-    zeroups = np.flatnonzero(zeroups_bool)
+    x = np.asarray(x)
+    if x.ndim == 2:
+        return _map_channels(argupcross, x, n_jobs, x_up=x_up, t=t,
+                             max_gap=max_gap)
+
+    zeroups = _argupcross_index(x, x_up, _gap_breaks(t, max_gap), n_jobs)
     if zeroups.size:
         return zeroups
     else:
         return np.array([0])
 
 
-def argrelmax_decluster(x, x_up=0.):
+def _argupcross_index(x, x_up, breaks, n_jobs=None):
+    '''
+    Return the index of all upcrossings, see `argupcross`.
+    '''
+    segments = _segments(len(x), n_jobs)
+    if len(segments) > 1:
+        zeroups = np.concatenate(_map(
+            lambda seg: _argupcross_chunked(x, x_up, start=seg[0],
+                                            stop=seg[1]),
+            segments, n_jobs))
+        if breaks.size:
+            zeroups = _remove_sorted(zeroups, breaks)
+    elif callable(x_up) or np.ndim(x_up):
+        zeroups = _argupcross_chunked(x, x_up)
+        if breaks.size:
+            zeroups = _remove_sorted(zeroups, breaks)
+    else:
+        zeroups_bool = _argupcross(x, x_up=x_up, breaks=breaks)
+        zeroups = np.flatnonzero(zeroups_bool)
+    return zeroups
+
+
+def argrelmax_decluster(x, x_up=0., t=None, max_gap=None, n_jobs=None):
     '''
     Find the declustred relative maxima of 1D time series data.
 
     Parameters
     ----------
     x : array-like
-        Time series data.
-    x_up : float, optional
-        Upcrossing value. Default is 0.
+        Time series data. NaN values are treated as gaps. A 2D array is
+        treated as one time series per row.
+    x_up : float, array-like or callable, optional
+        Upcrossing value. Default is 0. See `argupcross` for varying levels.
+    t : array-like, optional
+        Time stamps of the time series data.
+    max_gap : float, optional
+        Largest time step between two contiguous values. Must be given
+        together with `t`.
+    n_jobs : int, optional
+        Number of threads, see `argrelmax`.
 
     Returns
     -------
     peaks : array-like
         Return the index of largest peaks between two upcrossing. If no peak or
-        upcrossing pair is found, the index of the largest value is returned.
+        upcrossing pair is found, the index of the largest value (ignoring
+        NaN) is returned, or an empty array if all values are NaN. A list
+        with one array per row is returned for 2D arrays.
+
+    Notes
+    -----
+    Cycles that contain NaN values or time gaps larger than `max_gap` are
+    left out. The returned indices refer to the full series.
     '''
-    zeroups = argupcross(x, x_up)
-    x_sub = np.split(x, zeroups)
-    peaks = np.asarray(
-        [x_len + np.argmax(x) for x_len, x in zip(zeroups, x_sub[1:-1])])
+    x = np.asarray(x)
+    if x.ndim == 2:
+        return _map_channels(argrelmax_decluster, x, n_jobs, x_up=x_up, t=t,
+                             max_gap=max_gap)
+
+    breaks = _gap_breaks(t, max_gap)
+    zeroups = _argupcross_index(x, x_up, breaks, n_jobs)
+    if zeroups.size > 1:
+        peaks = _cycle_argmax_parallel(x, zeroups, breaks, n_jobs)
+    else:
+        peaks = zeroups[:0]
 
     if peaks.size:
         return peaks
+    elif callable(x_up) or np.ndim(x_up):
+        return _argmax_fallback(x)
+    else:
+        fallback = _argmax_fallback(x)
+        if fallback.size:
+            return np.asarray([np.max([fallback[0], x_up])])
+        return fallback
+
+
+def _magnitude(x_block):
+    '''
+    Vector magnitude of a block of components with shape (n_components, n).
+    '''
+    return np.sqrt(np.einsum('ij,ij->j', x_block, x_block))
+
+
+def argrelmax_decluster_projected(x, directions=None, x_up=None,
+                                  blocksize=2**14):
+    '''
+    Find the declustred relative maxima of projections of a multi-component
+    time series.
+
+    The projected series are computed block by block and declustered on the
+    fly, so they are never held in memory in full.
+
+    Parameters
+    ----------
+    x : array-like
+        Component time series data with shape (n_components, n).
+    directions : array-like, optional
+        Projection weights with shape (n_directions, n_components). Each row
+        gives one linear combination of the components, e.g.
+        ``[cos(theta), sin(theta)]`` for a heading angle. If None (default),
+        the vector magnitude ``sqrt(sum(x**2, axis=0))`` is used.
+    x_up : float or array-like, optional
+        Upcrossing value, either the same for all directions or one value per
+        direction. Default is 0 for projections, and the mean magnitude
+        (ignoring NaN) for the vector magnitude, which is computed in an
+        extra pass over the blocks.
+    blocksize : int, optional
+        Number of values of each projected series computed at a time.
+
+    Returns
+    -------
+    peaks : list
+        Return a list with the index of the largest peak between two
+        upcrossings for each direction. The peak values are given by
+        ``directions[k] @ x[:, peaks[k]]``.
+
+    Notes
+    -----
+    Unlike `argrelmax_decluster`, an empty array is returned for a direction
+    without any complete cycle.
+    '''
+    x = np.asarray(x)
+    if x.ndim != 2:
+        raise ValueError('x must have shape (n_components, n).')
+
+    if directions is None:
+        weights = None
+        n_directions = 1
+    else:
+        weights = np.atleast_2d(np.asarray(directions, dtype='float64'))
+        if weights.shape[1] != x.shape[0]:
+            raise ValueError('directions must have shape '
+                             '(n_directions, n_components).')
+        n_directions = weights.shape[0]
+
+    if x_up is None and weights is None:
+        total, count = 0., 0
+        for start in range(0, x.shape[1], blocksize):
+            r_block = _magnitude(x[:, start:start + blocksize])
+            valid = ~np.isnan(r_block)
+            total += np.sum(r_block[valid])
+            count += np.count_nonzero(valid)
+        x_up = total / count if count else 0.
+    elif x_up is None:
+        x_up = 0.
+    x_up = np.broadcast_to(x_up, (n_directions,))
+    streams = [_StreamDecluster(x_up_k) for x_up_k in x_up]
+    peaks = [[] for _ in range(n_directions)]
+
+    for start in range(0, x.shape[1], blocksize):
+        x_block = x[:, start:start + blocksize]
+        if weights is None:
+            y_block = _magnitude(x_block)[None]
+        else:
+            y_block = weights @ x_block
+        for stream, peaks_k, y_k in zip(streams, peaks, y_block):
+            peaks_k.append(stream.update(y_k))
+
+    return [np.concatenate(peaks_k) if peaks_k else
+            np.array([], dtype='int64') for peaks_k in peaks]
+
+
+def _rolling_blocks(x, window, reduce):
+    '''
+    Trailing rolling max (or min) along the last axis of a 2D array by the
+    van Herk/Gil-Werman algorithm, with partial windows at the start.
+
+    The series is split in blocks of `window` values. The window ending at
+    ``i`` covers the end of one block and the start of the next, so its max
+    is the max of a suffix max and a prefix max within blocks.
+    '''
+    rows, m = x.shape
+    n_blocks = -(-m // window)
+    fill = -np.inf if reduce is np.maximum else np.inf
+    padded = np.full((rows, n_blocks * window), fill, dtype=x.dtype)
+    padded[:, :m] = x
+    blocks = padded.reshape(rows, n_blocks, window)
+
+    prefix = reduce.accumulate(blocks, axis=2).reshape(rows, -1)[:, :m]
+    suffix = reduce.accumulate(blocks[:, :, ::-1], axis=2)[:, :, ::-1]
+    suffix = suffix.reshape(rows, -1)
+    if m >= window:
+        reduce(prefix[:, window - 1:], suffix[:, :m - window + 1],
+               out=prefix[:, window - 1:])
+    return prefix
+
+
+def _rolling_chunks(x, window, reduce, chunksize, pad=0):
+    '''
+    Yield ``(start, values)`` of the trailing rolling max (or min) along the
+    last axis of a 2D array, chunk by chunk. The series is extended by `pad`
+    values that do not contribute.
+    '''
+    m = x.shape[1]
+    dtype = x.dtype if x.dtype.kind == 'f' else np.dtype('float64')
+    fill = -np.inf if reduce is np.maximum else np.inf
+    step = max(chunksize, window)
+    for lo in range(0, m + pad, step):
+        start = max(lo - window + 1, 0)
+        stop = min(lo + step, m + pad)
+        seg = np.asarray(x[:, start:min(stop, m)], dtype=dtype)
+        if stop > m:
+            seg = np.concatenate(
+                [seg, np.full((x.shape[0], stop - max(start, m)), fill,
+                              dtype=dtype)], axis=1)
+        yield lo, _rolling_blocks(seg, window, reduce)[:, lo - start:]
+
+
+def _rolling(x, window, axis, reduce, chunksize, out):
+    x = np.asarray(x)
+    if x.ndim not in (1, 2):
+        raise ValueError('x must be 1D or 2D.')
+    if int(window) != window or window < 1:
+        raise ValueError('window must be a positive integer.')
+    window = int(window)
+
+    x_2d = np.moveaxis(x, axis, -1)
+    if x.ndim == 1:
+        x_2d = x_2d[None]
+    if out is None:
+        dtype = x.dtype if x.dtype.kind == 'f' else np.dtype('float64')
+        out = np.empty(x.shape, dtype=dtype)
+    out_2d = np.moveaxis(out, axis, -1)
+    if x.ndim == 1:
+        out_2d = out_2d[None]
+
+    for lo, values in _rolling_chunks(x_2d, window, reduce, chunksize):
+        out_2d[:, lo:lo + values.shape[1]] = values
+    return out
+
+
+def rolling_max(x, window, axis=-1, chunksize=2**18, out=None):
+    '''
+    Trailing rolling maximum, e.g. for load envelopes.
+
+    Uses the van Herk/Gil-Werman algorithm, with O(n) operations regardless
+    of the window length, and processes the series in chunks so that e.g. a
+    `numpy.memmap` is not loaded in full.
+
+    Parameters
+    ----------
+    x : array-like
+        Time series data, 1D or 2D.
+    window : int
+        Window length in number of values. The value at ``i`` is the max of
+        ``x[i - window + 1], ..., x[i]``, with shorter windows at the start.
+    axis : int, optional
+        Axis of the time series for 2D `x`. Default is -1.
+    chunksize : int, optional
+        Number of values per series processed at a time.
+    out : array-like, optional
+        Array with the shape of `x` to write the result to.
+
+    Returns
+    -------
+    out : array-like
+        Rolling maximum with the shape of `x`.
+
+    Notes
+    -----
+    A window with NaN gives NaN.
+    '''
+    return _rolling(x, window, axis, np.maximum, chunksize, out)
+
+
+def rolling_min(x, window, axis=-1, chunksize=2**18, out=None):
+    '''
+    Trailing rolling minimum, see `rolling_max`.
+    '''
+    return _rolling(x, window, axis, np.minimum, chunksize, out)
+
+
+def concurrent_values(peaks, y, window=0, stat='max', chunksize=_CHUNKSIZE):
+    '''
+    Find the values of other channels at or around the peaks of a governing
+    channel, e.g. heave and pitch at each peak of the tension.
+
+    The windows of many peaks are gathered at once, in chunks of about
+    `chunksize` values per channel. If the windows cover more values than the
+    series, they are picked from a rolling max (or min) instead, see
+    `rolling_max`.
+
+    Parameters
+    ----------
+    peaks : array-like
+        Peak indices, e.g. from `argrelmax_decluster`.
+    y : array-like
+        Channel time series data with shape (n_channels, n), or (n,).
+    window : int, optional
+        Half-width of the window around each peak, in number of values. If
+        0 (default), the values at the peaks are returned. Windows are
+        truncated at the ends of the series.
+    stat : {'max', 'min'}, optional
+        Statistic over the window ``peak - window, ..., peak + window``.
+        Default is 'max'.
+    chunksize : int, optional
+        Number of values per channel gathered at a time.
+
+    Returns
+    -------
+    values : array-like
+        Values with shape (n_channels, n_peaks), or (n_peaks,) for 1D `y`,
+        and the data type of `y`.
+
+    Notes
+    -----
+    A window with NaN gives NaN.
+    '''
+    peaks = np.asarray(peaks, dtype='int64').ravel()
+    y = np.asarray(y)
+    squeeze = y.ndim == 1
+    if squeeze:
+        y = y[None]
+    elif y.ndim != 2:
+        raise ValueError('y must have shape (n_channels, n) or (n,).')
+    n = y.shape[1]
+    if peaks.size and (peaks.min() < 0 or peaks.max() >= n):
+        raise ValueError('peaks out of range.')
+    if stat not in ('max', 'min'):
+        raise ValueError("stat must be 'max' or 'min'.")
+
+    reduce = np.maximum if stat == 'max' else np.minimum
+    if window == 0:
+        values = y[:, peaks]
+    elif peaks.size * (2 * window + 1) > n:
+        # Cheaper to pick the windows from a rolling max of the series,
+        # where the window ending at peak + window is centered at the peak
+        # The rolling max of integers is float, but holds values of y only
+        values = np.empty((y.shape[0], peaks.size), dtype=y.dtype)
+        order = np.argsort(peaks, kind='stable')
+        end = peaks[order] + window
+        for lo, rolling in _rolling_chunks(y, 2 * window + 1, reduce,
+                                           chunksize, pad=window):
+            a, b = np.searchsorted(end, [lo, lo + rolling.shape[1]])
+            values[:, order[a:b]] = rolling[:, end[a:b] - lo]
     else:
-        return np.asarray([np.max([np.argmax(x), x_up])])
+        offsets = np.arange(-window, window + 1)
+        values = np.empty((y.shape[0], peaks.size), dtype=y.dtype)
+        step = max(chunksize // offsets.size, 1)
+        for lo in range(0, peaks.size, step):
+            index = peaks[lo:lo + step, None] + offsets
+            np.clip(index, 0, n - 1, out=index)
+            reduce.reduce(y[:, index], axis=-1, out=values[:, lo:lo + step])
+    return values[0] if squeeze else values
@@ -0,0 +1,211 @@
+'''
+Long-term distribution of peaks over a scatter diagram of short-term
+conditions, e.g. sea states.
+
+The long-term rate of peaks above a level is the weighted sum over the
+conditions of the peak rate times the short-term exceedance probability,
+``sum_i w_i * nu_i * sf_i(x)``. The short-term exceedance probabilities are
+evaluated with the distribution kernels on blocks of levels and conditions,
+and the block sums are matrix-vector products with the weighted rates.
+'''
+
+import numpy as np
+from scipy import optimize
+
+from . import distributions
+
+
+def _nanmax(x):
+    '''
+    Max ignoring NaN, or NaN if all values are NaN.
+    '''
+    x = x[~np.isnan(x)]
+    return x.max() if x.size else np.nan
+
+
+class LongTermResponse(object):
+    '''
+    Long-term peak distribution from short-term distributions weighted by
+    the probability and peak rate of each condition.
+
+    Parameters
+    ----------
+    dist : rv_continuous or str
+        Short-term peak distribution, or its name in
+        `evapy_4s.distributions`, e.g. 'rayleigh', 'weibull' or
+        'genexptail'.
+    params : array-like
+        Parameters of each condition, with one row per condition as returned
+        by ``dist.fit``: the shape parameter(s), then location and scale.
+    weights : array-like
+        Probability of each condition, e.g. the sea state probabilities of
+        a scatter diagram. Normalized to sum to one. Conditions with zero
+        weight are dropped.
+    rates : float or array-like
+        Mean number of peaks per unit time of each condition, e.g. the
+        inverse of the mean zero-upcrossing period.
+    chunksize : int, optional
+        Largest number of levels times conditions evaluated at a time.
+        Default is 2**20.
+
+    Attributes
+    ----------
+    mean_rate : float
+        Long-term mean number of peaks per unit time.
+
+    Examples
+    --------
+    >>> params = np.array([weibull.fit(p, floc=0.) for p in peaks_per_state])
+    >>> lt = LongTermResponse('weibull', params, probabilities, 1. / tz)
+    >>> levels = np.linspace(0., 20., 201)
+    >>> q = lt.sf(levels)
+    >>> x_100 = lt.return_level(100. * 365.25 * 24. * 3600.)
+    '''
+    def __init__(self, dist, params, weights, rates, chunksize=2**20):
+        if isinstance(dist, str):
+            if not hasattr(distributions, dist):
+                raise ValueError('Unknown distribution: {}'.format(dist))
+            dist = getattr(distributions, dist)
+        params = np.atleast_2d(np.asarray(params, dtype='float64'))
+        weights = np.asarray(weights, dtype='float64').ravel()
+        rates = np.broadcast_to(np.asarray(rates, dtype='float64'),
+                                weights.shape)
+        if params.shape != (weights.size, dist.numargs + 2):
+            raise ValueError(
+                'params must have one row per weight and {} columns.'.format(
+                    dist.numargs + 2))
+        if (weights < 0.).any() or not weights.sum() > 0.:
+            raise ValueError('weights must be non-negative, and not all zero.')
+        if (rates <= 0.).any():
+            raise ValueError('rates must be positive.')
+
+        keep = weights > 0.
+        params = params[keep]
+        shapes = tuple(params[:, :-2].T)
+        valid = np.all(dist._argcheck(*shapes)) and (params[:, -1] > 0.).all()
+        if not valid:
+            raise ValueError('Invalid parameters.')
+        weighted_rates = weights[keep] / weights.sum() * rates[keep]
+
+        self.dist = dist
+        self.chunksize = chunksize
+        self.mean_rate = weighted_rates.sum()
+        self._shapes = shapes
+        self._loc = params[:, -2]
+        self._scale = params[:, -1]
+        self._a, self._b = (np.broadcast_to(v, self._loc.shape).astype(float)
+                            for v in dist._get_support(*shapes))
+        self._weighted_rates = weighted_rates
+
+    def __len__(self):
+        return self._loc.size
+
+    def _sf_block(self, x, lo, hi):
+        '''
+        Short-term exceedance probabilities at the levels `x` of the
+        conditions ``lo:hi``, with one row per level.
+        '''
+        y = np.subtract.outer(x, self._loc[lo:hi])
+        y /= self._scale[lo:hi]
+        a, b = self._a[lo:hi], self._b[lo:hi]
+        below = y < a
+        above = y >= b
+        np.clip(y, a, b, out=y)
+        out = self.dist._sf(y, *(s[lo:hi] for s in self._shapes))
+        out[below] = 1.
+        out[above] = 0.
+        return out
+
+    def rate(self, x):
+        '''
+        Long-term number of peaks per unit time above the levels `x`.
+        '''
+        x = np.asarray(x, dtype='float64')
+        flat = x.ravel()
+        out = np.zeros(flat.shape)
+        n = len(self)
+        step_x = max(min(flat.size, self.chunksize), 1)
+        step = max(self.chunksize // step_x, 1)
+        for i in range(0, flat.size, step_x):
+            x_chunk = flat[i:i + step_x]
+            for lo in range(0, n, step):
+                hi = min(lo + step, n)
+                out[i:i + step_x] += np.dot(self._sf_block(x_chunk, lo, hi),
+                                            self._weighted_rates[lo:hi])
+        return out.reshape(x.shape)[()]
+
+    def sf(self, x):
+        '''
+        Long-term exceedance probability of a single peak.
+        '''
+        return self.rate(x) / self.mean_rate
+
+    def cdf(self, x):
+        '''
+        Long-term non-exceedance probability of a single peak.
+        '''
+        return 1. - self.sf(x)
+
+    def _isf(self, q):
+        '''
+        Short-term ``isf(q)`` of each condition. NaN where the exceedance
+        probability is below `q` over all of the support.
+        '''
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.dist.isf(np.minimum(q, 1.), *self._shapes,
+                                 loc=self._loc, scale=self._scale)
+
+    def return_level(self, period, xtol=1e-8):
+        '''
+        Return the level exceeded by one peak on average per return period.
+
+        Parameters
+        ----------
+        period : float or array-like
+            Return period in the time unit of the peak rates, e.g. 100 years
+            in seconds for rates in peaks per second.
+        xtol : float, optional
+            Relative tolerance of the level. Default is 1e-8.
+
+        Returns
+        -------
+        level : float or array-like
+            Return level, or NaN if the period is shorter than the long-term
+            mean time between peaks.
+
+        Notes
+        -----
+        The level is bracketed from the short-term levels: it is at least
+        the largest level with ``w_i * nu_i * sf_i(x) = r`` and the smallest
+        level with ``sf_i(x) = r / nu``, and at most the largest level with
+        ``sf_i(x) = r / nu``, where ``r = 1 / period`` and ``nu`` is the
+        mean peak rate. The sum is then solved with Brent's method within
+        the bracket.
+        '''
+        period = np.asarray(period, dtype='float64')
+        out = np.full(period.shape, np.nan)
+        for k, p in np.ndenumerate(period):
+            target = 1. / p
+            if not target < self.mean_rate:
+                continue
+            upper = self._isf(target / self.mean_rate)
+            hi = _nanmax(upper)
+            lo = _nanmax(np.r_[self._isf(target / self._weighted_rates),
+                               np.min(upper)])
+            if np.isnan(hi):
+                continue
+
+            def func(x):
+                return self.rate(x) / target - 1.
+
+            if np.isnan(lo) or func(lo) < 0.:
+                # Fall back to the lower end of the support
+                lo = np.min(self._loc + self._a * self._scale)
+                if func(lo) < 0.:
+                    continue
+            if hi - lo <= xtol * abs(hi) or func(hi) >= 0.:
+                out[k] = hi
+            else:
+                out[k] = optimize.brentq(
+                    func, lo, hi, xtol=xtol * max(abs(lo), abs(hi)))
+        return out[()]
@@ -0,0 +1,265 @@
+'''
+Real-time extreme value monitoring of sensor streams with asyncio.
+
+Blocks of samples are consumed from an async source through a bounded queue,
+declustered on arrival, and running distribution fits and most probable
+maximum (MPM) estimates are published at a fixed cadence. The fits run in an
+executor, so ingestion is not blocked while fitting.
+
+This module requires Python >= 3.7, and is not imported by ``evapy_4s``.
+'''
+
+import asyncio
+import time
+
+import numpy as np
+
+from . import distributions
+from ._online import _RingBuffer
+from .evstats import _StreamDecluster
+
+
+async def queue_blocks(queue):
+    '''
+    Iterate over blocks put on an `asyncio.Queue` until None is received.
+    '''
+    while True:
+        block = await queue.get()
+        if block is None:
+            return
+        yield block
+
+
+async def stream_blocks(reader, dtype='float64', blocksize=4096):
+    '''
+    Iterate over blocks of raw binary samples from an `asyncio.StreamReader`,
+    e.g. from `asyncio.open_connection`, until end of stream.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        Stream of raw binary samples.
+    dtype : str, optional
+        Data type of the samples. Default is 'float64'.
+    blocksize : int, optional
+        Number of samples per block. The last block may be shorter.
+    '''
+    dtype = np.dtype(dtype)
+    nbytes = blocksize * dtype.itemsize
+    while True:
+        try:
+            data = await reader.readexactly(nbytes)
+        except asyncio.IncompleteReadError as e:
+            # End of stream, an incomplete last sample is dropped
+            n = len(e.partial) // dtype.itemsize
+            if n:
+                yield np.frombuffer(e.partial[:n * dtype.itemsize],
+                                    dtype=dtype)
+            return
+        yield np.frombuffer(data, dtype=dtype)
+
+
+def _fit_all(peaks, dists, n_ref):
+    '''
+    Fit distributions to peaks and return parameters and MPM estimates.
+    '''
+    params = {}
+    mpm = {}
+    for name, kwds in dists.items():
+        dist = getattr(distributions, name)
+        try:
+            params[name] = tuple(float(p) for p in dist.fit(peaks, **kwds))
+            mpm[name] = float(dist.ppf(1. - 1. / n_ref, *params[name])) \
+                if n_ref > 1. else np.nan
+        except Exception:
+            params[name] = None
+            mpm[name] = np.nan
+    return params, mpm
+
+
+async def _aiter(source):
+    '''
+    Iterate over an async iterable, or an `asyncio.Queue` of blocks.
+    '''
+    if isinstance(source, asyncio.Queue):
+        source = queue_blocks(source)
+    async for block in source:
+        yield block
+
+
+class ExtremeValueMonitor(object):
+    '''
+    Running peak counts, distribution fits and MPM estimates of a stream.
+
+    Parameters
+    ----------
+    fs : float
+        Sampling frequency in Hz.
+    x_up : float, optional
+        Upcrossing value for declustering. Default is 0.
+    dists : dict or sequence, optional
+        Distributions to fit, as names in `evapy_4s.distributions`, or a dict
+        of name and keyword arguments to ``fit``. Default is
+        ``{'weibull': {'floc': 0.}}``.
+    duration : float, optional
+        Duration in seconds of the MPM estimates. Default is 10800 (3 hours).
+    interval : float, optional
+        Seconds between published estimates. Default is 1.
+    maxsize : int, optional
+        Maximum number of blocks waiting in the ingestion queue. The source
+        is not read while the queue is full. Default is 16.
+    max_peaks : int, optional
+        Only fit the `max_peaks` most recent peaks. Default is the peaks of
+        the last `duration` seconds. A cycle spans at least two samples, so
+        at most ``duration * fs / 2`` peaks are buffered, at 32 bytes each,
+        and each fit takes time linear in the number of buffered peaks.
+    min_peaks : int, optional
+        Minimum number of peaks before fitting. Default is 10.
+    executor : concurrent.futures.Executor, optional
+        Executor for the fits. Default is the event loop's default executor.
+
+    Examples
+    --------
+    >>> monitor = ExtremeValueMonitor(fs=10., dists=['weibull'])
+    >>> reader, _ = await asyncio.open_connection('localhost', 5000)
+    >>> await monitor.run(stream_blocks(reader), sink=print)
+    '''
+    def __init__(self, fs, x_up=0., dists=None, duration=10800., interval=1.,
+                 maxsize=16, max_peaks=None, min_peaks=10, executor=None):
+        if dists is None:
+            dists = {'weibull': {'floc': 0.}}
+        elif not isinstance(dists, dict):
+            dists = dict((name, {}) for name in dists)
+        for name in dists:
+            if not hasattr(distributions, name):
+                raise ValueError('Unknown distribution: {}'.format(name))
+
+        self.fs = fs
+        self.dists = dists
+        self.duration = duration
+        self.interval = interval
+        self.maxsize = maxsize
+        self.max_peaks = max_peaks
+        self.min_peaks = min_peaks
+        self.executor = executor
+
+        if max_peaks is None:
+            max_peaks = int(np.ceil(duration * fs / 2.)) + 1
+        self._decluster = _StreamDecluster(x_up)
+        self._peaks = _RingBuffer(max_peaks)
+        self._peak_index = _RingBuffer(max_peaks)
+        self.n_peaks = 0
+
+    @property
+    def n_samples(self):
+        '''
+        Number of samples received.
+        '''
+        return self._decluster.n
+
+    def _ingest(self, block):
+        '''
+        Decluster a block of samples and keep the peak values.
+        '''
+        index, values = self._decluster.update(block, return_values=True)
+        if values.size:
+            self._peaks.append(values, self.n_peaks)
+            self._peak_index.append(index.astype('float64'), self.n_peaks)
+            self.n_peaks += values.size
+
+    def _recent_peaks(self):
+        '''
+        Return a copy of the peak values to fit, see `max_peaks`.
+        '''
+        values = self._peaks.values()[0]
+        if self.max_peaks is None:
+            index = self._peak_index.values()[0]
+            values = values[index >= self.n_samples - self.duration * self.fs]
+        return values.copy()
+
+    async def estimate(self):
+        '''
+        Fit the distributions to the current peaks in the executor.
+
+        Returns
+        -------
+        estimate : dict
+            Estimate with the keys 'time', 'n_samples', 'n_peaks',
+            'peak_rate' (peaks per second), 'params' and 'mpm' (dicts by
+            distribution name).
+        '''
+        n_samples, n_peaks = self.n_samples, self.n_peaks
+        peak_rate = n_peaks / n_samples * self.fs if n_samples else 0.
+        estimate = {'time': time.time(), 'n_samples': n_samples,
+                    'n_peaks': n_peaks, 'peak_rate': peak_rate,
+                    'params': dict.fromkeys(self.dists),
+                    'mpm': dict.fromkeys(self.dists, np.nan)}
+        peaks = self._recent_peaks()
+        if peaks.size < self.min_peaks:
+            return estimate
+
+        loop = asyncio.get_running_loop()
+        estimate['params'], estimate['mpm'] = await loop.run_in_executor(
+            self.executor, _fit_all, peaks, self.dists,
+            peak_rate * self.duration)
+        return estimate
+
+    async def _produce(self, source, queue):
+        try:
+            async for block in _aiter(source):
+                await queue.put(block)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    async def _publish(self, sink):
+        while True:
+            await asyncio.sleep(self.interval)
+            await _call(sink, await self.estimate())
+
+    async def run(self, source, sink=None):
+        '''
+        Consume a source until it is exhausted, and publish estimates.
+
+        Parameters
+        ----------
+        source : async iterable or asyncio.Queue
+            Source of sample blocks, e.g. `stream_blocks` of a socket. A
+            queue is read until None is received.
+        sink : callable, optional
+            Function or coroutine function called with each estimate, see
+            `estimate`.
+
+        Returns
+        -------
+        estimate : dict
+            Final estimate after the source is exhausted.
+        '''
+        queue = asyncio.Queue(self.maxsize)
+        producer = asyncio.ensure_future(self._produce(source, queue))
+        publisher = asyncio.ensure_future(self._publish(sink))
+        try:
+            while True:
+                block = await queue.get()
+                if block is None:
+                    break
+                elif isinstance(block, Exception):
+                    raise block
+                self._ingest(block)
+        finally:
+            for task in (producer, publisher):
+                task.cancel()
+            await asyncio.gather(producer, publisher, return_exceptions=True)
+
+        estimate = await self.estimate()
+        await _call(sink, estimate)
+        return estimate
+
+
+async def _call(sink, estimate):
+    if sink is None:
+        return
+    result = sink(estimate)
+    if asyncio.iscoroutine(result):
+        await result
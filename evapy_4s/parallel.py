@@ -0,0 +1,262 @@
+'''
+Process-parallel peak and upcrossing detection on shared memory.
+
+The series is copied once into a `multiprocessing.shared_memory` block, and
+worker processes attach to the block by name instead of receiving a pickled
+copy. Only index ranges are sent to the workers, and only the compact peak
+and upcrossing indices are sent back, so the memory use is one copy of the
+series regardless of the number of workers.
+
+This module requires Python >= 3.8, and is not imported by ``evapy_4s``.
+'''
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .evstats import (_CHUNKSIZE, _argmax_fallback, _argrelmax_range,
+                      _argupcross_chunked, _cycle_argmax, _gap_breaks,
+                      _n_workers, _remove_sorted, _segments)
+
+
+_Block = namedtuple('_Block', ['name', 'shape', 'dtype'])
+
+
+def _share(x):
+    '''
+    Copy an array into a new shared memory block.
+
+    Returns
+    -------
+    shm : multiprocessing.shared_memory.SharedMemory
+        The shared memory block.
+    view : array-like
+        Array on the block.
+    '''
+    shm = shared_memory.SharedMemory(create=True, size=max(x.nbytes, 1))
+    view = np.ndarray(x.shape, dtype=x.dtype, buffer=shm.buf)
+    np.copyto(view, x)
+    return shm, view
+
+
+def _run(func, *args):
+    '''
+    Return ``func(*args)`` in a worker, with the `_Block` arguments attached
+    as arrays.
+    '''
+    # The workers share the resource tracker of the parent, so attaching
+    # does not take over the cleanup of the blocks, which are unlinked by
+    # the parent.
+    shms = [shared_memory.SharedMemory(name=arg.name)
+            if isinstance(arg, _Block) else None for arg in args]
+    args = [np.ndarray(arg.shape, dtype=arg.dtype, buffer=shm.buf)
+            if shm is not None else arg for arg, shm in zip(args, shms)]
+    try:
+        return func(*args)
+    finally:
+        del args
+        for shm in shms:
+            if shm is not None:
+                try:
+                    shm.close()
+                except BufferError:
+                    # Still referenced by a traceback, released when collected
+                    pass
+
+
+class SharedSeries(object):
+    '''
+    Time series in shared memory, processed by a pool of worker processes.
+
+    The series is split into one segment per worker, with segment ends that
+    overlap by one value, such that peaks and upcrossings at the segment
+    boundaries are found exactly once. The results are identical to the
+    functions in `evapy_4s.evstats`.
+
+    Parameters
+    ----------
+    x : array-like
+        1D time series data, e.g. a `numpy.memmap`. Copied once into shared
+        memory.
+    n_jobs : int, optional
+        Number of worker processes. -1 uses all CPUs. Default is -1.
+    executor : concurrent.futures.ProcessPoolExecutor, optional
+        Pool of worker processes. By default, a pool with `n_jobs` workers is
+        started on first use and shut down by `close`.
+
+    Attributes
+    ----------
+    x : array-like
+        The series in shared memory. Only valid until `close`.
+
+    Examples
+    --------
+    >>> with SharedSeries(np.load('tension.npy', mmap_mode='r')) as series:
+    ...     zeroups = series.argupcross()
+    ...     peaks = series.argrelmax_decluster()
+    '''
+    def __init__(self, x, n_jobs=-1, executor=None):
+        x = np.asarray(x)
+        if x.ndim != 1:
+            raise ValueError('x must be 1D.')
+        self.n_jobs = n_jobs
+        self._shm, self.x = _share(x)
+        self._block = _Block(self._shm.name, x.shape, x.dtype.str)
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._block.shape[0]
+
+    def close(self):
+        '''
+        Shut down the pool, if owned, and free the shared memory.
+        '''
+        if self._shm is None:
+            return
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.x = None
+        self._shm.unlink()
+        try:
+            self._shm.close()
+        except BufferError:
+            # Views of `x` are still held, unmapped when they are collected
+            pass
+        self._shm = None
+
+    def _map(self, func, items):
+        '''
+        Return ``[func(*item) for item in items]``, evaluated by the workers.
+        '''
+        if self._shm is None:
+            raise ValueError('The series is closed.')
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=_n_workers(self.n_jobs))
+        futures = [self._executor.submit(_run, func, *item) for item in items]
+        return [future.result() for future in futures]
+
+    def _zeroups(self, x_up, breaks):
+        '''
+        Return the index of all upcrossings, see `argupcross`.
+        '''
+        level_shm = None
+        if not callable(x_up) and np.ndim(x_up):
+            x_up = np.asarray(x_up)
+            if x_up.shape != self.x.shape:
+                raise ValueError('x_up must have the same shape as x.')
+            level_shm, level = _share(x_up)
+            x_up = _Block(level_shm.name, level.shape, level.dtype.str)
+            del level
+        try:
+            zeroups = np.concatenate(self._map(
+                _argupcross_chunked,
+                [(self._block, x_up, _CHUNKSIZE, start, stop)
+                 for start, stop in _segments(len(self), self.n_jobs)]))
+        finally:
+            if level_shm is not None:
+                level_shm.close()
+                level_shm.unlink()
+        if breaks.size:
+            zeroups = _remove_sorted(zeroups, breaks)
+        return zeroups
+
+    def argrelmax(self, t=None, max_gap=None):
+        '''
+        Find the relative maxima, see `evapy_4s.evstats.argrelmax`.
+        '''
+        breaks = _gap_breaks(t, max_gap)
+        peaks = np.concatenate(self._map(
+            _argrelmax_range,
+            [(self._block, start, stop)
+             for start, stop in _segments(len(self), self.n_jobs)]))
+        if breaks.size:
+            peaks = _remove_sorted(peaks, np.r_[breaks, breaks + 1])
+        if peaks.size:
+            return peaks
+        else:
+            return _argmax_fallback(self.x)
+
+    def argupcross(self, x_up=0., t=None, max_gap=None):
+        '''
+        Find the upcrossings, see `evapy_4s.evstats.argupcross`.
+
+        A callable `x_up` must be picklable, e.g. `rolling_mean_level`, and
+        an array-like `x_up` is copied into shared memory for the call.
+        '''
+        zeroups = self._zeroups(x_up, _gap_breaks(t, max_gap))
+        if zeroups.size:
+            return zeroups
+        else:
+            return np.array([0])
+
+    def argrelmax_decluster(self, x_up=0., t=None, max_gap=None):
+        '''
+        Find the declustered relative maxima, see
+        `evapy_4s.evstats.argrelmax_decluster`.
+
+        Upcrossings are found first, and the cycles between them are then
+        split into groups that share their boundary upcrossing, so cycles
+        across segment boundaries are kept. See `argupcross` for `x_up`.
+        '''
+        breaks = _gap_breaks(t, max_gap)
+        zeroups = self._zeroups(x_up, breaks)
+        if zeroups.size > 1:
+            groups = [zeroups[start:stop + 1] for start, stop
+                      in _segments(zeroups.size - 1, self.n_jobs, min_size=1)]
+            peaks = np.concatenate(self._map(
+                _cycle_argmax,
+                [(self._block, group,
+                  breaks[np.searchsorted(breaks, group[0]):
+                         np.searchsorted(breaks, group[-1])])
+                 for group in groups]))
+        else:
+            peaks = zeroups[:0]
+
+        if peaks.size:
+            return peaks
+        elif callable(x_up) or np.ndim(x_up):
+            return _argmax_fallback(self.x)
+        else:
+            fallback = _argmax_fallback(self.x)
+            if fallback.size:
+                return np.asarray([np.max([fallback[0], x_up])])
+            return fallback
+
+
+def argrelmax(x, t=None, max_gap=None, n_jobs=-1):
+    '''
+    Find the relative maxima of 1D time series data with worker processes,
+    see `evapy_4s.evstats.argrelmax` and `SharedSeries`.
+    '''
+    with SharedSeries(x, n_jobs=n_jobs) as series:
+        return series.argrelmax(t=t, max_gap=max_gap)
+
+
+def argupcross(x, x_up=0., t=None, max_gap=None, n_jobs=-1):
+    '''
+    Find the upcrossings of 1D time series data with worker processes, see
+    `evapy_4s.evstats.argupcross` and `SharedSeries`.
+    '''
+    with SharedSeries(x, n_jobs=n_jobs) as series:
+        return series.argupcross(x_up=x_up, t=t, max_gap=max_gap)
+
+
+def argrelmax_decluster(x, x_up=0., t=None, max_gap=None, n_jobs=-1):
+    '''
+    Find the declustered relative maxima of 1D time series data with worker
+    processes, see `evapy_4s.evstats.argrelmax_decluster` and
+    `SharedSeries`.
+    '''
+    with SharedSeries(x, n_jobs=n_jobs) as series:
+        return series.argrelmax_decluster(x_up=x_up, t=t, max_gap=max_gap)
@@ -0,0 +1,272 @@
+'''
+Prebuilt index for fast range maximum and exceedance queries over long time
+series.
+'''
+
+import numpy as np
+
+from .archive import _index_bounds
+from .evstats import _argupcross_index, _cycle_argmax
+
+
+def _nanargmax(x):
+    '''
+    Return the index and value of the max ignoring NaN, or (-1, -inf).
+    '''
+    x = np.asarray(x, dtype='float64')
+    x = np.where(np.isnan(x), -np.inf, x)
+    if not x.size:
+        return -1, -np.inf
+    i = int(np.argmax(x))
+    return (i, x[i]) if x[i] > -np.inf else (-1, -np.inf)
+
+
+def _declustered_peaks(x, x_up):
+    '''
+    Index of the declustered peaks, see `argrelmax_decluster`, but without
+    the fallback to the largest value if there is no complete cycle.
+    '''
+    zeroups = _argupcross_index(x, x_up, np.array([], dtype='int64'))
+    if zeroups.size < 2:
+        return zeroups[:0]
+    return _cycle_argmax(x, zeroups)
+
+
+def _block_max(x, blocksize, chunksize=2**22):
+    '''
+    Max and index of max, ignoring NaN, of consecutive blocks of `x`.
+    '''
+    n = x.shape[0]
+    nb = -(-n // blocksize)
+    values = np.empty(nb)
+    index = np.empty(nb, dtype='int64')
+    step = max(chunksize // blocksize, 1) * blocksize
+    for lo in range(0, n, step):
+        chunk = np.asarray(x[lo:lo + step], dtype='float64')
+        nbc = -(-chunk.size // blocksize)
+        padded = np.full(nbc * blocksize, -np.inf)
+        np.copyto(padded[:chunk.size], chunk, where=~np.isnan(chunk))
+        padded = padded.reshape(nbc, blocksize)
+
+        argmax = padded.argmax(axis=1)
+        b = lo // blocksize
+        values[b:b + nbc] = padded[np.arange(nbc), argmax]
+        index[b:b + nbc] = lo + np.arange(nbc) * blocksize + argmax
+    return values, index
+
+
+class SeriesIndex(object):
+    '''
+    Index of a time series for range maximum and peak exceedance queries.
+
+    The range maximum uses a pyramid of block maxima, where each level holds
+    the max of pairs of nodes on the level below. A query scans at most two
+    partial blocks of the series and O(log n) nodes of the pyramid. The
+    declustered peaks are kept sorted by value, so the peaks above a
+    threshold are found by binary search.
+
+    Parameters
+    ----------
+    x : array-like
+        Time series, e.g. a `numpy.memmap`. Read in chunks.
+    x_up : float, optional
+        Upcrossing value for declustering. Default is 0.
+    dt : float, optional
+        Sampling interval. If given, queries can be made by time, with the
+        time of sample ``i`` being ``t0 + i * dt``.
+    t0 : float, optional
+        Time of the first sample. Default is 0.
+    blocksize : int, optional
+        Number of samples per block at the base of the pyramid. The index
+        holds about ``2 * len(x) / blocksize`` maxima. Default is 64.
+    peaks : array-like, optional
+        Peak indices. Default is the declustered peaks, see
+        `argrelmax_decluster`, or no peaks if `x` has no complete cycle.
+        Indices out of range and peaks with NaN values are left out.
+
+    Examples
+    --------
+    >>> index = SeriesIndex(tension, dt=0.1)
+    >>> i, value = index.range_max(t_start=t0, t_stop=t1)
+    >>> peaks, values = index.exceedances(2000., t_start=t_march,
+    ...                                   t_stop=t_april)
+    >>> index.save('tension_index.npz')
+    '''
+    def __init__(self, x, x_up=0., dt=None, t0=0., blocksize=64, peaks=None):
+        self.x = x
+        self.n = x.shape[0]
+        self.dt = dt
+        self.t0 = t0
+        self.blocksize = blocksize
+
+        values, index = _block_max(x, blocksize)
+        self._levels = [(values, index)]
+        while values.size > 1:
+            if values.size % 2:
+                values = np.r_[values, -np.inf]
+                index = np.r_[index, -1]
+            pairs = values.reshape(-1, 2)
+            argmax = pairs.argmax(axis=1)
+            rows = np.arange(pairs.shape[0])
+            values = pairs[rows, argmax]
+            index = index.reshape(-1, 2)[rows, argmax]
+            self._levels.append((values, index))
+
+        if peaks is None:
+            peaks = _declustered_peaks(np.asarray(x), x_up)
+        peaks = np.asarray(peaks, dtype='int64')
+        peaks = peaks[(peaks >= 0) & (peaks < self.n)]
+        peak_values = np.asarray(x[peaks], dtype='float64')
+        valid = ~np.isnan(peak_values)
+        peaks, peak_values = peaks[valid], peak_values[valid]
+        order = np.argsort(peak_values, kind='stable')
+        self._peaks = peaks[order]
+        self._peak_values = peak_values[order]
+
+    def _pyramid_max(self, lo, hi):
+        '''
+        Max over the blocks ``[lo, hi)``.
+        '''
+        best, best_index = -np.inf, -1
+        for values, index in self._levels:
+            if lo >= hi:
+                break
+            nodes = []
+            if lo % 2:
+                nodes.append(lo)
+                lo += 1
+            if hi % 2:
+                hi -= 1
+                nodes.append(hi)
+            for node in nodes:
+                if (values[node] > best or values[node] == best
+                        and index[node] < best_index):
+                    best, best_index = values[node], index[node]
+            lo //= 2
+            hi //= 2
+        return best_index, best
+
+    def range_max(self, start=None, stop=None, t_start=None, t_stop=None):
+        '''
+        Return the max of the series within an index or time range.
+
+        NaN values are ignored. If the max occurs more than once, the first
+        occurrence is returned.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            Range ``start <= i < stop`` of sample indices.
+        t_start, t_stop : float, optional
+            Range ``t_start <= t < t_stop`` of sample times.
+
+        Returns
+        -------
+        index : int
+            Index of the max, or -1 if the range only holds NaN.
+        value : float
+            The max, or NaN.
+        '''
+        start, stop = _index_bounds(start, stop, t_start, t_stop,
+                                    self.t0, self.dt)
+        start = 0 if start is None else max(start, 0)
+        stop = self.n if stop is None else min(stop, self.n)
+        if start >= stop:
+            raise ValueError('Empty range.')
+        if self.x is None:
+            raise ValueError('The series is required for range queries.')
+
+        bs = self.blocksize
+        lo, hi = -(-start // bs), stop // bs
+        if lo >= hi:
+            spans = [(start, stop)]
+            candidates = []
+        else:
+            spans = [(start, lo * bs), (hi * bs, stop)]
+            candidates = [self._pyramid_max(lo, hi)]
+        for a, b in spans:
+            i, value = _nanargmax(self.x[a:b])
+            candidates.append((a + i if i >= 0 else -1, value))
+
+        best_index, best = -1, -np.inf
+        for i, value in candidates:
+            if value > best or value == best and 0 <= i < best_index:
+                best, best_index = value, i
+        return (best_index, best) if best_index >= 0 else (-1, np.nan)
+
+    def exceedances(self, threshold, start=None, stop=None, t_start=None,
+                    t_stop=None):
+        '''
+        Return the declustered peaks at or above a threshold.
+
+        Parameters
+        ----------
+        threshold : float
+            Threshold value.
+        start, stop : int, optional
+            Range ``start <= i < stop`` of peak indices.
+        t_start, t_stop : float, optional
+            Range ``t_start <= t < t_stop`` of peak times.
+
+        Returns
+        -------
+        index : array-like
+            Index of the peaks, in increasing order.
+        values : array-like
+            Peak values.
+        '''
+        k = np.searchsorted(self._peak_values, threshold, side='left')
+        index, values = self._peaks[k:], self._peak_values[k:]
+
+        start, stop = _index_bounds(start, stop, t_start, t_stop,
+                                    self.t0, self.dt)
+        mask = np.ones(index.size, dtype='bool')
+        if start is not None:
+            mask &= index >= start
+        if stop is not None:
+            mask &= index < stop
+        order = np.argsort(index[mask])
+        return index[mask][order], values[mask][order]
+
+    def save(self, path):
+        '''
+        Save the index to a ``.npz`` file. The series is not saved.
+        '''
+        values, index = zip(*self._levels)
+        np.savez(path, n=self.n, blocksize=self.blocksize,
+                 dt=np.nan if self.dt is None else self.dt, t0=self.t0,
+                 level_size=[v.size for v in values],
+                 level_values=np.concatenate(values),
+                 level_index=np.concatenate(index),
+                 peaks=self._peaks, peak_values=self._peak_values)
+
+    @classmethod
+    def load(cls, path, x=None):
+        '''
+        Load an index saved with `save`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the ``.npz`` file.
+        x : array-like, optional
+            The indexed series. Required for `range_max`, which scans the
+            series at the ends of the range.
+        '''
+        with np.load(path) as data:
+            self = cls.__new__(cls)
+            self.x = x
+            self.n = int(data['n'])
+            self.blocksize = int(data['blocksize'])
+            dt = float(data['dt'])
+            self.dt = None if np.isnan(dt) else dt
+            self.t0 = float(data['t0'])
+            bounds = np.r_[0, np.cumsum(data['level_size'])]
+            values, index = data['level_values'], data['level_index']
+            self._levels = [(values[a:b], index[a:b])
+                            for a, b in zip(bounds[:-1], bounds[1:])]
+            self._peaks = data['peaks']
+            self._peak_values = data['peak_values']
+        if x is not None and x.shape[0] != self.n:
+            raise ValueError('x does not match the indexed series.')
+        return self
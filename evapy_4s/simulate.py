@@ -0,0 +1,143 @@
+'''
+Simulation of Gaussian time series from a power spectrum, e.g. for
+validation of the peak distributions and for benchmarks.
+'''
+
+import numpy as np
+from numpy import (exp, pi, sqrt)
+
+
+def jonswap(f, hs, tp, gamma=3.3):
+    '''
+    JONSWAP wave spectrum.
+
+    Parameters
+    ----------
+    f : array-like
+        Frequency in Hz.
+    hs : float
+        Significant wave height.
+    tp : float
+        Spectral peak period.
+    gamma : float, optional
+        Peak enhancement factor. Default is 3.3.
+
+    Returns
+    -------
+    S : array-like
+        One-sided variance spectral density per Hz.
+    '''
+    f = np.asarray(f, dtype='float64')
+    fp = 1. / tp
+    sigma = np.where(f <= fp, 0.07, 0.09)
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        pm = (5. / 16.) * hs**2 * fp**4 * f**-5 * exp(-1.25 * (fp / f)**4)
+        peak = gamma ** exp(-0.5 * ((f - fp) / (sigma * fp))**2)
+    # Normalization of the peak enhancement (Goda)
+    alpha = 1. - 0.287 * np.log(gamma)
+    return np.where(f > 0., alpha * pm * peak, 0.)
+
+
+def _rngs(seed, n_series):
+    '''
+    Return one random generator, or one per series if `seed` is a sequence.
+    '''
+    if np.ndim(seed):
+        if len(seed) != n_series:
+            raise ValueError('Expected one seed per series.')
+        return [np.random.default_rng(s) for s in seed]
+    return np.random.default_rng(seed)
+
+
+def _normal(rngs, size):
+    if isinstance(rngs, list):
+        return np.array([rng.standard_normal(size[1:]) for rng in rngs])
+    return rngs.standard_normal(size)
+
+
+def gaussian_process(spectrum, fs, n, n_series=None, seed=None,
+                     segment=2**16, overlap=None, out=None):
+    '''
+    Simulate zero-mean Gaussian time series from a power spectrum by FFT.
+
+    Long series are generated segment by segment. Each segment is a random
+    phase realization of length `segment`, and consecutive segments are
+    cross-faded over `overlap` values with weights whose squares sum to one,
+    so the variance is kept constant.
+
+    Parameters
+    ----------
+    spectrum : callable or tuple
+        One-sided variance spectral density per Hz, either as a function
+        ``S(f)`` of frequency in Hz, or as a tuple ``(f, S)`` of arrays that
+        are linearly interpolated.
+    fs : float
+        Sampling frequency in Hz.
+    n : int
+        Number of values of each series.
+    n_series : int, optional
+        Number of independent series. If None (default), a single 1D series
+        is returned.
+    seed : int or sequence, optional
+        Seed of the random generator. A sequence gives one seed per series,
+        such that each series can be reproduced independently.
+    segment : int, optional
+        Length of each FFT segment. Sets the frequency resolution
+        ``fs / segment``. Default is 2**16.
+    overlap : int, optional
+        Number of cross-faded values between consecutive segments. Default
+        is ``segment // 8``.
+    out : array-like, optional
+        Array with shape (n_series, n), or (n,), to write the series to, e.g.
+        a `numpy.memmap`.
+
+    Returns
+    -------
+    x : array-like
+        Simulated time series with shape (n_series, n), or (n,).
+    '''
+    n = int(n)
+    segment = int(segment) + int(segment) % 2
+    if overlap is None:
+        overlap = segment // 8
+    if not 0 <= overlap < segment:
+        raise ValueError('overlap must be smaller than segment.')
+    hop = segment - overlap
+
+    squeeze = n_series is None
+    n_series = 1 if squeeze else int(n_series)
+    if out is None:
+        out = np.empty((n_series, n))
+    out_2d = out.reshape(n_series, n)
+
+    f = np.fft.rfftfreq(segment, d=1. / fs)
+    if callable(spectrum):
+        S = np.asarray(spectrum(f), dtype='float64')
+    else:
+        S = np.interp(f, *spectrum, left=0., right=0.)
+    amplitude = 0.5 * segment * sqrt(S * fs / segment)
+    amplitude[0] = 0.
+    amplitude[-1] = 0.
+
+    rngs = _rngs(seed, n_series)
+    t = (np.arange(overlap) + 0.5) / overlap
+    fade_in, fade_out = np.sin(0.5 * pi * t), np.cos(0.5 * pi * t)
+
+    tail = None
+    pos = 0
+    while pos < n:
+        size = (n_series, f.size)
+        coeff = amplitude * (_normal(rngs, size) + 1j * _normal(rngs, size))
+        x = np.fft.irfft(coeff, n=segment, axis=-1)
+        if tail is not None:
+            x[:, :overlap] *= fade_in
+            x[:, :overlap] += fade_out * tail
+
+        if pos + segment >= n:
+            out_2d[:, pos:] = x[:, :n - pos]
+            break
+        out_2d[:, pos:pos + hop] = x[:, :hop]
+        tail = x[:, hop:]
+        pos += hop
+
+    return out_2d[0] if squeeze else out
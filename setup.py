@@ -23,5 +23,6 @@ setup(
         "License :: OSI Approved :: MIT License",
     ],
     install_requires=["numpy", "scipy"],
+    entry_points={"console_scripts": ["evapy = evapy_4s._cli:main"]},
     zip_safe=False,
 )
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from evapy_4s import archive
+from evapy_4s.evstats import argrelmax_decluster
+
+
+class Test_archive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "peaks")
+        rng = np.random.default_rng(5)
+        t = np.arange(200000) * 0.1
+        self.x = np.sin(2.0 * np.pi * 0.1 * t) * rng.rayleigh(1.0, t.size)
+        self.index = argrelmax_decluster(self.x)
+        self.values = self.x[self.index]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        arc = archive.save_peaks(self.path, self.index, self.values, dtype="float64", blocksize=1000)
+        index, values = arc.select()
+        np.testing.assert_array_equal(index, self.index)
+        np.testing.assert_array_equal(values, self.values)
+        self.assertEqual(len(arc), self.index.size)
+
+    def test_compact(self):
+        archive.save_peaks(self.path, self.index, self.values)
+        size = os.path.getsize(os.path.join(self.path, "delta.npy")) + os.path.getsize(
+            os.path.join(self.path, "values.npy")
+        )
+        self.assertLess(size, 6 * self.index.size)
+
+    def test_quantized(self):
+        values = self.values.copy()
+        arc = archive.save_peaks(self.path, self.index, values, dtype="uint16", blocksize=500)
+        np.testing.assert_array_equal(values, self.values)
+        _, calculated = arc.select()
+        step = (arc.meta["max"] - arc.meta["min"]).max() / 65535
+        np.testing.assert_allclose(calculated, self.values, rtol=0, atol=0.5001 * step)
+        np.testing.assert_array_equal(arc.meta["max"], np.maximum.reduceat(self.values, np.arange(0, self.values.size, 500)))
+
+    def test_select_index(self):
+        arc = archive.save_peaks(self.path, self.index, self.values, blocksize=300)
+        index, values = arc.select(start=50000, stop=123457)
+        mask = (self.index >= 50000) & (self.index < 123457)
+        np.testing.assert_array_equal(index, self.index[mask])
+        np.testing.assert_allclose(values, self.values[mask].astype("float32"))
+
+    def test_select_time(self):
+        arc = archive.save_peaks(self.path, self.index, self.values, dt=0.1, t0=100.0, blocksize=300)
+        index, _ = arc.select(t_start=200.0, t_stop=5000.05)
+        t = arc.times(self.index)
+        np.testing.assert_array_equal(index, self.index[(t >= 200.0) & (t < 5000.05)])
+
+    def test_select_value(self):
+        arc = archive.save_peaks(self.path, self.index, self.values, dtype="float64", blocksize=300)
+        index, values = arc.select(vmin=3.0, start=10000)
+        mask = (self.values >= 3.0) & (self.index >= 10000)
+        np.testing.assert_array_equal(index, self.index[mask])
+        self.assertTrue((values >= 3.0).all())
+
+    def test_blocks_skipped(self):
+        arc = archive.save_peaks(self.path, self.index, self.values, blocksize=50)
+        blocks = arc._blocks(start=50000, stop=60000)
+        self.assertLess(blocks.size, 0.1 * arc.meta.size)
+        self.assertEqual(arc._blocks(vmin=np.inf).size, 0)
+        index, values = arc.select(vmin=np.inf)
+        self.assertEqual(index.size, 0)
+
+    def test_no_dt(self):
+        arc = archive.save_peaks(self.path, self.index, self.values)
+        with self.assertRaises(ValueError):
+            arc.select(t_start=1.0)
+
+    def test_not_increasing(self):
+        with self.assertRaises(ValueError):
+            archive.save_peaks(self.path, self.index[::-1], self.values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from evapy_4s import _cli, distributions
+
+
+class Test_load(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.x = np.sin(np.linspace(0.0, 20.0 * np.pi, 1001))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_npy(self):
+        path = os.path.join(self.tmpdir, "a.npy")
+        np.save(path, self.x)
+        np.testing.assert_array_equal(_cli._load(path), self.x)
+
+    def test_csv(self):
+        path = os.path.join(self.tmpdir, "a.csv")
+        np.savetxt(path, np.column_stack([self.x, -self.x]), delimiter=",")
+        np.testing.assert_allclose(_cli._load(path, column=1), -self.x)
+
+    def test_raw(self):
+        path = os.path.join(self.tmpdir, "a.bin")
+        self.x.astype("float32").tofile(path)
+        np.testing.assert_allclose(
+            _cli._load(path, dtype="float32"), self.x.astype("float32")
+        )
+
+
+class Test_main(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.indir = os.path.join(self.tmpdir, "in")
+        os.mkdir(self.indir)
+        self.output = os.path.join(self.tmpdir, "out.csv")
+        rng = np.random.default_rng(1)
+        for i in range(3):
+            x = np.cumsum(rng.standard_normal(2000))
+            np.save(os.path.join(self.indir, "x{}.npy".format(i)), x - x.mean())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _rows(self):
+        with open(self.output, newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_run(self):
+        argv = [self.indir, "-o", self.output, "-j", "1", "--dist", "rayleigh"]
+        self.assertEqual(_cli.main(argv), 0)
+        rows = self._rows()
+        self.assertEqual(sorted(r["file"] for r in rows), ["x0.npy", "x1.npy", "x2.npy"])
+        self.assertIn("rayleigh_scale", rows[0])
+
+    def test_resume(self):
+        argv = [self.indir, "-o", self.output, "-j", "1", "--dist", "rayleigh"]
+        _cli.main(argv)
+        with open(self.output) as f:
+            lines = f.readlines()
+        # Simulate an interrupted run with a partially written last row.
+        with open(self.output, "w") as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:5])
+
+        _cli.main(argv)
+        rows = self._rows()
+        self.assertEqual(sorted(r["file"] for r in rows), ["x0.npy", "x1.npy", "x2.npy"])
+
+    def test_resume_other_columns(self):
+        argv = [self.indir, "-o", self.output, "-j", "1", "--dist", "rayleigh"]
+        _cli.main(argv)
+        os.remove(os.path.join(self.indir, "x2.npy"))
+        with open(self.output) as f:
+            expected = f.read()
+        with self.assertRaises(SystemExit):
+            _cli.main(argv[:-1] + ["weibull"])
+        with open(self.output) as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_fit_failure_reported(self):
+        path = os.path.join(self.indir, "x0.npy")
+        options = {
+            "format": "auto",
+            "dtype": "float64",
+            "column": 0,
+            "skiprows": 0,
+            "x_up": "0.0",
+            "dists": ["rayleigh"],
+            "floc": None,
+        }
+        with mock.patch.object(
+            distributions.rayleigh, "fit", side_effect=RuntimeError("boom")
+        ):
+            row, _, errors = _cli._process_file(path, options)
+        self.assertEqual(errors, ["rayleigh fit failed: boom"])
+        self.assertTrue(np.isnan(float(row["rayleigh_scale"])))
+
+
+    def test_unknown_dist(self):
+        for name in ("OnlineRayleigh", "np", "nodist"):
+            argv = [self.indir, "-o", self.output, "--dist", name]
+            with mock.patch("sys.stderr"), self.assertRaises(SystemExit) as cm:
+                _cli.main(argv)
+            self.assertEqual(cm.exception.code, 2)
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_mean_level_nan(self):
+        path = os.path.join(self.indir, "x0.npy")
+        x = np.load(path)
+        x[10] = np.nan
+        np.save(path, x)
+        options = {
+            "format": "auto",
+            "dtype": "float64",
+            "column": 0,
+            "skiprows": 0,
+            "x_up": "mean",
+            "dists": [],
+            "floc": None,
+        }
+        row, _, _ = _cli._process_file(path, options)
+        self.assertAlmostEqual(row["x_up"], np.nanmean(x))
+        self.assertGreater(row["n_peaks"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+from scipy import stats
+
+import evapy_4s.distributions as dist
+from evapy_4s import diagnostics
+
+
+class Test_goodness_of_fit(unittest.TestCase):
+    def setUp(self):
+        self.samples = [
+            dist.weibull.rvs(1.5, scale=2.0, size=n, random_state=i)
+            for i, n in enumerate([10, 50, 200])
+        ]
+        self.params = [dist.weibull.fit(x, floc=0.0) for x in self.samples]
+
+    def tearDown(self):
+        pass
+
+    def test_ks(self):
+        calculated = diagnostics.goodness_of_fit(
+            dist.weibull, self.samples, self.params
+        )
+        for result, x, params in zip(calculated, self.samples, self.params):
+            expected = stats.kstest(x, dist.weibull.cdf, args=params)
+            self.assertAlmostEqual(result["ks"], expected.statistic)
+            self.assertAlmostEqual(result["ks_pvalue"], expected.pvalue)
+
+    def test_ad(self):
+        calculated = diagnostics.goodness_of_fit(
+            dist.weibull, self.samples, self.params
+        )
+        for result, x, params in zip(calculated, self.samples, self.params):
+            n = x.size
+            i = np.arange(1, n + 1)
+            cdf = dist.weibull.cdf(np.sort(x), *params)
+            expected = -n - np.sum((2 * i - 1) * (np.log(cdf) + np.log1p(-cdf[::-1]))) / n
+            self.assertAlmostEqual(result["ad"], expected)
+
+    def test_ppcc(self):
+        calculated = diagnostics.goodness_of_fit(
+            dist.weibull, self.samples, self.params
+        )
+        for result, x, params in zip(calculated, self.samples, self.params):
+            n = x.size
+            pp = (np.arange(1, n + 1) - 0.3) / (n + 0.4)
+            expected = np.corrcoef(np.sort(x), dist.weibull.ppf(pp, params[0]))[0, 1]
+            self.assertAlmostEqual(result["ppcc"], expected)
+
+    def test_empty_sample(self):
+        samples = [self.samples[0], [], self.samples[1]]
+        params = [self.params[0], self.params[0], self.params[1]]
+        calculated = diagnostics.goodness_of_fit(dist.weibull, samples, params)
+        np.testing.assert_array_equal(calculated["n"], [10, 0, 50])
+        self.assertTrue(np.isnan(calculated["ks"][1]))
+        self.assertFalse(np.isnan(calculated["ks"][2]))
+
+    def test_2d_samples(self):
+        x = np.array(self.samples[1]).reshape(5, 10)
+        params = np.tile([0.0, 1.0], (5, 1)) * [1.0, 2.0]
+        calculated = diagnostics.goodness_of_fit(dist.rayleigh, x, params)
+        expected = stats.kstest(x[3], dist.rayleigh.cdf, args=(0.0, 2.0))
+        self.assertAlmostEqual(calculated["ks"][3], expected.statistic)
+
+    def test_wrong_params(self):
+        with self.assertRaises(ValueError):
+            diagnostics.goodness_of_fit(
+                dist.weibull, self.samples, np.ones((3, 2))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
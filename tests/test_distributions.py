@@ -1,8 +1,11 @@
 import unittest
+from unittest import mock
 
 import numpy as np
+from scipy.stats import rv_continuous
 
 import evapy_4s.distributions as dist
+from evapy_4s import _optimize
 
 
 class Test_rayleigh_gen(unittest.TestCase):
@@ -65,6 +68,60 @@ class Test_frechet_r_gen(unittest.TestCase):
         expected = self.dist.cdf(2.5, 2.0, loc=0.5, scale=2.0)
         self.assertAlmostEqual(calculated, expected, places=4)
 
+    def test_fit_3p(self):
+        x = self.dist.rvs(1.6, loc=1.0, scale=2.0, size=5000, random_state=0)
+        params = self.dist.fit(x)
+        with np.errstate(all="ignore"):
+            generic = super(type(self.dist), self.dist).fit(x)
+        np.testing.assert_allclose(params, generic, rtol=1e-3)
+        self.assertLessEqual(self.dist.nnlf(params, x), self.dist.nnlf(generic, x) + 1e-6)
+
+    def test_fit_3p_unbounded(self):
+        x = self.dist.rvs(0.7, loc=1.0, scale=2.0, size=5000, random_state=0)
+        c, loc, scale = self.dist.fit(x)
+        self.assertEqual(loc, x.min())
+        self.assertAlmostEqual(c, 0.7, delta=0.05)
+        self.assertAlmostEqual(scale, 2.0, delta=0.1)
+
+    def test_fit_3p_start(self):
+        x = self.dist.rvs(1.6, loc=1.0, scale=2.0, size=5000, random_state=0)
+        with mock.patch.object(
+            dist._distns, "_weibull3_mle", wraps=_optimize._weibull3_mle
+        ) as fit:
+            params = self.dist.fit(x, 1.6)
+        self.assertEqual(fit.call_args[1]["c0"], 1.6)
+        np.testing.assert_allclose(params, self.dist.fit(x), rtol=1e-6)
+        with self.assertRaises(TypeError):
+            self.dist.fit(x, 1.6, 1.0)
+
+    def test_fit_3p_loc_start(self):
+        x = self.dist.rvs(1.6, loc=1.0, scale=2.0, size=5000, random_state=0)
+        with mock.patch.object(
+            _optimize, "_weibull_profile", wraps=_optimize._weibull_profile
+        ) as profile:
+            expected = self.dist.fit(x)
+            n_cold = profile.call_count
+            profile.reset_mock()
+            params = self.dist.fit(x, expected[0], loc=expected[1])
+            self.assertLess(profile.call_count, n_cold)
+        np.testing.assert_allclose(params, expected, rtol=1e-6)
+        # A start far from the estimate falls back to the full search
+        params = self.dist.fit(x, loc=x.min() - 1e3)
+        np.testing.assert_allclose(params, expected, rtol=1e-6)
+
+    def test_fit_floc(self):
+        x = self.dist.rvs(1.6, scale=2.0, size=1000, random_state=0)
+        c, loc, scale = self.dist.fit(x, floc=0.0)
+        expected = _optimize._weibull_mle(x)
+        np.testing.assert_allclose((c, scale), expected)
+        self.assertEqual(loc, 0.0)
+
+    def test_fit_fixed_shape(self):
+        x = self.dist.rvs(1.6, scale=2.0, size=1000, random_state=0)
+        c, loc, scale = self.dist.fit(x, fc=1.6, floc=0.0)
+        self.assertEqual(c, 1.6)
+        self.assertAlmostEqual(scale, 2.0, delta=0.1)
+
 
 class Test_gumbel_r_gen(unittest.TestCase):
     def setUp(self):
@@ -153,3 +210,485 @@ class Test_acer_o1_gen(unittest.TestCase):
         calculated = dist.acer_o1.cdf(2.5, 1.0, 1.0, loc=0.5, scale=2.0)
         expected = self.dist.cdf(2.5, 1.0, 1.0, loc=0.5, scale=2.0)
         self.assertAlmostEqual(calculated, expected, places=4)
+
+
+class Test_OnlineRayleigh(unittest.TestCase):
+    def setUp(self):
+        self.x = dist.rayleigh.rvs(loc=0.5, scale=1.5, size=2000, random_state=1)
+
+    def tearDown(self):
+        pass
+
+    def test_params(self):
+        est = dist.OnlineRayleigh(floc=0.5)
+        for i in range(0, 2000, 100):
+            est.update(self.x[i : i + 100])
+        calculated = est.params
+        expected = (0.5, np.sqrt(np.mean((self.x - 0.5) ** 2) / 2.0))
+        np.testing.assert_allclose(calculated, expected)
+
+    def test_params_window(self):
+        est = dist.OnlineRayleigh(floc=0.5, window=300)
+        for x_i in self.x:
+            est.update(x_i)
+        calculated = est.params
+        expected = dist.rayleigh.fit(self.x[-300:], floc=0.5)
+        np.testing.assert_allclose(calculated, expected, rtol=1e-4)
+
+    def test_params_forget(self):
+        est = dist.OnlineRayleigh(floc=0.5, forget=0.99)
+        est.update(self.x)
+        w = 0.99 ** np.arange(1999, -1, -1)
+        expected = np.sqrt(np.sum(w * (self.x - 0.5) ** 2) / np.sum(w) / 2.0)
+        self.assertAlmostEqual(est.params[1], expected)
+
+    def test_freeze(self):
+        est = dist.OnlineRayleigh().update(self.x)
+        self.assertAlmostEqual(est.freeze().cdf(2.0), dist.rayleigh.cdf(2.0, *est.params))
+
+    def test_no_data(self):
+        with self.assertRaises(ValueError):
+            dist.OnlineRayleigh().params
+
+    def test_invalid_forget(self):
+        with self.assertRaises(ValueError):
+            dist.OnlineRayleigh(forget=1.5)
+
+
+class Test_OnlineWeibull(unittest.TestCase):
+    def setUp(self):
+        self.x = dist.weibull.rvs(1.7, scale=2.0, size=3000, random_state=1)
+
+    def tearDown(self):
+        pass
+
+    def test_params_moments(self):
+        est = dist.OnlineWeibull(refine_every=None).update(self.x)
+        c, loc, scale = est.params
+        self.assertAlmostEqual(c, 1.7, delta=0.1)
+        self.assertAlmostEqual(scale, 2.0, delta=0.1)
+
+    def test_params_refine(self):
+        est = dist.OnlineWeibull()
+        for i in range(0, 3000, 50):
+            est.update(self.x[i : i + 50])
+        calculated = est.refine().params
+        expected = dist.weibull.fit(self.x, floc=0.0)
+        np.testing.assert_allclose(calculated, expected, rtol=1e-3)
+
+    def test_params_window(self):
+        est = dist.OnlineWeibull(window=500)
+        for i in range(0, 3000, 50):
+            est.update(self.x[i : i + 50])
+        calculated = est.refine().params
+        expected = dist.weibull.fit(self.x[-500:], floc=0.0)
+        np.testing.assert_allclose(calculated, expected, rtol=1e-3)
+
+    def test_params_forget(self):
+        est = dist.OnlineWeibull(forget=0.995).update(self.x)
+        calculated = est.refine().params
+        w = 0.995 ** np.arange(2999, -1, -1)
+        c, scale = _optimize._weibull_mle(self.x, weights=w)
+        np.testing.assert_allclose(calculated, (c, 0.0, scale), rtol=1e-6)
+
+    def test_bounded_history(self):
+        x = dist.weibull.rvs(1.7, scale=2.0, size=400000, random_state=2)
+        est = dist.OnlineWeibull(history=5000)
+        for i in range(0, x.size, 100):
+            est.update(x[i : i + 100])
+        self.assertEqual(len(est._buffer), 5000)
+        self.assertEqual(est._buffer._values.size, 5000)
+        expected = dist.weibull.fit(x, floc=0.0)
+        np.testing.assert_allclose(est.params, expected, rtol=1e-3)
+
+
+class Test_select_tail(unittest.TestCase):
+    def setUp(self):
+        self.x = np.random.default_rng(0).standard_normal(1000)
+
+    def tearDown(self):
+        pass
+
+    def test_fraction(self):
+        calculated, n_total = _optimize._select_tail(self.x, 0.05)
+        np.testing.assert_array_equal(calculated, np.sort(self.x)[-50:])
+        self.assertEqual(n_total, 1000)
+
+    def test_count(self):
+        calculated, _ = _optimize._select_tail(self.x, 7)
+        np.testing.assert_array_equal(calculated, np.sort(self.x)[-7:])
+
+    def test_none(self):
+        calculated, _ = _optimize._select_tail(self.x)
+        np.testing.assert_array_equal(calculated, np.sort(self.x))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _optimize._select_tail(self.x, 1.5)
+        with self.assertRaises(ValueError):
+            _optimize._select_tail(self.x, 0)
+
+
+class Test_gen_exp_tail_fit(unittest.TestCase):
+    def setUp(self):
+        self.x = dist.weibull.rvs(1.5, scale=2.0, size=5000, random_state=0)
+
+    def tearDown(self):
+        pass
+
+    def test_fit(self):
+        c, q, loc, scale = dist.genexptail.fit(self.x, floc=0.0)
+        self.assertAlmostEqual(c, 1.5, delta=0.1)
+        self.assertAlmostEqual(dist.genexptail.ppf(0.99, c, q, loc, scale),
+                               dist.weibull.ppf(0.99, 1.5, scale=2.0), delta=0.2)
+
+    def test_fit_unsorted_equals_sorted(self):
+        calculated = dist.genexptail.fit(self.x, floc=0.0)
+        expected = dist.genexptail.fit(np.sort(self.x)[::-1], floc=0.0)
+        np.testing.assert_allclose(calculated, expected)
+
+    def test_fit_tail(self):
+        params = dist.genexptail.fit(self.x, floc=0.0, tail=0.1)
+        for p in (0.95, 0.99):
+            self.assertAlmostEqual(
+                dist.genexptail.ppf(p, *params),
+                dist.weibull.ppf(p, 1.5, scale=2.0),
+                delta=0.2,
+            )
+
+    def test_fit_tail_count_equals_fraction(self):
+        calculated = dist.genexptail.fit(self.x, floc=0.0, tail=500)
+        expected = dist.genexptail.fit(self.x, floc=0.0, tail=0.1)
+        np.testing.assert_allclose(calculated, expected)
+
+
+    def test_fit_small_sample(self):
+        with np.errstate(all="ignore"):
+            for distribution in (dist.genexptail, dist.acer_o1):
+                params = distribution.fit([1.2, 2.3], floc=0.0)
+                self.assertEqual(params[-2], 0.0)
+            params = dist.genexptail.fit(self.x, floc=0.0, tail=2)
+        self.assertEqual(params[-2], 0.0)
+
+    def test_fit_not_worse_than_generic_start(self):
+        for distribution in (dist.genexptail, dist.acer_o1):
+            x = np.sort(self.x[:2000])
+            with np.errstate(all="ignore"), _optimize._sorted_sample():
+                params = distribution.fit(x)
+                start = rv_continuous._fitstart(distribution, x)
+                generic = distribution.fit(
+                    x, *start[:-2], loc=start[-2], scale=start[-1]
+                )
+                error = distribution._penalized_nnlf(np.asarray(params), x)
+                error_generic = distribution._penalized_nnlf(
+                    np.asarray(generic), x
+                )
+            self.assertLessEqual(error, error_generic)
+
+class Test_lmoments(unittest.TestCase):
+    def setUp(self):
+        self.x = np.random.default_rng(2).standard_normal(50)
+
+    def tearDown(self):
+        pass
+
+    def test_sample_lmoments(self):
+        x = np.sort(self.x)
+        i, j = np.triu_indices(x.size, 1)
+        l2 = np.mean(x[j] - x[i]) / 2.0
+        triples = np.array(
+            [(a, b, c) for a in range(x.size) for b in range(a + 1, x.size) for c in range(b + 1, x.size)]
+        )
+        l3 = np.mean(x[triples[:, 2]] - 2 * x[triples[:, 1]] + x[triples[:, 0]]) / 3.0
+        l1_, l2_, t3_ = _optimize._lmoments(self.x)
+        self.assertAlmostEqual(l1_, x.mean())
+        self.assertAlmostEqual(l2_, l2)
+        self.assertAlmostEqual(t3_, l3 / l2)
+
+    def test_fit_gumbel(self):
+        x = dist.gumbel.rvs(loc=3.0, scale=0.5, size=20000, random_state=0)
+        loc, scale = dist.gumbel.fit(x, method="lmoments")
+        self.assertAlmostEqual(loc, 3.0, delta=0.02)
+        self.assertAlmostEqual(scale, 0.5, delta=0.02)
+        loc, scale = dist.gumbel_max.fit(x, method="lmoments", floc=3.0)
+        self.assertEqual(loc, 3.0)
+        self.assertAlmostEqual(scale, 0.5, delta=0.02)
+
+    def test_fit_rayleigh(self):
+        x = dist.rayleigh.rvs(loc=1.0, scale=2.0, size=20000, random_state=0)
+        loc, scale = dist.rayleigh.fit(x, method="lmoments")
+        self.assertAlmostEqual(loc, 1.0, delta=0.05)
+        self.assertAlmostEqual(scale, 2.0, delta=0.05)
+        loc, scale = dist.rayleigh.fit(x, method="lmoments", floc=1.0)
+        self.assertAlmostEqual(scale, 2.0, delta=0.05)
+
+    def test_fit_weibull(self):
+        for c in (0.8, 1.5, 4.0):
+            x = dist.weibull.rvs(c, loc=1.0, scale=2.0, size=20000, random_state=0)
+            params = dist.weibull.fit(x, method="lmoments")
+            np.testing.assert_allclose(params, (c, 1.0, 2.0), rtol=0.05, atol=0.05)
+            params = dist.weibull.fit(x, method="lmoments", floc=1.0)
+            np.testing.assert_allclose(params, (c, 1.0, 2.0), rtol=0.05)
+
+    def test_fit_unknown_argument(self):
+        with self.assertRaises(TypeError):
+            dist.weibull.fit(self.x, method="lmoments", fscale=1.0)
+
+    def test_fitstart_genexptail(self):
+        x = dist.weibull.rvs(1.5, scale=2.0, size=5000, random_state=0)
+        with _optimize._sorted_sample(floc=0.0):
+            c, q, loc, scale = dist.genexptail._fitstart(np.sort(x))
+        expected = dist.weibull.fit(x, method="lmoments", floc=0.0)
+        np.testing.assert_allclose((c, loc, scale), expected)
+        self.assertEqual(q, 1.0)
+
+    def test_fitstart_tail(self):
+        x = dist.weibull.rvs(1.0, scale=2.0, size=20000, random_state=0)
+        tail, n_total = _optimize._select_tail(x, 0.1)
+        with _optimize._sorted_sample(n_total, floc=0.0):
+            c, q, loc, scale = dist.genexptail._fitstart(tail)
+        # Exponential data, so the start is close to the true sf
+        self.assertAlmostEqual(scale, 2.0, delta=0.15)
+        self.assertAlmostEqual(q, 1.0, delta=0.15)
+
+    def test_sorted_sample_nested(self):
+        with _optimize._sorted_sample(1000, floc=0.0):
+            with _optimize._sorted_sample(floc=1.0):
+                self.assertEqual(_optimize._fit_sample_info(), (True, None, 1.0))
+            self.assertEqual(_optimize._fit_sample_info(), (True, 1000, 0.0))
+        self.assertEqual(_optimize._fit_sample_info(), (False, None, None))
+
+
+class Test_progressive_fit(unittest.TestCase):
+    def setUp(self):
+        self.x = dist.weibull.rvs(1.5, scale=2.0, size=200000, random_state=4)
+
+    def tearDown(self):
+        pass
+
+    def test_stratified_sample(self):
+        x = np.arange(100.0)
+        np.testing.assert_array_equal(
+            _optimize._stratified_sample(x, 4), [12.0, 37.0, 62.0, 87.0]
+        )
+
+    def test_weibull(self):
+        expected = dist.weibull.fit(self.x, floc=0.0)
+        params, fraction = dist.weibull.fit(
+            self.x, floc=0.0, progressive=True, full_output=True
+        )
+        self.assertLess(fraction, 0.1)
+        np.testing.assert_allclose(params, expected, rtol=5e-3, atol=1e-12)
+
+    def test_weibull_3p(self):
+        x = dist.weibull.rvs(1.6, loc=1.0, scale=2.0, size=200000, random_state=4)
+        expected = dist.weibull.fit(x)
+        params, fraction = dist.weibull.fit(x, progressive=True, full_output=True)
+        self.assertLess(fraction, 1.0)
+        np.testing.assert_allclose(params, expected, rtol=5e-3)
+
+    def test_partial_sort(self):
+        with mock.patch.object(_optimize.np, "sort", wraps=np.sort) as sort:
+            params, fraction = dist.weibull.fit(
+                self.x, floc=0.0, progressive=True, full_output=True
+            )
+        self.assertLess(fraction, 0.1)
+        sizes = [np.size(call.args[0]) for call in sort.call_args_list]
+        self.assertLessEqual(max(sizes), 16 * fraction * self.x.size)
+
+    def test_weibull_return_level(self):
+        expected = dist.weibull.isf(1e-6, *dist.weibull.fit(self.x, floc=0.0))
+        params = dist.weibull.fit(
+            self.x, floc=0.0, progressive=500, n_return=1e6, rtol=1e-4
+        )
+        self.assertAlmostEqual(
+            dist.weibull.isf(1e-6, *params) / expected, 1.0, delta=1e-3
+        )
+
+    def test_full_sample(self):
+        expected = dist.weibull.fit(self.x[:1000], floc=0.0)
+        params, fraction = dist.weibull.fit(
+            self.x[:1000], floc=0.0, progressive=True, full_output=True
+        )
+        self.assertEqual(fraction, 1.0)
+        np.testing.assert_allclose(params, expected)
+
+    def test_genexptail(self):
+        x = self.x[:50000]
+        expected = dist.genexptail.isf(1e-4, *dist.genexptail.fit(x, floc=0.0))
+        params, fraction = dist.genexptail.fit(
+            x, floc=0.0, progressive=True, n_return=1e4, full_output=True
+        )
+        self.assertLess(fraction, 1.0)
+        self.assertEqual(params[2], 0.0)
+        self.assertAlmostEqual(
+            dist.genexptail.isf(1e-4, *params) / expected, 1.0, delta=0.01
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            dist.weibull.fit(self.x, progressive=-1)
+
+
+class Test_fast(unittest.TestCase):
+    def setUp(self):
+        self.x = np.r_[-1.0, np.nan, 0.0, np.linspace(0.01, 8.0, 101)]
+        self.p = np.r_[0.0, np.linspace(0.01, 0.99, 21), 1.0]
+        self.cases = [
+            (dist.rayleigh, ()),
+            (dist.weibull, (0.7,)),
+            (dist.weibull, (2.5,)),
+            (dist.truncrayleigh, (0.5,)),
+            (dist.truncweibull, (1.5, 0.5)),
+            (dist.gumbel, ()),
+            (dist.genexptail, (1.5, 1.0)),
+            (dist.acer_o1, (1.2, 3.0)),
+        ]
+
+    def tearDown(self):
+        pass
+
+    def test_equals_public(self):
+        for d, shapes in self.cases:
+            frozen = d.fast(*shapes, loc=0.3, scale=1.7)
+            for method in ("pdf", "logpdf", "cdf", "sf", "ppf"):
+                x = self.p if method == "ppf" else self.x
+                with np.errstate(all="ignore"):
+                    expected = getattr(d, method)(x, *shapes, loc=0.3, scale=1.7)
+                    calculated = getattr(frozen, method)(x)
+                np.testing.assert_allclose(calculated, expected, rtol=1e-10, err_msg=d.name + method)
+
+    def test_scalar(self):
+        frozen = dist.weibull.fast(1.5, scale=2.0)
+        self.assertIsInstance(frozen.cdf(1.0), float)
+        self.assertAlmostEqual(frozen.cdf(1.0), dist.weibull.cdf(1.0, 1.5, scale=2.0))
+
+    def test_support_boundary(self):
+        for d, shapes in self.cases:
+            frozen = d.fast(*shapes, loc=0.3, scale=1.7)
+            a = d.support(*shapes, loc=0.3, scale=1.7)[0]
+            for method in ("pdf", "logpdf", "cdf", "sf"):
+                with np.errstate(all="ignore"):
+                    expected = getattr(d, method)(a, *shapes, loc=0.3, scale=1.7)
+                    calculated = getattr(frozen, method)(a)
+                np.testing.assert_allclose(calculated, expected, err_msg=d.name + method)
+        self.assertEqual(dist.genexptail.fast(1.5, 2.0).cdf(0.0), 0.0)
+        self.assertEqual(dist.genexptail.fast(1.5, 2.0).sf(0.0), 1.0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            dist.weibull.fast(-1.0)
+
+    def test_logpdf_at_zero(self):
+        self.assertEqual(dist.weibull.logpdf(0.0, 1.0), 0.0)
+        self.assertAlmostEqual(
+            dist.acer_o1.logpdf(2.0, 1.2, 3.0), np.log(dist.acer_o1.pdf(2.0, 1.2, 3.0))
+        )
+
+
+class Test_truncrayleigh_gen(unittest.TestCase):
+    def setUp(self):
+        self.dist = dist._distns.truncrayleigh_gen(a=0.0)
+
+    def tearDown(self):
+        pass
+
+    def test_cdf(self):
+        calculated = self.dist.cdf(2.5, 1.0, loc=0.5, scale=np.sqrt(2.0))
+        expected = -np.expm1(-1.0 + 0.5)
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+    def test_pdf(self):
+        calculated = self.dist.pdf(2.5, 1.0, loc=0.5, scale=np.sqrt(2.0))
+        expected = np.exp(-1.0 + 0.5)
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+    def test_ppf(self):
+        calculated = self.dist.ppf(0.5, 1.0, loc=0.5, scale=np.sqrt(2.0))
+        expected = np.sqrt(2.0) * np.sqrt(1.0 + 2.0 * np.log(2.0)) + 0.5
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+    def test_support(self):
+        self.assertEqual(self.dist.pdf(0.9, 1.0), 0.0)
+        self.assertEqual(self.dist.cdf(0.9, 1.0), 0.0)
+
+    def test_reduces_to_rayleigh(self):
+        x = np.linspace(0.1, 4.0, 10)
+        np.testing.assert_allclose(
+            self.dist.pdf(x, 0.0, scale=2.0), dist.rayleigh.pdf(x, scale=2.0)
+        )
+
+    def test_mean(self):
+        calculated = self.dist.mean(1.3)
+        expected = self.dist.expect(lambda x: x, args=(1.3,))
+        self.assertAlmostEqual(calculated, expected, places=6)
+
+    def test_fit_threshold(self):
+        x = dist.rayleigh.rvs(loc=0.5, scale=2.0, size=100000, random_state=0)
+        b, loc, scale = dist.truncrayleigh.fit(x, threshold=3.5, floc=0.5)
+        self.assertEqual(loc, 0.5)
+        self.assertAlmostEqual(scale, 2.0, delta=0.02)
+        self.assertAlmostEqual(b, 3.0 / scale)
+
+    def test_fit_threshold_unknown_argument(self):
+        with self.assertRaises(TypeError):
+            dist.truncrayleigh.fit([1.0, 2.0, 3.0], threshold=1.0, fscale=1.0)
+
+    def test_instance_truncrayleigh(self):
+        calculated = dist.truncrayleigh.cdf(2.5, 1.0, loc=0.5, scale=2.0)
+        expected = self.dist.cdf(2.5, 1.0, loc=0.5, scale=2.0)
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+
+class Test_truncweibull_gen(unittest.TestCase):
+    def setUp(self):
+        self.dist = dist._distns.truncweibull_gen(a=0.0)
+
+    def tearDown(self):
+        pass
+
+    def test_cdf(self):
+        calculated = self.dist.cdf(2.5, 2.0, 0.5, loc=0.5, scale=2.0)
+        expected = -np.expm1(-1.0 + 0.25)
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+    def test_pdf(self):
+        calculated = self.dist.pdf(2.5, 2.0, 0.5, loc=0.5, scale=2.0)
+        expected = np.exp(-1.0 + 0.25)
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+    def test_ppf(self):
+        calculated = self.dist.ppf(0.5, 2.0, 0.5, loc=0.5, scale=2.0)
+        expected = 2.0 * np.sqrt(0.25 + np.log(2.0)) + 0.5
+        self.assertAlmostEqual(calculated, expected, places=4)
+
+    def test_reduces_to_weibull(self):
+        x = np.linspace(0.1, 4.0, 10)
+        np.testing.assert_allclose(
+            self.dist.cdf(x, 1.7, 0.0, scale=2.0),
+            dist.weibull.cdf(x, 1.7, scale=2.0),
+        )
+
+    def test_mean(self):
+        calculated = self.dist.mean(1.7, 0.8)
+        expected = self.dist.expect(lambda x: x, args=(1.7, 0.8))
+        self.assertAlmostEqual(calculated, expected, places=6)
+
+    def test_fit_threshold(self):
+        x = dist.weibull.rvs(1.6, loc=0.5, scale=2.0, size=100000, random_state=0)
+        c, b, loc, scale = dist.truncweibull.fit(x, threshold=3.0, floc=0.5)
+        self.assertAlmostEqual(c, 1.6, delta=0.05)
+        self.assertAlmostEqual(scale, 2.0, delta=0.05)
+        self.assertAlmostEqual(b, 2.5 / scale)
+
+    def test_fit_threshold_zero(self):
+        x = dist.weibull.rvs(1.6, scale=2.0, size=1000, random_state=0)
+        c, b, loc, scale = dist.truncweibull.fit(x, threshold=0.0)
+        expected = dist.weibull.fit(x, floc=0.0)
+        np.testing.assert_allclose((c, loc, scale), expected, rtol=1e-3)
+        self.assertEqual(b, 0.0)
+
+    def test_instance_truncweibull(self):
+        calculated = dist.truncweibull.cdf(2.5, 2.0, 0.5, loc=0.5, scale=2.0)
+        expected = self.dist.cdf(2.5, 2.0, 0.5, loc=0.5, scale=2.0)
+        self.assertAlmostEqual(calculated, expected, places=4)
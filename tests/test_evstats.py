@@ -61,6 +61,44 @@ class Test__argupcross(unittest.TestCase):
         np.testing.assert_array_equal(calculated, expected)
 
 
+class TestPeakKernel(unittest.TestCase):
+    def setUp(self):
+        self.x = np.array([0.0, 1.0, -1.0, -2.0, -1.0, 1.0, 0.0])
+        self.kernel = evstats.PeakKernel(7)
+
+    def tearDown(self):
+        pass
+
+    def test_relmax(self):
+        calculated = self.kernel.relmax(self.x)
+        expected = evstats._argrelmax(self.x)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_upcross(self):
+        calculated = self.kernel.upcross(self.x)
+        expected = np.array([True, False, False, False, True, False, False])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_reuse_buffer(self):
+        first = self.kernel.relmax(self.x)
+        second = self.kernel.upcross(self.x)
+        self.assertTrue(np.shares_memory(first, second))
+
+    def test_argrelmax(self):
+        calculated = self.kernel.argrelmax(self.x)
+        expected = evstats.argrelmax(self.x)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_argupcross(self):
+        calculated = self.kernel.argupcross(self.x, x_up=0.5)
+        expected = evstats.argupcross(self.x, x_up=0.5)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_wrong_size(self):
+        with self.assertRaises(ValueError):
+            self.kernel.relmax(self.x[:-1])
+
+
 class Test_argrelmax(unittest.TestCase):
     def setUp(self):
         pass
@@ -186,3 +224,426 @@ class Test_argrelmax_decluster(unittest.TestCase):
         calculated = evstats.argrelmax_decluster(x, x_up=0.0)
         expected = np.array([5, 15.0])
         np.testing.assert_array_equal(calculated, expected)
+
+
+class Test_argupcross_level(unittest.TestCase):
+    def setUp(self):
+        t = np.linspace(0.0, 200.0, 5001)
+        self.trend = 0.05 * t + np.sin(0.01 * t)
+        self.x = np.sin(2.0 * np.pi * t / 7.0) + self.trend
+
+    def tearDown(self):
+        pass
+
+    def test_array_level(self):
+        calculated = evstats.argupcross(self.x, x_up=self.trend)
+        expected = evstats.argupcross(self.x - self.trend)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_array_level_chunked(self):
+        calculated = evstats._argupcross_chunked(self.x, self.trend, chunksize=7)
+        expected = evstats.argupcross(self.x - self.trend)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_callable_level(self):
+        def level(x, start, stop):
+            return self.trend[start:stop]
+
+        calculated = evstats._argupcross_chunked(self.x, level, chunksize=100)
+        expected = evstats.argupcross(self.x - self.trend)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_decluster_array_level(self):
+        calculated = evstats.argrelmax_decluster(self.x, x_up=self.trend)
+        zeroups = evstats.argupcross(self.x - self.trend)
+        expected = [
+            i + np.argmax(self.x[i:j]) for i, j in zip(zeroups[:-1], zeroups[1:])
+        ]
+        np.testing.assert_array_equal(calculated, expected)
+
+
+class Test_rolling_mean_level(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_values(self):
+        x = np.arange(10.0) ** 2
+        level = evstats.rolling_mean_level(3)
+        calculated = level(x, 0, 10)
+        expected = [np.mean(x[max(i - 1, 0) : i + 2]) for i in range(10)]
+        np.testing.assert_allclose(calculated, expected)
+
+    def test_chunk(self):
+        x = np.random.default_rng(0).standard_normal(100)
+        level = evstats.rolling_mean_level(10)
+        np.testing.assert_allclose(level(x, 20, 40), level(x, 0, 100)[20:40])
+
+    def test_nan(self):
+        x = np.arange(10.0) ** 2
+        x[4] = np.nan
+        level = evstats.rolling_mean_level(3)
+        calculated = level(x, 0, 10)
+        expected = [np.nanmean(x[max(i - 1, 0) : i + 2]) for i in range(10)]
+        np.testing.assert_allclose(calculated, expected)
+
+    def test_nan_decluster(self):
+        rng = np.random.default_rng(1)
+        x = np.sin(np.linspace(0.0, 1000.0, 20000))
+        x += 0.1 * rng.standard_normal(x.size)
+        level = evstats.rolling_mean_level(101)
+        expected = evstats.argrelmax_decluster(x, x_up=level)
+        x[5000] = np.nan
+        calculated = evstats.argrelmax_decluster(x, x_up=level)
+        # Only the cycle with the dropout is left out
+        self.assertEqual(calculated.size, expected.size - 1)
+        self.assertTrue(np.isin(calculated, expected).all())
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            evstats.rolling_mean_level(0)
+
+
+class Test_gaps(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_gap_breaks(self):
+        t = np.array([0.0, 1.0, 2.0, 5.0, 6.0, 9.0])
+        calculated = evstats._gap_breaks(t, max_gap=1.5)
+        expected = np.array([2, 4])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_gap_breaks_none(self):
+        calculated = evstats._gap_breaks()
+        self.assertEqual(calculated.size, 0)
+
+    def test_gap_breaks_missing_max_gap(self):
+        with self.assertRaises(ValueError):
+            evstats._gap_breaks(t=np.arange(3.0))
+
+    def test_argrelmax_time_gap(self):
+        x = np.array([0.0, 1.0, 2.0, 0.0, 1.0, 0.0])
+        t = np.array([0.0, 1.0, 2.0, 10.0, 11.0, 12.0])
+        calculated = evstats.argrelmax(x, t=t, max_gap=1.5)
+        expected = np.array([4])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_argupcross_time_gap(self):
+        x = np.array([1.0, -1.0, -1.0, 1.0, -1.0, 1.0])
+        t = np.array([0.0, 1.0, 2.0, 10.0, 11.0, 12.0])
+        calculated = evstats.argupcross(x, t=t, max_gap=1.5)
+        expected = np.array([4])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_argupcross_time_gap_array_level(self):
+        x = np.array([1.0, -1.0, -1.0, 1.0, -1.0, 1.0])
+        t = np.array([0.0, 1.0, 2.0, 10.0, 11.0, 12.0])
+        calculated = evstats.argupcross(x, x_up=np.zeros(6), t=t, max_gap=1.5)
+        expected = np.array([4])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_decluster_nan(self):
+        x = np.array([-1.0, 1.0, 2.0, -1.0, 3.0, np.nan, -1.0, 1.0, -1.0, 1.0])
+        calculated = evstats.argrelmax_decluster(x)
+        expected = np.array([2, 7])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_decluster_time_gap(self):
+        x = np.array([-1.0, 1.0, 2.0, -1.0, 3.0, -1.0, 1.0, -1.0, 1.0])
+        t = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 20.0, 21.0, 22.0, 23.0])
+        calculated = evstats.argrelmax_decluster(x, t=t, max_gap=1.5)
+        expected = np.array([2, 6])
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_decluster_equals_segments(self):
+        rng = np.random.default_rng(2)
+        x = np.sin(np.linspace(0.0, 100.0, 2000)) + 0.1 * rng.standard_normal(2000)
+        x[[500, 501, 1300]] = np.nan
+        calculated = evstats.argrelmax_decluster(x)
+        expected = np.concatenate(
+            [
+                evstats.argrelmax_decluster(x[:500]),
+                502 + evstats.argrelmax_decluster(x[502:1300]),
+                1301 + evstats.argrelmax_decluster(x[1301:]),
+            ]
+        )
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_fallback_nan(self):
+        x = np.array([np.nan, 1.0, 2.0])
+        np.testing.assert_array_equal(evstats.argrelmax(x), [2])
+        np.testing.assert_array_equal(
+            evstats.argrelmax_decluster(x, x_up=np.zeros(3)), [2]
+        )
+        self.assertEqual(evstats.argrelmax(np.full(3, np.nan)).size, 0)
+
+
+
+class Test__StreamDecluster(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.x = np.sin(np.linspace(0.0, 300.0, 3000)) + 0.2 * rng.standard_normal(
+            3000
+        )
+
+    def tearDown(self):
+        pass
+
+    def test_equals_batch(self):
+        stream = evstats._StreamDecluster(0.1)
+        calculated = np.concatenate(
+            [stream.update(self.x[i : i + 77]) for i in range(0, 3000, 77)]
+        )
+        expected = evstats.argrelmax_decluster(self.x, x_up=0.1)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_equals_batch_nan(self):
+        self.x[[100, 1000, 1001]] = np.nan
+        stream = evstats._StreamDecluster()
+        calculated = np.concatenate(
+            [stream.update(self.x[i : i + 5]) for i in range(0, 3000, 5)]
+        )
+        expected = evstats.argrelmax_decluster(self.x)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_return_values(self):
+        self.x[[100, 1000, 1001]] = np.nan
+        stream = evstats._StreamDecluster()
+        peaks, values = zip(
+            *[stream.update(self.x[i : i + 50], return_values=True) for i in range(0, 3000, 50)]
+        )
+        np.testing.assert_array_equal(np.concatenate(values), self.x[np.concatenate(peaks)])
+
+
+class Test_argrelmax_decluster_projected(unittest.TestCase):
+    def setUp(self):
+        t = np.linspace(0.0, 500.0, 10001)
+        self.x = np.array([np.cos(t) + 0.3 * np.sin(3.1 * t), np.sin(1.3 * t)])
+
+    def tearDown(self):
+        pass
+
+    def test_directions(self):
+        theta = np.linspace(0.0, np.pi, 7)
+        directions = np.column_stack([np.cos(theta), np.sin(theta)])
+        calculated = evstats.argrelmax_decluster_projected(
+            self.x, directions, blocksize=1000
+        )
+        self.assertEqual(len(calculated), 7)
+        for peaks, w in zip(calculated, directions):
+            expected = evstats.argrelmax_decluster(w @ self.x)
+            np.testing.assert_array_equal(peaks, expected)
+
+    def test_magnitude(self):
+        r = np.hypot(*self.x)
+        (calculated,) = evstats.argrelmax_decluster_projected(
+            self.x, x_up=r.mean(), blocksize=333
+        )
+        expected = evstats.argrelmax_decluster(r, x_up=r.mean())
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_magnitude_default_level(self):
+        x = np.random.default_rng(6).standard_normal((2, 10000))
+        x[0, 10] = np.nan
+        r = np.hypot(*x)
+        (calculated,) = evstats.argrelmax_decluster_projected(x, blocksize=999)
+        expected = evstats.argrelmax_decluster(r, x_up=np.nanmean(r))
+        self.assertGreater(calculated.size, 0)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_x_up_per_direction(self):
+        directions = np.eye(2)
+        calculated = evstats.argrelmax_decluster_projected(
+            self.x, directions, x_up=[0.5, -0.5]
+        )
+        np.testing.assert_array_equal(
+            calculated[1], evstats.argrelmax_decluster(self.x[1], x_up=-0.5)
+        )
+
+    def test_invalid_directions(self):
+        with self.assertRaises(ValueError):
+            evstats.argrelmax_decluster_projected(self.x, np.ones((3, 3)))
+
+
+class Test_n_jobs(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        n = 300001
+        self.x = np.sin(np.linspace(0.0, n / 20.0, n)) + 0.3 * rng.standard_normal(n)
+        self.x[[1000, 200000]] = np.nan
+        self.t = np.arange(n, dtype=float)
+        self.t[150000:] += 10.0
+
+    def tearDown(self):
+        pass
+
+    def test_n_workers(self):
+        self.assertEqual(evstats._n_workers(None), 1)
+        self.assertEqual(evstats._n_workers(3), 3)
+        self.assertGreaterEqual(evstats._n_workers(-1), 1)
+        with self.assertRaises(ValueError):
+            evstats._n_workers(0)
+
+    def test_segments(self):
+        segments = evstats._segments(300001, 4, min_size=2**16)
+        self.assertEqual(len(segments), 4)
+        self.assertEqual(segments[0][0], 0)
+        self.assertEqual(segments[-1][1], 300001)
+        for (_, stop), (start, _) in zip(segments[:-1], segments[1:]):
+            self.assertEqual(stop, start)
+            self.assertEqual(start % 2**16, 0)
+
+    def test_segments_short(self):
+        self.assertEqual(evstats._segments(100, 4), [(0, 100)])
+
+    def test_argrelmax(self):
+        calculated = evstats.argrelmax(self.x, t=self.t, max_gap=1.5, n_jobs=4)
+        expected = evstats.argrelmax(self.x, t=self.t, max_gap=1.5)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_argupcross(self):
+        calculated = evstats.argupcross(
+            self.x, x_up=0.1, t=self.t, max_gap=1.5, n_jobs=4
+        )
+        expected = evstats.argupcross(self.x, x_up=0.1, t=self.t, max_gap=1.5)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_argrelmax_decluster(self):
+        calculated = evstats.argrelmax_decluster(self.x, x_up=0.1, n_jobs=3)
+        expected = evstats.argrelmax_decluster(self.x, x_up=0.1)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_argrelmax_decluster_callable_level(self):
+        level = evstats.rolling_mean_level(51)
+        calculated = evstats.argrelmax_decluster(self.x, x_up=level, n_jobs=4)
+        expected = evstats.argrelmax_decluster(self.x, x_up=level)
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_2d(self):
+        x = np.vstack([self.x[:1000], self.x[1000:2000]])
+        calculated = evstats.argrelmax_decluster(x, n_jobs=2)
+        self.assertEqual(len(calculated), 2)
+        np.testing.assert_array_equal(
+            calculated[1], evstats.argrelmax_decluster(self.x[1000:2000])
+        )
+
+    def test_2d_row_levels(self):
+        x = np.vstack([self.x[:1000], self.x[1000:2000]])
+        x_up = np.vstack([np.full(1000, 0.1), np.full(1000, 0.5)])
+        t = np.vstack([self.t[:1000], self.t[149500:150500]])
+        calculated = evstats.argrelmax_decluster(
+            x, x_up=x_up, t=t, max_gap=1.5, n_jobs=2
+        )
+        for i in range(2):
+            np.testing.assert_array_equal(
+                calculated[i],
+                evstats.argrelmax_decluster(
+                    x[i], x_up=x_up[i], t=t[i], max_gap=1.5
+                ),
+            )
+        calculated = evstats.argupcross(x, x_up=x_up, t=t, max_gap=1.5)
+        np.testing.assert_array_equal(
+            calculated[1],
+            evstats.argupcross(x[1], x_up=x_up[1], t=t[1], max_gap=1.5),
+        )
+        calculated = evstats.argrelmax(x, t=t, max_gap=1.5)
+        np.testing.assert_array_equal(
+            calculated[1], evstats.argrelmax(x[1], t=t[1], max_gap=1.5)
+        )
+        with self.assertRaises(ValueError):
+            evstats.argupcross(x, x_up=x_up[:1])
+
+    def test_2d_serial(self):
+        x = np.vstack([self.x[2000:3000], self.x[3000:4000]])
+        calculated = evstats.argrelmax(x)
+        np.testing.assert_array_equal(calculated[0], evstats.argrelmax(x[0]))
+
+
+class Test_concurrent_values(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        t = np.linspace(0.0, 400.0, 5000)
+        self.x = np.sin(t) + 0.1 * rng.standard_normal(t.size)
+        self.y = np.vstack([np.cos(t), rng.standard_normal(t.size)])
+        self.peaks = np.r_[0, evstats.argrelmax_decluster(self.x), t.size - 1]
+
+    def tearDown(self):
+        pass
+
+    def test_values(self):
+        calculated = evstats.concurrent_values(self.peaks, self.y)
+        np.testing.assert_array_equal(calculated, self.y[:, self.peaks])
+
+    def test_window_max(self):
+        calculated = evstats.concurrent_values(self.peaks, self.y, window=7, chunksize=100)
+        expected = np.array(
+            [[y[max(p - 7, 0) : p + 8].max() for p in self.peaks] for y in self.y]
+        )
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_window_min_1d(self):
+        calculated = evstats.concurrent_values(self.peaks, self.y[1], window=3, stat="min")
+        expected = [self.y[1, max(p - 3, 0) : p + 4].min() for p in self.peaks]
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            evstats.concurrent_values([5000], self.y)
+
+    def test_window_rolling(self):
+        # Wide windows are picked from a rolling max of the series
+        calculated = evstats.concurrent_values(self.peaks, self.y, window=400, chunksize=1000)
+        expected = np.array(
+            [[y[max(p - 400, 0) : p + 401].max() for p in self.peaks] for y in self.y]
+        )
+        np.testing.assert_array_equal(calculated, expected)
+
+    def test_dtype(self):
+        y = np.round(100.0 * self.y).astype("int32")
+        for window in (0, 7, 400):
+            calculated = evstats.concurrent_values(self.peaks, y, window=window)
+            self.assertEqual(calculated.dtype, y.dtype)
+            expected = evstats.concurrent_values(
+                self.peaks, y.astype("float64"), window=window
+            )
+            np.testing.assert_array_equal(calculated, expected)
+
+
+class Test_rolling_max(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(12)
+        self.x = rng.standard_normal((3, 1000))
+        self.x[1, 500] = np.nan
+
+    def tearDown(self):
+        pass
+
+    def _naive(self, x, window, func):
+        return np.array(
+            [[func(row[max(i - window + 1, 0) : i + 1]) for i in range(row.size)] for row in x]
+        )
+
+    def test_rolling_max(self):
+        for window in (1, 7, 64, 1000, 1500):
+            calculated = evstats.rolling_max(self.x, window, chunksize=100)
+            np.testing.assert_array_equal(calculated, self._naive(self.x, window, np.max))
+
+    def test_rolling_min_axis(self):
+        calculated = evstats.rolling_min(self.x.T, 33, axis=0, chunksize=70)
+        np.testing.assert_array_equal(calculated.T, self._naive(self.x, 33, np.min))
+
+    def test_1d_out(self):
+        out = np.empty(1000)
+        calculated = evstats.rolling_max(self.x[0], 10, out=out)
+        self.assertIs(calculated, out)
+        np.testing.assert_array_equal(out, self._naive(self.x[:1], 10, np.max)[0])
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            evstats.rolling_max(self.x, 0)
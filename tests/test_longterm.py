@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from evapy_4s import distributions
+from evapy_4s.longterm import LongTermResponse
+
+
+class Test_LongTermResponse(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        n = 500
+        self.params = np.c_[
+            rng.uniform(1.5, 2.5, n), np.zeros(n), rng.uniform(0.5, 5.0, n)
+        ]
+        self.weights = rng.random(n)
+        self.weights[::5] = 0.0
+        self.rates = rng.uniform(0.05, 0.2, n)
+        self.levels = np.linspace(-1.0, 30.0, 50)
+
+    def tearDown(self):
+        pass
+
+    def _rate_loop(self, dist, params, levels):
+        weights = self.weights / self.weights.sum()
+        rate = np.zeros_like(levels)
+        for w, nu, p in zip(weights, self.rates, params):
+            rate += w * nu * dist.sf(levels, *p)
+        return rate
+
+    def test_rate_weibull(self):
+        lt = LongTermResponse(
+            "weibull", self.params, self.weights, self.rates, chunksize=1000
+        )
+        expected = self._rate_loop(
+            distributions.weibull, self.params, self.levels
+        )
+        np.testing.assert_allclose(lt.rate(self.levels), expected, rtol=1e-12)
+
+    def test_rate_genexptail(self):
+        rng = np.random.default_rng(12)
+        n = self.weights.size
+        params = np.c_[
+            rng.uniform(1.5, 2.5, n),
+            rng.uniform(0.5, 3.0, n),
+            np.zeros(n),
+            rng.uniform(0.5, 5.0, n),
+        ]
+        lt = LongTermResponse(
+            distributions.genexptail, params, self.weights, self.rates
+        )
+        expected = self._rate_loop(distributions.genexptail, params, self.levels)
+        np.testing.assert_allclose(lt.rate(self.levels), expected, rtol=1e-12)
+
+    def test_sf(self):
+        lt = LongTermResponse("weibull", self.params, self.weights, self.rates)
+        sf = lt.sf(self.levels)
+        self.assertAlmostEqual(sf[0], 1.0)
+        self.assertTrue((np.diff(sf) <= 0.0).all())
+        np.testing.assert_allclose(lt.cdf(self.levels), 1.0 - sf)
+
+    def test_return_level(self):
+        lt = LongTermResponse("weibull", self.params, self.weights, self.rates)
+        periods = np.array([1e2, 1e5, 1e9])
+        levels = lt.return_level(periods)
+        np.testing.assert_allclose(lt.rate(levels) * periods, 1.0, rtol=1e-6)
+        self.assertTrue(np.isnan(lt.return_level(1.0)))
+
+    def test_return_level_single(self):
+        lt = LongTermResponse("rayleigh", [[0.0, 2.0]], [1.0], 0.1)
+        expected = distributions.rayleigh.isf(1.0 / (1e6 * 0.1), 0.0, 2.0)
+        self.assertAlmostEqual(lt.return_level(1e6), expected, places=6)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LongTermResponse("weibull", self.params[:, 1:], self.weights, 0.1)
+        with self.assertRaises(ValueError):
+            LongTermResponse("weibull", -self.params, self.weights, 0.1)
+        with self.assertRaises(ValueError):
+            LongTermResponse("nodist", self.params, self.weights, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
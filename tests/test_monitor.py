@@ -0,0 +1,142 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from evapy_4s import monitor
+from evapy_4s.evstats import argrelmax_decluster
+
+
+class Test_ExtremeValueMonitor(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        t = np.arange(20000) / 10.0
+        self.x = np.sin(2.0 * np.pi * 0.1 * t) * rng.rayleigh(1.0, t.size)
+        self.blocks = np.array_split(self.x, 37)
+
+    async def _run_queue(self, mon, sink=None):
+        queue = asyncio.Queue()
+        for block in self.blocks:
+            queue.put_nowait(block)
+        queue.put_nowait(None)
+        return await mon.run(queue, sink=sink)
+
+    def test_peaks_match_batch(self):
+        mon = monitor.ExtremeValueMonitor(fs=10.0, dists=[])
+        estimate = asyncio.run(self._run_queue(mon))
+        peaks = argrelmax_decluster(self.x)
+        self.assertEqual(estimate["n_samples"], self.x.size)
+        self.assertEqual(estimate["n_peaks"], peaks.size)
+        np.testing.assert_array_equal(
+            np.sort(mon._peaks.values()[0]), np.sort(self.x[peaks])
+        )
+
+    def test_fit(self):
+        mon = monitor.ExtremeValueMonitor(fs=10.0, duration=3600.0)
+        estimate = asyncio.run(self._run_queue(mon))
+        peaks = self.x[argrelmax_decluster(self.x)]
+        c, loc, scale = estimate["params"]["weibull"]
+        self.assertEqual(loc, 0.0)
+        self.assertGreater(estimate["mpm"]["weibull"], np.median(peaks))
+        np.testing.assert_allclose(
+            estimate["peak_rate"], peaks.size / (self.x.size / 10.0)
+        )
+
+    def test_publish(self):
+        estimates = []
+
+        async def source():
+            for block in self.blocks:
+                await asyncio.sleep(0.002)
+                yield block
+
+        async def sink(estimate):
+            estimates.append(estimate)
+
+        mon = monitor.ExtremeValueMonitor(fs=10.0, dists=["rayleigh"], interval=0.01)
+        final = asyncio.run(mon.run(source(), sink=sink))
+        self.assertGreater(len(estimates), 1)
+        self.assertIs(estimates[-1], final)
+        n_peaks = [e["n_peaks"] for e in estimates]
+        self.assertEqual(n_peaks, sorted(n_peaks))
+
+    def test_backpressure(self):
+        read = []
+        ingested = []
+
+        async def source():
+            for block in self.blocks:
+                read.append(len(read) - len(ingested))
+                yield block
+
+        mon = monitor.ExtremeValueMonitor(fs=10.0, dists=[], maxsize=2)
+        ingest = mon._ingest
+
+        def counting_ingest(block):
+            ingested.append(block.size)
+            ingest(block)
+
+        mon._ingest = counting_ingest
+        asyncio.run(mon.run(source()))
+        self.assertEqual(sum(ingested), self.x.size)
+        # Blocks read ahead of ingestion are bounded by the queue size
+        self.assertLessEqual(max(read), 2 + 1)
+
+    def test_max_peaks(self):
+        mon = monitor.ExtremeValueMonitor(fs=10.0, dists=[], max_peaks=50)
+        estimate = asyncio.run(self._run_queue(mon))
+        self.assertEqual(len(mon._peaks), 50)
+        self.assertGreater(estimate["n_peaks"], 50)
+
+    def test_duration_window(self):
+        mon = monitor.ExtremeValueMonitor(fs=10.0, dists=[], duration=600.0)
+        estimate = asyncio.run(self._run_queue(mon))
+        self.assertEqual(mon._peaks.capacity, 3001)
+        peaks = argrelmax_decluster(self.x)
+        recent = peaks[peaks >= self.x.size - 6000]
+        np.testing.assert_array_equal(
+            np.sort(mon._recent_peaks()), np.sort(self.x[recent])
+        )
+        self.assertEqual(estimate["n_peaks"], peaks.size)
+
+    def test_source_error(self):
+        async def source():
+            yield self.blocks[0]
+            raise IOError("lost connection")
+
+        mon = monitor.ExtremeValueMonitor(fs=10.0)
+        with self.assertRaises(IOError):
+            asyncio.run(mon.run(source()))
+
+    def test_unknown_dist(self):
+        with self.assertRaises(ValueError):
+            monitor.ExtremeValueMonitor(fs=10.0, dists=["normal_dist"])
+
+
+class Test_stream_blocks(unittest.TestCase):
+    def test_socket(self):
+        x = np.random.default_rng(1).standard_normal(10001)
+
+        async def handle(reader, writer):
+            for i in range(0, x.size, 777):
+                writer.write(x[i:i + 777].tobytes())
+                await writer.drain()
+            writer.close()
+
+        async def main():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            blocks = [b async for b in monitor.stream_blocks(reader, blocksize=1000)]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return blocks
+
+        blocks = asyncio.run(main())
+        self.assertEqual([b.size for b in blocks], [1000] * 10 + [1])
+        np.testing.assert_array_equal(np.concatenate(blocks), x)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from evapy_4s import evstats, parallel
+
+
+class Test_SharedSeries(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 3 * 2**16 + 123
+        self.x = np.sin(np.linspace(0.0, n / 20.0, n))
+        self.x += 0.3 * rng.standard_normal(n)
+        self.x[1000:1010] = np.nan
+        self.t = np.arange(n) * 0.1
+        self.t[2**16 + 7 :] += 10.0
+        self.series = parallel.SharedSeries(self.x, n_jobs=3)
+
+    def tearDown(self):
+        self.series.close()
+
+    def test_argrelmax(self):
+        np.testing.assert_array_equal(
+            self.series.argrelmax(), evstats.argrelmax(self.x)
+        )
+
+    def test_argrelmax_gaps(self):
+        np.testing.assert_array_equal(
+            self.series.argrelmax(t=self.t, max_gap=0.5),
+            evstats.argrelmax(self.x, t=self.t, max_gap=0.5),
+        )
+
+    def test_argupcross(self):
+        for x_up in (0.0, 0.5, 0.2 * np.cos(np.arange(self.x.size))):
+            np.testing.assert_array_equal(
+                self.series.argupcross(x_up=x_up),
+                evstats.argupcross(self.x, x_up=x_up),
+            )
+
+    def test_argrelmax_decluster(self):
+        np.testing.assert_array_equal(
+            self.series.argrelmax_decluster(),
+            evstats.argrelmax_decluster(self.x),
+        )
+
+    def test_argrelmax_decluster_level(self):
+        x_up = evstats.rolling_mean_level(101)
+        np.testing.assert_array_equal(
+            self.series.argrelmax_decluster(x_up=x_up, t=self.t, max_gap=0.5),
+            evstats.argrelmax_decluster(
+                self.x, x_up=x_up, t=self.t, max_gap=0.5
+            ),
+        )
+
+    def test_shared_copy(self):
+        np.testing.assert_array_equal(self.series.x, self.x)
+        self.assertFalse(np.shares_memory(self.series.x, self.x))
+
+    def test_closed(self):
+        self.series.close()
+        self.assertIsNone(self.series.x)
+        with self.assertRaises(ValueError):
+            self.series.argrelmax()
+
+
+class Test_argrelmax_decluster(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_no_peaks(self):
+        x = np.ones(10)
+        np.testing.assert_array_equal(
+            parallel.argrelmax_decluster(x, x_up=3, n_jobs=2),
+            evstats.argrelmax_decluster(x, x_up=3),
+        )
+
+    def test_2d(self):
+        with self.assertRaises(ValueError):
+            parallel.argrelmax_decluster(np.zeros((2, 10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from evapy_4s import query
+from evapy_4s.evstats import argrelmax_decluster
+
+
+class Test_SeriesIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        t = np.arange(100003) * 0.1
+        self.x = np.sin(2.0 * np.pi * 0.1 * t) * rng.rayleigh(1.0, t.size)
+        self.x[500:700] = np.nan
+        self.index = query.SeriesIndex(self.x, dt=0.1, t0=10.0, blocksize=16)
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_range_max(self):
+        rng = np.random.default_rng(1)
+        bounds = np.sort(rng.integers(0, self.x.size + 1, size=(200, 2)), axis=1)
+        bounds = bounds[bounds[:, 0] < bounds[:, 1]]
+        bounds = np.r_[bounds, [[0, self.x.size], [3, 5], [15, 17], [490, 510]]]
+        for start, stop in bounds:
+            i, value = self.index.range_max(start, stop)
+            expected = start + np.nanargmax(self.x[start:stop])
+            self.assertEqual(i, expected)
+            self.assertEqual(value, self.x[expected])
+
+    def test_range_max_nan(self):
+        i, value = self.index.range_max(510, 690)
+        self.assertEqual(i, -1)
+        self.assertTrue(np.isnan(value))
+
+    def test_range_max_time(self):
+        i, _ = self.index.range_max(t_start=110.0, t_stop=200.0)
+        expected = 1000 + np.argmax(self.x[1000:1900])
+        self.assertEqual(i, expected)
+
+    def test_range_max_empty(self):
+        with self.assertRaises(ValueError):
+            self.index.range_max(10, 10)
+
+    def test_exceedances(self):
+        peaks = argrelmax_decluster(self.x)
+        index, values = self.index.exceedances(2.5, start=20000, stop=80000)
+        mask = (self.x[peaks] >= 2.5) & (peaks >= 20000) & (peaks < 80000)
+        np.testing.assert_array_equal(index, peaks[mask])
+        np.testing.assert_array_equal(values, self.x[peaks[mask]])
+
+    def test_no_cycle(self):
+        index = query.SeriesIndex(np.array([1.0, 3.0, 2.0, 4.0]), x_up=25.0)
+        peaks, values = index.exceedances(-np.inf)
+        self.assertEqual(peaks.size, 0)
+        self.assertEqual(values.size, 0)
+
+    def test_invalid_peaks(self):
+        peaks = np.array([3, 501, 1000, self.x.size + 5])
+        index = query.SeriesIndex(self.x, peaks=peaks)
+        peaks, values = index.exceedances(-np.inf)
+        np.testing.assert_array_equal(np.sort(peaks), [3, 1000])
+
+    def test_save_load(self):
+        path = os.path.join(self.tmpdir, "index.npz")
+        self.index.save(path)
+        loaded = query.SeriesIndex.load(path, self.x)
+        self.assertEqual(loaded.range_max(17, 90001), self.index.range_max(17, 90001))
+        np.testing.assert_array_equal(
+            loaded.exceedances(2.0, t_start=100.0)[0], self.index.exceedances(2.0, t_start=100.0)[0]
+        )
+
+        loaded = query.SeriesIndex.load(path)
+        self.assertEqual(loaded.exceedances(3.0)[0].size, self.index.exceedances(3.0)[0].size)
+        with self.assertRaises(ValueError):
+            loaded.range_max(0, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import integrate
+
+from evapy_4s import evstats, simulate
+
+
+class Test_jonswap(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_m0(self):
+        f = np.linspace(0.0, 2.0, 200001)
+        calculated = integrate.trapezoid(simulate.jonswap(f, 4.0, 10.0), f)
+        expected = (4.0 / 4.0) ** 2
+        self.assertAlmostEqual(calculated, expected, places=2)
+
+    def test_zero_frequency(self):
+        self.assertEqual(simulate.jonswap(0.0, 4.0, 10.0), 0.0)
+
+
+class Test_gaussian_process(unittest.TestCase):
+    def setUp(self):
+        self.spectrum = lambda f: simulate.jonswap(f, 4.0, 10.0, gamma=7.0)
+
+    def tearDown(self):
+        pass
+
+    def test_variance(self):
+        x = simulate.gaussian_process(
+            self.spectrum, 2.0, 500000, seed=1, segment=4096
+        )
+        self.assertEqual(x.shape, (500000,))
+        self.assertAlmostEqual(x.var(), 1.0, delta=0.05)
+
+    def test_rayleigh_peaks(self):
+        x = simulate.gaussian_process(
+            self.spectrum, 2.0, 500000, seed=2, segment=4096
+        )
+        peaks = x[evstats.argrelmax_decluster(x)]
+        self.assertAlmostEqual(peaks.mean(), np.sqrt(np.pi / 2.0), delta=0.1)
+
+    def test_seed_per_series(self):
+        x = simulate.gaussian_process(
+            self.spectrum, 2.0, 10000, n_series=3, seed=[1, 2, 3], segment=1024
+        )
+        x_2 = simulate.gaussian_process(
+            self.spectrum, 2.0, 10000, n_series=1, seed=[2], segment=1024
+        )
+        self.assertEqual(x.shape, (3, 10000))
+        np.testing.assert_array_equal(x[1], x_2[0])
+
+    def test_seed_count(self):
+        with self.assertRaises(ValueError):
+            simulate.gaussian_process(self.spectrum, 2.0, 100, n_series=2, seed=[1])
+
+    def test_tabulated_spectrum(self):
+        f = np.linspace(0.0, 1.0, 1001)
+        x_1 = simulate.gaussian_process((f, self.spectrum(f)), 2.0, 1000, seed=1)
+        x_2 = simulate.gaussian_process(self.spectrum, 2.0, 1000, seed=1)
+        np.testing.assert_allclose(x_1, x_2, atol=0.05)
+
+    def test_memmap_out(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "x.dat")
+            out = np.memmap(path, dtype="float32", mode="w+", shape=(2, 5000))
+            x = simulate.gaussian_process(
+                self.spectrum, 2.0, 5000, n_series=2, seed=3, segment=512, out=out
+            )
+            self.assertIs(x, out)
+            expected = simulate.gaussian_process(
+                self.spectrum, 2.0, 5000, n_series=2, seed=3, segment=512
+            )
+            np.testing.assert_allclose(out, expected, rtol=1e-5, atol=1e-6)
+            del x, out
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_invalid_overlap(self):
+        with self.assertRaises(ValueError):
+            simulate.gaussian_process(
+                self.spectrum, 2.0, 100, segment=64, overlap=64
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()